@@ -0,0 +1,80 @@
+from collections import deque
+
+
+class AhoCorasick:
+    """Класс автомата Ахо-Корасик для поиска сразу всех шаблонов-подстрок в строке за один проход по ней. Время
+       поиска зависит от длины строки и числа найденных шаблонов, но не от количества шаблонов
+
+    Attributes:
+        self.__patterns (list): Список шаблонов
+        self.__transitions (list): Переходы бора: для каждого состояния словарь (символ: следующее состояние)
+        self.__fails (list): Суффиксные ссылки состояний
+        self.__outputs (list): Для каждого состояния кортеж индексов шаблонов, которые заканчиваются в нём
+    """
+
+    def __init__(self, patterns: list):
+        """Инициализирует объект AhoCorasick, строя бор шаблонов и суффиксные ссылки
+
+        Args:
+            patterns (list): Список шаблонов
+
+        >>> sorted(AhoCorasick(['аналитик', 'программист', 'программист 1с', 'тик']).find('ведущий программист 1с-аналитик'))
+        [0, 1, 2, 3]
+        """
+
+        self.__patterns = list(patterns)
+        self.__transitions = [{}]
+        outputs = [[]]
+        for index, pattern in enumerate(self.__patterns):
+            state = 0
+            for symbol in pattern:
+                next_state = self.__transitions[state].get(symbol)
+                if next_state is None:
+                    next_state = len(self.__transitions)
+                    self.__transitions[state][symbol] = next_state
+                    self.__transitions.append({})
+                    outputs.append([])
+                state = next_state
+            outputs[state].append(index)
+
+        self.__fails = [0] * len(self.__transitions)
+        queue = deque(self.__transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            for symbol, next_state in self.__transitions[state].items():
+                fail = self.__fails[state]
+                while fail and symbol not in self.__transitions[fail]:
+                    fail = self.__fails[fail]
+                self.__fails[next_state] = self.__transitions[fail].get(symbol, 0)
+                outputs[next_state] += outputs[self.__fails[next_state]]
+                queue.append(next_state)
+        self.__outputs = [tuple(output) for output in outputs]
+
+    @property
+    def patterns(self):
+        """Возвращает значение приватного поля со списком шаблонов"""
+
+        return self.__patterns
+
+    def find(self, text: str):
+        """Возвращает множество индексов шаблонов, которые встречаются в строке как подстроки
+
+        Args:
+            text (str): Строка для поиска
+
+        >>> AhoCorasick(['he', 'she', 'his', 'hers', '']).find('ahishers') == {0, 1, 2, 3, 4}
+        True
+        >>> AhoCorasick(['python']).find('java')
+        set()
+        """
+
+        transitions, fails, outputs = self.__transitions, self.__fails, self.__outputs
+        found = set(outputs[0])
+        state = 0
+        for symbol in text:
+            while state and symbol not in transitions[state]:
+                state = fails[state]
+            state = transitions[state].get(symbol, 0)
+            if outputs[state]:
+                found.update(outputs[state])
+        return found
@@ -1,16 +1,23 @@
+import math
 from vacancy import Vacancy
+from exact_sum import add_exact, merge_exact
+from quantile_sketch import KllSketch
 
 
 class City:
-    """Класс для представления информации о вакансиях и зарплате по городам
+    """Класс для представления информации о вакансиях и зарплате по городам. Сумма зарплат хранится точно
+       (частичными суммами exact_sum), как в Year
 
     Attributes:
         self.__name (str): Название города
         self.__vacancy_count (int): Количество вакансий в городе
-        self.__all_salary (float): Сумма всех средних зарплат в городе
-        self.__average_salary (float): Средняя зарплата по городу
+        self.__salary_partials (list): Частичные суммы всех средних зарплат в городе
+        self.__salary_sketch (KllSketch): Скетч средних зарплат в городе для медианы и перцентилей
     """
 
+    __slots__ = ('__name', '__vacancy_count', '__salary_partials', '__salary_sketch')
+    """Статический кортеж полей: у объектов нет __dict__"""
+
     def __init__(self, vacancy: Vacancy):
         """Инициализирует объект City по одной вакансии
 
@@ -27,14 +34,48 @@ class City:
 
         self.__name = vacancy.area_name
         self.__vacancy_count = 1
-        self.__all_salary = vacancy.average_salary
-        self.__average_salary = vacancy.average_salary
+        self.__salary_partials = [vacancy.average_salary]
+        self.__salary_sketch = KllSketch()
+        self.__salary_sketch.update(vacancy.average_salary)
+
+    @property
+    def name(self):
+        """Возвращает значение приватного поля с названием города"""
+
+        return self.__name
+
+    @property
+    def salary_partials(self):
+        """Возвращает значение приватного поля с частичными суммами средних зарплат в городе"""
+
+        return self.__salary_partials
+
+    @property
+    def all_salary(self):
+        """Возвращает сумму всех средних зарплат в городе, округлённую из точной"""
+
+        return math.fsum(self.__salary_partials)
 
     @property
     def average_salary(self):
-        """Возвращает значение приватного поля со средней зарплатой по городу"""
+        """Возвращает среднюю зарплату по городу"""
 
-        return self.__average_salary
+        return self.all_salary / self.__vacancy_count
+
+    @property
+    def salary_sketch(self):
+        """Возвращает значение приватного поля со скетчем средних зарплат в городе"""
+
+        return self.__salary_sketch
+
+    def salary_quantile(self, fraction: float):
+        """Возвращает приближённый квантиль средних зарплат в городе, например 0.5 для медианы
+
+        Args:
+            fraction (float): Доля от 0 до 1
+        """
+
+        return self.__salary_sketch.quantile(fraction)
 
     @property
     def vacancy_count(self):
@@ -49,6 +90,33 @@ class City:
             vacancy (Vacancy): Объект Vacancy по свойствам которого будет обновлён City
         """
 
+        self.add(vacancy.average_salary)
+
+    def add(self, average_salary: float):
+        """Добавляет в поля City средний оклад ещё одной вакансии без обращения к свойствам Vacancy
+
+        Args:
+            average_salary (float): Средний оклад вакансии в рублях
+        """
+
         self.__vacancy_count += 1
-        self.__all_salary += vacancy.average_salary
-        self.__average_salary = self.__all_salary / self.__vacancy_count
+        add_exact(self.__salary_partials, average_salary)
+        self.__salary_sketch.update(average_salary)
+
+    def merge(self, other):
+        """Объединяет объект City с частичной статистикой того же города, посчитанной по другой части данных
+
+        Args:
+            other (City): Объект City того же города
+
+        >>> city = City(Vacancy({'name': 'Программист', 'area_name': 'Екатеринбург', 'published_at':'2015', 'salary_from': '7000', 'salary_to': '90000', 'salary_currency': 'RUR'}))
+        >>> city.merge(City(Vacancy({'name': 'Художник', 'area_name': 'Екатеринбург', 'published_at':'2016', 'salary_from': '700', 'salary_to': '9000', 'salary_currency': 'RUR'})))
+        >>> city.vacancy_count, city.average_salary
+        (2, 26675.0)
+        """
+
+        if other.name != self.__name:
+            raise Exception('Нельзя объединить статистику разных городов')
+        self.__vacancy_count += other.vacancy_count
+        merge_exact(self.__salary_partials, other.salary_partials)
+        self.__salary_sketch.merge(other.salary_sketch)
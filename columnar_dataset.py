@@ -0,0 +1,284 @@
+from array import array
+from itertools import chain
+import json
+import os
+import numpy as np
+from dataset import DataSet
+from vacancy import Vacancy
+
+
+class ColumnarDataSet:
+    """Класс для представления вакансий в колоночном виде: числовые столбцы хранятся в массивах numpy, а строковые
+       столбцы кодируются словарём - массивом целочисленных кодов и списком соответствующих им значений. Столбцы
+       можно сохранить в двоичном виде и открывать при следующих запусках через numpy.memmap
+
+    Attributes:
+        self.__salary_from (np.ndarray): Нижние границы вилок окладов
+        self.__salary_to (np.ndarray): Верхние границы вилок окладов
+        self.__published_at (np.ndarray): Даты публикации вакансий типа datetime64[D]
+        self.__years (np.ndarray): Годы публикации вакансий
+        self.__codes (dict): Словарь, где ключ - название столбца, а значение - массив кодов значений этого столбца
+        self.__categories (dict): Словарь, где ключ - название столбца, а значение - список значений, индекс значения
+                                  в котором является его кодом
+        self.__average_salary (np.ndarray or NoneType): Средние оклады в рублях, вычисляются при первом обращении
+        self.__currency_rates (CurrencyRates or NoneType): Таблица курсов валют по месяцам. Если не задана,
+                                                           используется статический курс Vacancy.currency_to_rub
+    """
+
+    categorical_columns = ['name', 'area_name', 'salary_currency', 'experience_id', 'employer_name']
+    """Статический список строковых столбцов, кодируемых словарём (при наличии в файле)"""
+
+    cache_format = 2
+    """Статическое поле с версией формата сохранённых столбцов. Кэш другой версии пересоздаётся"""
+
+    meta_name = 'meta.json'
+    """Статическое поле с именем файла описания сохранённых столбцов. Записывается последним, поэтому его наличие
+       означает, что все столбцы сохранены полностью"""
+
+    def __init__(self, titles: list, rows):
+        """Инициализирует объект ColumnarDataSet, раскладывая строки по столбцам
+
+        Args:
+            titles (list): Заголовки столбцов
+            rows (list or generator): Прошедшие проверку строки в виде списков значений
+
+        >>> ColumnarDataSet(['name', 'salary_from', 'salary_to', 'salary_currency', 'area_name', 'published_at'], [['Программист', '7000', '90000', 'RUR', 'Екатеринбург', '2015-05-01'], ['Тестировщик', '100', '200', 'EUR', 'Москва', '2016-01-01'], ['Программист', '70', '90', 'RUR', 'Москва', '2015-07-01']]).categories('area_name')
+        ['Екатеринбург', 'Москва']
+        >>> ColumnarDataSet(['name', 'salary_from', 'salary_to', 'salary_currency', 'area_name', 'published_at'], [['Программист', '7000', '90000', 'RUR', 'Екатеринбург', '2015-05-01'], ['Тестировщик', '100', '200', 'EUR', 'Москва', '2016-01-01'], ['Программист', '70', '90', 'RUR', 'Москва', '2015-07-01']]).codes('name').tolist()
+        [0, 1, 0]
+        """
+
+        salary_from_index = titles.index('salary_from')
+        salary_to_index = titles.index('salary_to')
+        published_at_index = titles.index('published_at')
+        columns = [column for column in self.categorical_columns if column in titles]
+        column_indexes = [titles.index(column) for column in columns]
+
+        salary_from, salary_to, date_codes, dates = array('d'), array('d'), array('i'), {}
+        codes = [array('i') for _ in columns]
+        mappings = [{} for _ in columns]
+        for row in rows:
+            salary_from.append(float(row[salary_from_index]))
+            salary_to.append(float(row[salary_to_index]))
+            date = row[published_at_index][:10]
+            code = dates.get(date)
+            if code is None:
+                code = dates[date] = len(dates)
+            date_codes.append(code)
+            for column_codes, mapping, index in zip(codes, mappings, column_indexes):
+                value = row[index]
+                code = mapping.get(value)
+                if code is None:
+                    code = mapping[value] = len(mapping)
+                column_codes.append(code)
+
+        self.__salary_from = np.frombuffer(salary_from, dtype=np.float64)
+        self.__salary_to = np.frombuffer(salary_to, dtype=np.float64)
+        self.__published_at = np.array(list(dates), dtype='datetime64[D]')[np.frombuffer(date_codes, dtype=np.int32)]
+        self.__years = self.published_years(self.__published_at)
+        self.__codes = {column: np.frombuffer(column_codes, dtype=np.int32)
+                        for column, column_codes in zip(columns, codes)}
+        self.__categories = {column: list(mapping) for column, mapping in zip(columns, mappings)}
+        self.__average_salary = None
+        self.__currency_rates = None
+
+    @classmethod
+    def from_file(cls, file_name: str):
+        """Создаёт ColumnarDataSet по csv-файлу, считывая его потоково и не создавая словарей вакансий
+
+        Args:
+            file_name (str): Имя файла для считывания
+        """
+
+        dataset = DataSet(file_name, is_streaming=True)
+        return cls(dataset.titles, dataset.iterate_rows())
+
+    @classmethod
+    def from_dictionaries(cls, data):
+        """Создаёт ColumnarDataSet по словарям вакансий, например, по данным DataSet
+
+        Args:
+            data (list or generator): Список словарей с вакансиями
+        """
+
+        data = iter(data)
+        first_row = next(data, None)
+        if first_row is None:
+            return cls(['name', 'salary_from', 'salary_to', 'salary_currency', 'area_name', 'published_at'], [])
+        titles = list(first_row.keys())
+        return cls(titles, ([row_dict[title] for title in titles] for row_dict in chain([first_row], data)))
+
+    @classmethod
+    def load(cls, directory_name: str):
+        """Открывает сохранённые столбцы через numpy.memmap без считывания их в память. Страницы файлов читаются
+           по мере обращения и разделяются через кэш ОС между всеми процессами, открывшими ту же директорию
+
+        Args:
+            directory_name (str): Директория с сохранёнными столбцами
+        """
+
+        with open(os.path.join(directory_name, cls.meta_name), 'r', encoding='utf-8') as file:
+            meta = json.load(file)
+        dataset = cls.__new__(cls)
+        dataset.__salary_from = np.load(os.path.join(directory_name, 'salary_from.npy'), mmap_mode='r')
+        dataset.__salary_to = np.load(os.path.join(directory_name, 'salary_to.npy'), mmap_mode='r')
+        dataset.__published_at = np.load(os.path.join(directory_name, 'published_at.npy'), mmap_mode='r')
+        dataset.__years = np.load(os.path.join(directory_name, 'years.npy'), mmap_mode='r')
+        dataset.__codes = {column: np.load(os.path.join(directory_name, f'{column}_codes.npy'), mmap_mode='r')
+                           for column in meta['columns']}
+        with open(os.path.join(directory_name, 'categories.json'), 'r', encoding='utf-8') as file:
+            dataset.__categories = json.load(file)
+        dataset.__average_salary = None
+        dataset.__currency_rates = None
+        return dataset
+
+    @classmethod
+    def from_cache(cls, file_name: str, directory_name: str):
+        """Открывает столбцы csv-файла из директории кэша. Если кэша нет, он создан по другому файлу или файл
+           изменился после его создания, csv-файл однократно разбирается и столбцы сохраняются в кэш
+
+        Args:
+            file_name (str): Имя csv-файла с вакансиями
+            directory_name (str): Директория кэша столбцов
+        """
+
+        stat = os.stat(file_name)
+        source = [os.path.abspath(file_name), stat.st_size, stat.st_mtime_ns]
+        meta_path = os.path.join(directory_name, cls.meta_name)
+        if os.path.isfile(meta_path):
+            with open(meta_path, 'r', encoding='utf-8') as file:
+                meta = json.load(file)
+            if meta['source'] == source and meta.get('format') == cls.cache_format:
+                return cls.load(directory_name)
+        cls.from_file(file_name).save(directory_name, source=source)
+        return cls.load(directory_name)
+
+    def save(self, directory_name: str, source: list = None):
+        """Сохраняет столбцы в директорию: числовые столбцы и коды - в .npy файлы, списки значений - в json.
+           Каждый файл сначала записывается под временным именем и затем заменяется через os.replace, поэтому
+           процессы, открывшие прежние файлы через numpy.memmap, продолжают читать их целиком. Файл meta.json
+           удаляется до записи и заменяется последним: пока его нет, load не открывает директорию
+
+        Args:
+            directory_name (str): Директория для сохранения столбцов
+            source (list or NoneType): Абсолютный путь, размер и время изменения исходного csv-файла для проверки
+                                       актуальности кэша
+        """
+
+        os.makedirs(directory_name, exist_ok=True)
+        meta_path = os.path.join(directory_name, self.meta_name)
+        if os.path.isfile(meta_path):
+            os.remove(meta_path)
+        arrays = {'salary_from.npy': self.__salary_from, 'salary_to.npy': self.__salary_to,
+                  'published_at.npy': self.__published_at, 'years.npy': self.__years}
+        arrays.update({f'{column}_codes.npy': codes for column, codes in self.__codes.items()})
+        for name, array in arrays.items():
+            with open(os.path.join(directory_name, name + '.tmp'), 'wb') as file:
+                np.save(file, array)
+        with open(os.path.join(directory_name, 'categories.json.tmp'), 'w', encoding='utf-8') as file:
+            json.dump(self.__categories, file, ensure_ascii=False)
+        for name in list(arrays) + ['categories.json']:
+            os.replace(os.path.join(directory_name, name + '.tmp'), os.path.join(directory_name, name))
+        with open(meta_path + '.tmp', 'w', encoding='utf-8') as file:
+            json.dump({'columns': list(self.__codes), 'source': source, 'format': self.cache_format}, file)
+        os.replace(meta_path + '.tmp', meta_path)
+
+    @property
+    def salary_from(self):
+        """Возвращает значение приватного поля с нижними границами вилок окладов"""
+
+        return self.__salary_from
+
+    @property
+    def salary_to(self):
+        """Возвращает значение приватного поля с верхними границами вилок окладов"""
+
+        return self.__salary_to
+
+    @property
+    def published_at(self):
+        """Возвращает значение приватного поля с датами публикации"""
+
+        return self.__published_at
+
+    @property
+    def years(self):
+        """Возвращает значение приватного поля с годами публикации"""
+
+        return self.__years
+
+    @property
+    def vacancies_count(self):
+        """Возвращает количество вакансий"""
+
+        return len(self.__years)
+
+    @staticmethod
+    def published_years(published_at: np.ndarray):
+        """Векторно выделяет годы из дат публикации
+
+        Args:
+            published_at (np.ndarray): Даты публикации типа datetime64
+
+        >>> ColumnarDataSet.published_years(np.array(['2007-12-03', '2022-01-01'], dtype='datetime64[D]')).tolist()
+        [2007, 2022]
+        """
+
+        return (published_at.astype('datetime64[Y]').astype(np.int64) + 1970).astype(np.int16)
+
+    def set_currency_rates(self, currency_rates):
+        """Задаёт таблицу курсов валют по месяцам, по которой будут пересчитаны средние оклады
+
+        Args:
+            currency_rates (CurrencyRates or NoneType): Таблица курсов. None - статический курс
+        """
+
+        self.__currency_rates = currency_rates
+        self.__average_salary = None
+
+    @property
+    def average_salary(self):
+        """Возвращает средние оклады в рублях, вычисляя их векторно по таблице курсов на месяц публикации или, если
+           она не задана, по курсам Vacancy.currency_to_rub
+
+        >>> ColumnarDataSet(['name', 'salary_from', 'salary_to', 'salary_currency', 'area_name', 'published_at'], [['Программист', '7000', '90000', 'RUR', 'Екатеринбург', '2015-05-01'], ['Пакавальнік', '70', '90', 'BYR', 'Мінск', '2015-07-01']]).average_salary.tolist()
+        [48500.0, 1912.8]
+        """
+
+        if self.__average_salary is None and self.__currency_rates is not None:
+            self.__average_salary = self.__currency_rates.convert(
+                (self.__salary_from + self.__salary_to) / 2, self.categories('salary_currency'),
+                self.codes('salary_currency'), self.__published_at)
+        if self.__average_salary is None:
+            rates = np.array([Vacancy.currency_to_rub[currency] for currency in self.categories('salary_currency')],
+                             dtype=np.float64)
+            self.__average_salary = (self.__salary_from + self.__salary_to) / 2 * \
+                rates[self.codes('salary_currency')]
+        return self.__average_salary
+
+    def codes(self, column: str):
+        """Возвращает массив кодов значений строкового столбца
+
+        Args:
+            column (str): Название столбца
+        """
+
+        return self.__codes[column]
+
+    def categories(self, column: str):
+        """Возвращает список значений строкового столбца, где индекс значения - его код
+
+        Args:
+            column (str): Название столбца
+        """
+
+        return self.__categories[column]
+
+    def decode(self, column: str):
+        """Восстанавливает значения строкового столбца по кодам
+
+        Args:
+            column (str): Название столбца
+        """
+
+        return np.array(self.__categories[column], dtype=object)[self.__codes[column]]
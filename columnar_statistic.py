@@ -0,0 +1,349 @@
+import math
+import numpy as np
+from columnar_dataset import ColumnarDataSet
+from statistic import Statistic, check_statistics_preparedness
+
+
+def first_group_indexes(codes: np.ndarray, groups_count: int):
+    """Возвращает для каждой группы индекс её первого появления в массиве кодов
+
+    Args:
+        codes (np.ndarray): Массив кодов групп
+        groups_count (int): Количество групп
+
+    >>> first_group_indexes(np.array([2, 0, 2, 1, 0]), 3).tolist()
+    [1, 3, 0]
+    """
+
+    first_indexes = np.full(groups_count, len(codes), dtype=np.int64)
+    np.minimum.at(first_indexes, codes, np.arange(len(codes)))
+    return first_indexes
+
+
+def group_sums(codes: np.ndarray, values: np.ndarray, groups_count: int):
+    """Возвращает точные суммы значений каждой группы. Значения упорядочиваются по кодам групп устойчивой сортировкой и
+       складываются math.fsum, поэтому суммы, как и в Statistic, не зависят от порядка строк и не теряют младших
+       разрядов, в отличие от bincount с весами
+
+    Args:
+        codes (np.ndarray): Массив кодов групп
+        values (np.ndarray): Массив значений
+        groups_count (int): Количество групп
+
+    >>> group_sums(np.array([0, 2] * 10), np.array([0.1, 3.0] * 10), 3).tolist()
+    [1.0, 0.0, 30.0]
+    """
+
+    sorted_values = values[np.argsort(codes, kind='stable')].tolist()
+    ends = np.cumsum(np.bincount(codes, minlength=groups_count)).tolist()
+    sums = np.zeros(groups_count, dtype=np.float64)
+    start = 0
+    for code, end in enumerate(ends):
+        sums[code] = math.fsum(sorted_values[start:end])
+        start = end
+    return sums
+
+
+def group_quantiles(codes: np.ndarray, values: np.ndarray, groups_count: int, fractions: tuple):
+    """Возвращает точные квантили значений каждой группы: наименьшее значение, ранг которого в группе не меньше доли
+       от количества значений группы, как в KllSketch. Значения сортируются один раз внутри групп, для пустых групп
+       квантили равны 0
+
+    Args:
+        codes (np.ndarray): Массив кодов групп
+        values (np.ndarray): Массив значений
+        groups_count (int): Количество групп
+        fractions (tuple): Доли от 0 до 1
+
+    >>> group_quantiles(np.array([0, 1, 0, 0, 1]), np.array([3.0, 5.0, 1.0, 2.0, 4.0]), 3, (0.5, 0.9)).tolist()
+    [[2.0, 4.0, 0.0], [3.0, 5.0, 0.0]]
+    """
+
+    sorted_values = values[np.lexsort((values, codes))]
+    counts = np.bincount(codes, minlength=groups_count)
+    starts = np.cumsum(counts) - counts
+    quantiles = np.zeros((len(fractions), groups_count), dtype=np.float64)
+    filled = counts > 0
+    for index, fraction in enumerate(fractions):
+        ranks = np.maximum(np.ceil(fraction * counts).astype(np.int64), 1) - 1
+        quantiles[index, filled] = sorted_values[(starts + ranks)[filled]]
+    return quantiles
+
+
+class ColumnarStatistic:
+    """Класс для векторного подсчёта статистики по вакансиям из ColumnarDataSet. Вместо создания объектов Vacancy,
+       Year и City для каждой строки суммы и количества считаются сгруппированными по кодам редукциями numpy.
+       Выдаёт те же словари, что и Statistic, поэтому может передаваться в Report. Динамика может считаться не только по
+       годам, но и по кварталам или месяцам: периоды векторно выделяются из столбца дат публикации типа datetime64
+
+    Attributes:
+        self.__selected_vacancy (str): Выбранное название вакансии для дополнительной статистики
+        self.__dataset (ColumnarDataSet): Вакансии в колоночном виде
+        self.__period (str): Период динамики: 'year', 'quarter' или 'month'
+
+        self.__salary_dynamics (dict): Словарь, где ключ - год, а значение - средняя зарплата по всем вакансиям
+                                       в этот год
+        self.__num_vacancies_dynamics (dict): Словарь, где ключ - год, а значение - количество вакансий в этот год
+        self.__selected_salary_dynamics (dict): Словарь, где ключ - год, а значение - средняя зарплата среди вакансий с
+                                         выбранным названием в этот год
+        self.__selected_num_vacancies_dynamics (dict): Словарь, где ключ - год, а значение - количество вакансий с
+                                         выбранным названием в этот год
+        self.__city_salary_dynamics (dict): Словарь, где ключ - название города, а значение - средняя зарплата
+                                            в этом городе
+        self.__city_num_vacancies_dynamics (dict): Словарь, где ключ - название города, а значение - количество
+                                                   вакансий в этом городе
+        self.__salary_median_dynamics (dict): Словарь, где ключ - год, а значение - медиана зарплат в этот год
+        self.__salary_p90_dynamics (dict): Словарь, где ключ - год, а значение - 90-й перцентиль зарплат в этот год
+        self.__city_salary_median_dynamics (dict): Словарь, где ключ - название города из статистики зарплат по
+                                                   городам, а значение - медиана зарплат в этом городе
+        self.__city_salary_p90_dynamics (dict): Словарь, где ключ - название города из статистики зарплат по
+                                                городам, а значение - 90-й перцентиль зарплат в этом городе
+
+        self.__fulfillment (bool): Была ли посчитана статистика
+    """
+
+    periods = ('year', 'quarter', 'month')
+    """Статический кортеж возможных периодов динамики"""
+
+    def __init__(self, selected_vacancy: str, dataset: ColumnarDataSet, period: str = 'year'):
+        """Инициализирует объект ColumnarStatistic
+
+        Args:
+            selected_vacancy (str): Выбранное название вакансии для дополнительной статистики
+            dataset (ColumnarDataSet): Вакансии в колоночном виде
+            period (str): Период динамики. Для 'year' ключи словарей динамики - годы в порядке появления, для
+                          'quarter' и 'month' - строки вида '2022-Q3' и '2022-07' в хронологическом порядке
+
+        >>> ColumnarStatistic('Программист', ColumnarDataSet.from_dictionaries([{'name': 'Программист', 'salary_from': '80000', 'salary_to': '100000', 'salary_currency': 'RUR', 'area_name': 'Санкт-Петербург', 'published_at': '2022-07-17T18:23:06+0300'}])).salary_dynamics
+        {2022: 90000}
+        >>> ColumnarStatistic('Программист', ColumnarDataSet.from_dictionaries([{'name': 'Программист', 'salary_from': '80000', 'salary_to': '100000', 'salary_currency': 'RUR', 'area_name': 'Санкт-Петербург', 'published_at': '2022-07-17T18:23:06+0300'}])).city_num_vacancies_dynamics
+        {'Санкт-Петербург': 1.0}
+        >>> ColumnarStatistic('Программист', ColumnarDataSet.from_dictionaries([{'name': 'Программист', 'salary_from': '80000', 'salary_to': '100000', 'salary_currency': 'RUR', 'area_name': 'Москва', 'published_at': '2022-07-17T18:23:06+0300'}, {'name': 'Аналитик', 'salary_from': '10000', 'salary_to': '20000', 'salary_currency': 'RUR', 'area_name': 'Москва', 'published_at': '2022-05-01T18:23:06+0300'}]), 'month').selected_num_vacancies_dynamics
+        {'2022-05': 0, '2022-06': 0, '2022-07': 1}
+        """
+
+        if period not in self.periods:
+            raise Exception('Неизвестный период динамики')
+        self.__selected_vacancy = selected_vacancy
+        self.__dataset = dataset
+        self.__period = period
+
+        self.__salary_dynamics = {}
+        self.__num_vacancies_dynamics = {}
+        self.__selected_salary_dynamics = {}
+        self.__selected_num_vacancies_dynamics = {}
+        self.__city_salary_dynamics = {}
+        self.__city_num_vacancies_dynamics = {}
+        self.__salary_median_dynamics = {}
+        self.__salary_p90_dynamics = {}
+        self.__city_salary_median_dynamics = {}
+        self.__city_salary_p90_dynamics = {}
+
+        self.__fulfillment = False
+
+    @property
+    @check_statistics_preparedness
+    def salary_dynamics(self):
+        """Возвращает значение приватного поля с динамикой зарплат"""
+
+        return self.__salary_dynamics
+
+    @property
+    @check_statistics_preparedness
+    def num_vacancies_dynamics(self):
+        """Возвращает значение приватного поля с динамикой количества вакансий"""
+
+        return self.__num_vacancies_dynamics
+
+    @property
+    @check_statistics_preparedness
+    def selected_salary_dynamics(self):
+        """Возвращает значение приватного поля с динамикой зарплат для вакансий с выбранным названием"""
+
+        return self.__selected_salary_dynamics
+
+    @property
+    @check_statistics_preparedness
+    def selected_num_vacancies_dynamics(self):
+        """Возвращает значение приватного поля с динамикой количества вакансий с выбранным названием"""
+
+        return self.__selected_num_vacancies_dynamics
+
+    @property
+    @check_statistics_preparedness
+    def city_salary_dynamics(self):
+        """Возвращает значение приватного поля со статистикой зарплат по городам"""
+
+        return self.__city_salary_dynamics
+
+    @property
+    @check_statistics_preparedness
+    def city_num_vacancies_dynamics(self):
+        """Возвращает значение приватного поля со статистикой количества вакансий по городам"""
+
+        return self.__city_num_vacancies_dynamics
+
+    @property
+    @check_statistics_preparedness
+    def salary_median_dynamics(self):
+        """Возвращает значение приватного поля с динамикой медианы зарплат"""
+
+        return self.__salary_median_dynamics
+
+    @property
+    @check_statistics_preparedness
+    def salary_p90_dynamics(self):
+        """Возвращает значение приватного поля с динамикой 90-го перцентиля зарплат"""
+
+        return self.__salary_p90_dynamics
+
+    @property
+    @check_statistics_preparedness
+    def city_salary_median_dynamics(self):
+        """Возвращает значение приватного поля с медианой зарплат по городам"""
+
+        return self.__city_salary_median_dynamics
+
+    @property
+    @check_statistics_preparedness
+    def city_salary_p90_dynamics(self):
+        """Возвращает значение приватного поля с 90-м перцентилем зарплат по городам"""
+
+        return self.__city_salary_p90_dynamics
+
+    @property
+    @check_statistics_preparedness
+    def years(self):
+        """Возвращает список периодов динамики: годов в порядке их появления в данных, кварталов или месяцев"""
+
+        return list(self.__num_vacancies_dynamics.keys())
+
+    @property
+    def period(self):
+        """Возвращает значение приватного поля с периодом динамики"""
+
+        return self.__period
+
+    @property
+    def selected_vacancy(self):
+        """Возвращает значение приватного поля с выбранным названием вакансии"""
+
+        return self.__selected_vacancy
+
+    @property
+    def fulfillment(self):
+        """Возвращает значение приватного поля со значением того, была ли посчитана статистика"""
+
+        return self.__fulfillment
+
+    def selected_mask(self):
+        """Возвращает булев массив вакансий, в названии которых встречается выбранное название. Проверка подстроки
+           выполняется один раз для каждого различного названия, а не для каждой строки"""
+
+        is_selected_name = np.array([self.__selected_vacancy in name for name in self.__dataset.categories('name')],
+                                    dtype=bool)
+        return is_selected_name[self.__dataset.codes('name')]
+
+    def calculate_statistics(self):
+        """Считает статистику сгруппированными редукциями. Количества считаются bincount, а суммы зарплат точно
+           складываются math.fsum по группам, поэтому средние совпадают с подсчитанными Statistic при любом порядке
+           строк"""
+
+        if self.__dataset.vacancies_count == 0:
+            self.__fulfillment = True
+            return
+        self.calculate_years_statistics()
+        self.calculate_cities_statistics()
+        self.__fulfillment = True
+
+    def period_numbers(self):
+        """Векторно возвращает номер периода каждой вакансии: год, либо квартал или месяц, отсчитываемые от
+           января 1970 года"""
+
+        if self.__period == 'year':
+            return self.__dataset.years.astype(np.int64)
+        months = self.__dataset.published_at.astype('datetime64[M]').astype(np.int64)
+        return months // 3 if self.__period == 'quarter' else months
+
+    def period_name(self, number: int):
+        """Возвращает ключ словарей динамики по номеру периода
+
+        Args:
+            number (int): Номер периода
+
+        >>> statistic = ColumnarStatistic('', ColumnarDataSet.from_dictionaries([]), 'quarter')
+        >>> statistic.period_name(210)
+        '2022-Q3'
+        """
+
+        if self.__period == 'year':
+            return number
+        if self.__period == 'quarter':
+            return f'{1970 + number // 4}-Q{number % 4 + 1}'
+        return f'{1970 + number // 12}-{number % 12 + 1:02d}'
+
+    def calculate_years_statistics(self):
+        """Считает динамику зарплат и количества вакансий по периодам, в том числе для выбранной профессии. Годы
+           перечисляются в порядке появления, как в Statistic, а кварталы и месяцы - подряд от первого до последнего"""
+
+        salaries = self.__dataset.average_salary
+        numbers = self.period_numbers()
+        first_number = int(numbers.min())
+        year_codes = numbers - first_number
+        groups_count = int(year_codes.max()) + 1
+        counts = np.bincount(year_codes, minlength=groups_count)
+        sums = group_sums(year_codes, salaries, groups_count)
+
+        selected = self.selected_mask()
+        selected_counts = np.bincount(year_codes[selected], minlength=groups_count)
+        selected_sums = group_sums(year_codes[selected], salaries[selected], groups_count)
+        medians, p90s = group_quantiles(year_codes, salaries, groups_count, Statistic.quantile_fractions)
+
+        if self.__period == 'year':
+            order = np.argsort(first_group_indexes(year_codes, groups_count), kind='stable')
+        else:
+            order = range(groups_count)
+        for code in order:
+            if self.__period == 'year' and counts[code] == 0:
+                continue
+            year = self.period_name(first_number + int(code))
+            self.__salary_dynamics[year] = math.floor(sums[code] / counts[code]) if counts[code] > 0 else 0
+            self.__num_vacancies_dynamics[year] = int(counts[code])
+            self.__selected_salary_dynamics[year] = math.floor(selected_sums[code] / selected_counts[code]) \
+                if selected_counts[code] > 0 else 0
+            self.__selected_num_vacancies_dynamics[year] = int(selected_counts[code])
+            self.__salary_median_dynamics[year] = math.floor(medians[code])
+            self.__salary_p90_dynamics[year] = math.floor(p90s[code])
+
+    def calculate_cities_statistics(self):
+        """Считает уровень зарплат и долю вакансий по городам, в которых не меньше 1% вакансий. Медиана и 90-й
+           перцентиль зарплат по городам, в отличие от Statistic, точные"""
+
+        vacancies_count = self.__dataset.vacancies_count
+        city_codes = self.__dataset.codes('area_name')
+        cities = self.__dataset.categories('area_name')
+        counts = np.bincount(city_codes, minlength=len(cities))
+        sums = group_sums(city_codes, self.__dataset.average_salary, len(cities))
+
+        codes = [code for code in range(len(cities)) if counts[code] >= vacancies_count / 100]
+        by_salary = sorted(codes, key=lambda code: sums[code] / counts[code], reverse=True)[:10]
+        self.__city_salary_dynamics = {cities[code]: math.floor(sums[code] / counts[code]) for code in by_salary}
+        medians, p90s = group_quantiles(city_codes, self.__dataset.average_salary, len(cities),
+                                        Statistic.quantile_fractions)
+        self.__city_salary_median_dynamics = {cities[code]: math.floor(medians[code]) for code in by_salary}
+        self.__city_salary_p90_dynamics = {cities[code]: math.floor(p90s[code]) for code in by_salary}
+        by_count = sorted(codes, key=lambda code: counts[code], reverse=True)[:10]
+        self.__city_num_vacancies_dynamics = {cities[code]: round(int(counts[code]) / vacancies_count, 4)
+                                              for code in by_count}
+
+    def print_statistics(self):
+        """Выводит статистические данные в консоль с соответствующими подписями"""
+
+        periods = {'year': 'годам', 'quarter': 'кварталам', 'month': 'месяцам'}[self.__period]
+        print(f"Динамика уровня зарплат по {periods}:", self.salary_dynamics)
+        print(f"Динамика количества вакансий по {periods}:", self.num_vacancies_dynamics)
+        print(f"Динамика уровня зарплат по {periods} для выбранной профессии:", self.selected_salary_dynamics)
+        print(f"Динамика количества вакансий по {periods} для выбранной профессии:",
+              self.selected_num_vacancies_dynamics)
+        print("Уровень зарплат по городам (в порядке убывания):", self.city_salary_dynamics)
+        print("Доля вакансий по городам (в порядке убывания):", self.city_num_vacancies_dynamics)
@@ -0,0 +1,134 @@
+import csv
+import numpy as np
+from vacancy import Vacancy
+
+
+class CurrencyRates:
+    """Класс таблицы исторических курсов валют к рублю по месяцам. Курсы считываются из csv-файла, где первый столбец
+       date содержит месяц в виде 'YYYY-MM', а остальные столбцы - курсы валют с кодами из заголовков (пустое значение -
+       курс неизвестен). Пропуски заполняются последним известным курсом валюты, до первого известного курса и для
+       валют, которых нет в файле, используется статический курс Vacancy.currency_to_rub. Таблица строится один раз,
+       поэтому курс одной вакансии находится двумя поисками в словарях, а для столбцов окладов - одной векторной
+       выборкой из двумерного массива
+
+    Attributes:
+        self.__months (list): Список месяцев таблицы по возрастанию в виде 'YYYY-MM'
+        self.__rates (dict): Словарь, где ключ - код валюты, а значение - словарь (месяц: курс) начиная с первого
+                             известного курса валюты
+        self.__fallback_rates (dict): Словарь курсов для месяцев до первого известного курса и неизвестных валют
+        self.__first_month (int): Номер первого месяца таблицы, отсчитываемый от января 1970 года
+    """
+
+    def __init__(self, rates: dict, fallback_rates: dict = None):
+        """Инициализирует объект CurrencyRates, заполняя пропуски последним известным курсом
+
+        Args:
+            rates (dict): Словарь, где ключ - код валюты, а значение - словарь (месяц 'YYYY-MM': курс)
+            fallback_rates (dict or NoneType): Курсы для месяцев без данных, по умолчанию Vacancy.currency_to_rub
+
+        >>> rates = CurrencyRates({'USD': {'2007-01': 26.5, '2007-03': 26.1}})
+        >>> rates.rate('USD', '2007-02-11T10:00:00+0300'), rates.rate('USD', '2022-07-17'), rates.rate('USD', '2006-05')
+        (26.5, 26.1, 60.66)
+        """
+
+        self.__fallback_rates = dict(Vacancy.currency_to_rub if fallback_rates is None else fallback_rates)
+        known_months = sorted({month for month_rates in rates.values() for month in month_rates})
+        if known_months:
+            first, last = np.datetime64(known_months[0], 'M'), np.datetime64(known_months[-1], 'M')
+            self.__months = [str(month) for month in np.arange(first, last + 1)]
+            self.__first_month = int(first.astype(np.int64))
+        else:
+            self.__months, self.__first_month = [], 0
+        self.__rates = {}
+        for currency, month_rates in rates.items():
+            filled, rate = {}, None
+            for month in self.__months:
+                rate = month_rates.get(month, rate)
+                if rate is not None:
+                    filled[month] = rate
+            self.__rates[currency] = filled
+
+    @classmethod
+    def from_file(cls, file_name: str, fallback_rates: dict = None):
+        """Создаёт CurrencyRates по csv-файлу с курсами валют по месяцам
+
+        Args:
+            file_name (str): Имя csv-файла с курсами
+            fallback_rates (dict or NoneType): Курсы для месяцев без данных, по умолчанию Vacancy.currency_to_rub
+        """
+
+        with open(file_name, 'r', encoding='utf-8-sig') as file:
+            reader = csv.reader(file, delimiter=',')
+            titles = next(reader)
+            rates = {currency: {} for currency in titles[1:]}
+            for row in reader:
+                for currency, value in zip(titles[1:], row[1:]):
+                    if value != '':
+                        rates[currency][row[0][:7]] = float(value)
+        return cls(rates, fallback_rates)
+
+    @property
+    def months(self):
+        """Возвращает значение приватного поля со списком месяцев таблицы"""
+
+        return self.__months
+
+    def rate(self, currency: str, published_at: str):
+        """Возвращает курс валюты к рублю на месяц публикации вакансии
+
+        Args:
+            currency (str): Код валюты
+            published_at (str): Дата публикации вакансии, начинающаяся с 'YYYY-MM'
+        """
+
+        month_rates = self.__rates.get(currency)
+        if month_rates:
+            month = published_at[:7]
+            rate = month_rates.get(month)
+            if rate is not None:
+                return rate
+            if month > self.__months[-1]:
+                return month_rates[self.__months[-1]]
+        rate = self.__fallback_rates.get(currency)
+        if rate is None:
+            raise Exception(f'Нет курса валюты {currency} на {published_at[:7]}')
+        return rate
+
+    def rates_table(self, currencies: list):
+        """Возвращает двумерный массив курсов, где строка - валюта из списка, нулевой столбец - курс до начала
+           таблицы, а остальные столбцы - курсы по месяцам таблицы. Неизвестный курс равен nan: ошибкой он становится
+           только если нужен вакансии
+
+        Args:
+            currencies (list): Список кодов валют
+        """
+
+        table = np.empty((len(currencies), len(self.__months) + 1), dtype=np.float64)
+        for index, currency in enumerate(currencies):
+            fallback = self.__fallback_rates.get(currency, np.nan)
+            month_rates = self.__rates.get(currency, {})
+            table[index, 0] = fallback
+            table[index, 1:] = [month_rates.get(month, fallback) for month in self.__months]
+        return table
+
+    def convert(self, salaries: np.ndarray, currencies: list, currency_codes: np.ndarray, published_at: np.ndarray):
+        """Векторно переводит оклады в рубли по курсам на месяцы публикации. Как и rate, выбрасывает исключение,
+           если курса валюты какой-либо вакансии на месяц её публикации нет
+
+        Args:
+            salaries (np.ndarray): Оклады в валюте вакансий
+            currencies (list): Список кодов валют, индекс валюты - её код в currency_codes
+            currency_codes (np.ndarray): Коды валют вакансий
+            published_at (np.ndarray): Даты публикации вакансий типа datetime64
+
+        >>> CurrencyRates({'USD': {'2007-01': 26.5, '2007-03': 26.1}}).convert(np.array([10.0, 10.0, 10.0, 10.0]), ['RUR', 'USD'], np.array([0, 1, 1, 1]), np.array(['2007-02-01', '2007-02-01', '2007-03-05', '2022-01-01'], dtype='datetime64[D]')).tolist()
+        [10.0, 265.0, 261.0, 261.0]
+        """
+
+        months = published_at.astype('datetime64[M]')
+        columns = np.clip(months.astype(np.int64) - self.__first_month + 1, 0, len(self.__months))
+        rates = self.rates_table(currencies)[currency_codes, columns]
+        missing = np.flatnonzero(np.isnan(rates))
+        if len(missing) > 0:
+            raise Exception(f'Нет курса валюты {currencies[currency_codes[missing[0]]]} на {months[missing[0]]}')
+        return salaries * rates
@@ -6,30 +6,49 @@ class DataSet:
 
     Attributes:
         self.__file (io.TextIOWrapper): Открытый csv-файл
-        self.__data (csv.reader or list): Данные, считанные с csv-файла
+        self.__reader (csv.reader): Reader, построчно считывающий csv-файл
+        self.__data (csv.reader, generator or list): Данные, считанные с csv-файла
         self.__titles (list): Заголовки, полученные первой строкой с файла
+        self.__is_streaming (bool): Отдаются ли словари вакансий лениво, без загрузки всего файла в память
+        self.__offset (int or NoneType): Позиция в байтах, до которой файл считан целыми записями. Отслеживается,
+                                         только если задана начальная позиция считывания
+        self.__lines_offset (int): Позиция конца последней строки, отданной reader
+        self.__is_tail_reached (bool): Дошёл ли reader до конца файла
     """
 
-    def __init__(self, file_name: str):
+    def __init__(self, file_name: str, is_streaming: bool = False, start_offset: int = None):
         """Инициализирует объект DataSet, объединяет заголовки со значениями строк в словари
 
         Args::
             file_name (str): Имя файла для считывания
+            is_streaming (bool): Если True, data будет одноразовым генератором словарей, а не списком
+            start_offset (int or NoneType): Позиция в байтах, с которой начинается считывание вакансий (заголовки
+                                            всегда берутся из начала файла). Если задана, файл читается в двоичном
+                                            режиме и считанная позиция доступна через offset
 
         >>> type(DataSet('vacancies.csv')).__name__
         'DataSet'
         >>> DataSet('vacancies.csv').titles
         ['name', 'description', 'key_skills', 'experience_id', 'premium', 'employer_name', 'salary_from', 'salary_to', 'salary_gross', 'salary_currency', 'area_name', 'published_at']
+        >>> type(DataSet('vacancies.csv', is_streaming=True).data).__name__
+        'generator'
         """
 
-        self.__file = open(file_name, 'r', encoding='utf-8-sig')
-        self.__data = csv.reader(self.__file, delimiter=',')
+        self.__offset = None
+        if start_offset is None:
+            self.__file = open(file_name, 'r', encoding='utf-8-sig')
+            self.__reader = csv.reader(self.__file, delimiter=',')
+        else:
+            self.__file = open(file_name, 'rb')
+            self.__reader = csv.reader(self.read_lines_from(start_offset), delimiter=',')
+        self.__data = self.__reader
         self.__titles = next(self.data)
+        self.__is_streaming = is_streaming
         self.glue_row_dictionaries()
 
     @property
     def data(self):
-        """Возвращает значение приватного поля с reader"""
+        """Возвращает значение приватного поля с данными"""
 
         return self.__data
 
@@ -39,8 +58,70 @@ class DataSet:
 
         return self.__titles
 
+    @property
+    def is_streaming(self):
+        """Возвращает значение приватного поля с режимом ленивого считывания"""
+
+        return self.__is_streaming
+
+    @property
+    def offset(self):
+        """Возвращает значение приватного поля с позицией в байтах, до которой файл считан"""
+
+        return self.__offset
+
+    def read_lines_from(self, start_offset: int):
+        """Отдаёт строку заголовков, а затем строки файла начиная с указанной позиции, отслеживая позицию конца
+           последней отданной строки. Последняя строка без перевода строки считается недописанной и не отдаётся
+
+        Args:
+            start_offset (int): Позиция в байтах, с которой начинается считывание вакансий
+        """
+
+        header = self.__file.readline()
+        self.__offset = self.__lines_offset = max(start_offset, len(header))
+        yield header.decode('utf-8-sig')
+        self.__file.seek(self.__lines_offset)
+        for line in self.__file:
+            if not line.endswith(b'\n'):
+                break
+            self.__lines_offset += len(line)
+            line = line.decode('utf-8')
+            yield line[:-2] + '\n' if line.endswith('\r\n') else line
+        self.__is_tail_reached = True
+
+    def iterate_rows(self):
+        """Лениво отдаёт строки файла, прошедшие проверку, в виде списков значений. Строка считается корректной,
+           если число значений совпадает с числом заголовков и среди них нет пустых. По окончании файл закрывается"""
+
+        if self.__offset is not None:
+            yield from self.iterate_tracked_rows()
+            return
+        titles_count = len(self.__titles)
+        for row in self.__reader:
+            if len(row) == titles_count and "" not in row:
+                yield row
+        self.__file.close()
+
+    def iterate_tracked_rows(self):
+        """Лениво отдаёт прошедшие проверку строки файла, сдвигая offset на конец каждой полностью считанной записи.
+           Запись, оборванная концом файла (например, внутри многострочного поля в кавычках), не учитывается и будет
+           считана следующим запуском"""
+
+        titles_count = len(self.__titles)
+        self.__is_tail_reached = False
+        for row in self.__reader:
+            if self.__is_tail_reached:
+                break
+            self.__offset = self.__lines_offset
+            if len(row) == titles_count and "" not in row:
+                yield row
+        self.__file.close()
+
     def glue_row_dictionaries(self):
-        """Объединяет заголовки со считанной из файла информацией, формируя словари, где заголовки - ключи"""
+        """Объединяет заголовки со считанной из файла информацией, формируя словари, где заголовки - ключи.
+           В потоковом режиме словари создаются по одному при итерации"""
 
-        self.__data = filter(lambda row: len(row) == len(self.__titles) and "" not in row, self.__data)
-        self.__data = list(dict(zip(self.__titles, row)) for row in self.__data)
+        self.__data = (dict(zip(self.__titles, row)) for row in self.iterate_rows())
+        if not self.__is_streaming:
+            self.__data = list(self.__data)
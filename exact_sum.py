@@ -0,0 +1,42 @@
+import math
+
+
+def add_exact(partials: list, value: float):
+    """Добавляет значение к точной сумме, хранящейся как список неперекрывающихся частичных сумм (алгоритм Шевчука,
+       на котором основан math.fsum). Сумма не теряет младших разрядов, поэтому math.fsum(partials) не зависит от
+       порядка сложения и от того, как значения были разделены на части и объединены
+
+    Args:
+        partials (list): Частичные суммы, изменяются на месте
+        value (float): Добавляемое значение
+
+    >>> partials = []
+    >>> for value in [2.0 ** 53, 1.0, 1.0]:
+    ...     add_exact(partials, value)
+    >>> math.fsum(partials) == 2.0 ** 53 + 2
+    True
+    """
+
+    index = 0
+    for partial in partials:
+        if abs(value) < abs(partial):
+            value, partial = partial, value
+        high = value + partial
+        low = partial - (high - value)
+        if low:
+            partials[index] = low
+            index += 1
+        value = high
+    partials[index:] = [value]
+
+
+def merge_exact(partials: list, other: list):
+    """Добавляет к точной сумме другую точную сумму
+
+    Args:
+        partials (list): Частичные суммы, изменяются на месте
+        other (list): Частичные суммы другой части данных
+    """
+
+    for value in other:
+        add_exact(partials, value)
@@ -0,0 +1,190 @@
+import heapq
+
+
+class SpaceSaving:
+    """Класс сводки Space-Saving для поиска самых частых значений потока (например, городов вакансий) в памяти
+       фиксированного размера. Хранится не больше capacity счётчиков. Значение, которого нет в сводке, заменяет
+       значение с наименьшим счётчиком и получает его счётчик плюс один, а прежний счётчик запоминается как возможная
+       ошибка. Истинное количество значения лежит между count - error и count, а ошибка любого значения не больше
+       total / capacity. Любое значение, встречающееся чаще total / capacity раз, гарантированно есть в сводке.
+       Для каждого значения также накапливается сумма зарплат вакансий, пришедших, пока оно было в сводке
+
+    Attributes:
+        self.__capacity (int): Максимальное количество счётчиков
+        self.__counters (dict): Словарь, где ключ - значение, а значение - список из оценки количества, ошибки,
+                                количества учтённых зарплат и их суммы
+        self.__heap (list): Куча пар (количество, значение) для поиска наименьшего счётчика. Количества в ней могут
+                            отставать от счётчиков и уточняются при вытеснении
+        self.__total (int): Количество всех значений потока
+    """
+
+    def __init__(self, capacity: int):
+        """Инициализирует пустой объект SpaceSaving
+
+        Args:
+            capacity (int): Максимальное количество счётчиков
+
+        >>> summary = SpaceSaving(2)
+        >>> for city in ['Москва', 'Казань', 'Москва', 'Тверь', 'Москва']:
+        ...     summary.update(city, 100.0)
+        >>> summary.top(2)
+        ['Москва', 'Тверь']
+        >>> summary.bounds('Москва'), summary.bounds('Тверь')
+        ((3, 3), (1, 2))
+        """
+
+        if capacity < 1:
+            raise Exception('Размер сводки должен быть положительным')
+        self.__capacity = capacity
+        self.__counters = {}
+        self.__heap = []
+        self.__total = 0
+
+    @property
+    def capacity(self):
+        """Возвращает значение приватного поля с максимальным количеством счётчиков"""
+
+        return self.__capacity
+
+    @property
+    def total(self):
+        """Возвращает значение приватного поля с количеством всех значений потока"""
+
+        return self.__total
+
+    @property
+    def max_error(self):
+        """Возвращает наибольшую возможную ошибку количества: наименьший счётчик заполненной сводки (не больше
+           total / capacity) или 0, если вытеснений ещё не было"""
+
+        if len(self.__counters) < self.__capacity:
+            return 0
+        return min(counter[0] for counter in self.__counters.values())
+
+    def __contains__(self, value):
+        """Проверяет, есть ли значение в сводке
+
+        Args:
+            value: Значение потока
+        """
+
+        return value in self.__counters
+
+    def __len__(self):
+        """Возвращает количество значений в сводке"""
+
+        return len(self.__counters)
+
+    def update(self, value, salary: float):
+        """Учитывает очередное значение потока и зарплату его вакансии
+
+        Args:
+            value: Значение потока
+            salary (float): Средняя зарплата вакансии в рублях
+        """
+
+        self.__total += 1
+        counter = self.__counters.get(value)
+        if counter is not None:
+            counter[0] += 1
+            counter[2] += 1
+            counter[3] += salary
+            return
+        if len(self.__counters) < self.__capacity:
+            self.__counters[value] = [1, 0, 1, salary]
+            heapq.heappush(self.__heap, (1, value))
+            return
+        minimum = self.evict()
+        self.__counters[value] = [minimum + 1, minimum, 1, salary]
+        heapq.heappush(self.__heap, (minimum + 1, value))
+
+    def evict(self):
+        """Удаляет значение с наименьшим счётчиком и возвращает этот счётчик. Устаревшие записи кучи обновляются"""
+
+        while True:
+            count, value = self.__heap[0]
+            counter = self.__counters.get(value)
+            if counter is not None and counter[0] == count:
+                heapq.heappop(self.__heap)
+                del self.__counters[value]
+                return count
+            if counter is None:
+                heapq.heappop(self.__heap)
+            else:
+                heapq.heapreplace(self.__heap, (counter[0], value))
+
+    def merge(self, other):
+        """Объединяет сводку со сводкой другой части потока. Значение, которого нет в одной из сводок, получает от неё
+           наименьший счётчик как оценку и ошибку, затем остаются capacity значений с наибольшими счётчиками
+
+        Args:
+            other (SpaceSaving): Сводка другой части потока
+        """
+
+        own_error, other_error = self.max_error, other.max_error
+        merged = {}
+        for value in set(self.__counters) | set(other.counters):
+            own = self.__counters.get(value, [own_error, own_error, 0, 0])
+            another = other.counters.get(value, [other_error, other_error, 0, 0])
+            merged[value] = [own[index] + another[index] for index in range(4)]
+        kept = sorted(merged.items(), key=lambda item: item[1][0], reverse=True)[:self.__capacity]
+        self.__counters = dict(kept)
+        self.__heap = [(counter[0], value) for value, counter in kept]
+        heapq.heapify(self.__heap)
+        self.__total += other.total
+
+    @property
+    def counters(self):
+        """Возвращает значение приватного поля со словарём счётчиков"""
+
+        return self.__counters
+
+    def count(self, value):
+        """Возвращает оценку количества значения сверху (0, если значения нет в сводке)
+
+        Args:
+            value: Значение потока
+        """
+
+        counter = self.__counters.get(value)
+        return counter[0] if counter is not None else 0
+
+    def bounds(self, value):
+        """Возвращает нижнюю и верхнюю границы истинного количества значения
+
+        Args:
+            value: Значение потока
+        """
+
+        counter = self.__counters.get(value)
+        if counter is None:
+            return 0, self.max_error
+        return counter[0] - counter[1], counter[0]
+
+    def average_salary(self, value):
+        """Возвращает среднюю зарплату вакансий значения, пришедших, пока оно было в сводке. Если ошибка значения
+           равна нулю, средняя точная
+
+        Args:
+            value: Значение потока
+        """
+
+        counter = self.__counters[value]
+        return counter[3] / counter[2]
+
+    def top(self, k: int, by_salary: bool = False, min_count: float = 0):
+        """Возвращает до k значений с наибольшими оценками количества или средней зарплаты. При равенстве значения
+           идут в порядке первого попадания в сводку. При отборе по зарплате min_count сравнивается с нижней границей
+           количества, поэтому средняя зарплата значения посчитана не меньше чем по min_count вакансиям
+
+        Args:
+            k (int): Количество значений
+            by_salary (bool): Сортировать ли по средней зарплате, а не по количеству
+            min_count (float): Наименьшее количество значений, участвующих в отборе
+        """
+
+        if by_salary:
+            values = [value for value, counter in self.__counters.items() if counter[0] - counter[1] >= min_count]
+            return sorted(values, key=self.average_salary, reverse=True)[:k]
+        values = [value for value, counter in self.__counters.items() if counter[0] >= min_count]
+        return sorted(values, key=self.count, reverse=True)[:k]
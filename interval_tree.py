@@ -0,0 +1,117 @@
+class IntervalTree:
+    """Класс центрированного дерева интервалов для поиска вилок оклада, содержащих значение или пересекающихся с
+       диапазоном. В каждом узле хранится центр - медиана концов интервалов поддерева, и интервалы, содержащие центр,
+       отсортированные по нижней границе по возрастанию и по верхней по убыванию. Интервалы левее центра уходят в
+       левое поддерево, правее - в правое. Глубина дерева O(log n), поэтому поиск по точке работает за
+       O(log n + k), где k - количество найденных интервалов
+
+    Attributes:
+        self.__root (list or NoneType): Корневой узел - список из центра, интервалов узла по нижней границе,
+                                        интервалов узла по верхней границе, левого и правого поддеревьев
+        self.__size (int): Количество интервалов в дереве
+    """
+
+    def __init__(self, intervals: list):
+        """Инициализирует объект IntervalTree, строя дерево по интервалам
+
+        Args:
+            intervals (list): Список кортежей (нижняя граница, верхняя граница, номер)
+
+        >>> tree = IntervalTree([(10000.0, 30000.0, 0), (25000.0, 50000.0, 1), (60000.0, 90000.0, 2)])
+        >>> sorted(tree.stab(27000.0)), sorted(tree.stab(55000.0))
+        ([0, 1], [])
+        >>> sorted(tree.overlap(45000.0, 70000.0))
+        [1, 2]
+        """
+
+        self.__size = len(intervals)
+        self.__root = self.build(intervals)
+
+    @property
+    def size(self):
+        """Возвращает значение приватного поля с количеством интервалов"""
+
+        return self.__size
+
+    def build(self, intervals: list):
+        """Рекурсивно строит узел по интервалам и возвращает его
+
+        Args:
+            intervals (list): Список кортежей (нижняя граница, верхняя граница, номер)
+        """
+
+        if not intervals:
+            return None
+        endpoints = sorted(bound for interval in intervals for bound in interval[:2])
+        center = endpoints[len(endpoints) // 2]
+        left, right, here = [], [], []
+        for interval in intervals:
+            if interval[1] < center:
+                left.append(interval)
+            elif interval[0] > center:
+                right.append(interval)
+            else:
+                here.append(interval)
+        return [center, sorted(here, key=lambda interval: interval[0]),
+                sorted(here, key=lambda interval: interval[1], reverse=True), self.build(left), self.build(right)]
+
+    def stab(self, point: float):
+        """Возвращает номера интервалов, содержащих точку, в порядке обхода дерева
+
+        Args:
+            point (float): Значение, например оклад
+        """
+
+        result = []
+        node = self.__root
+        while node is not None:
+            center, by_low, by_high, left, right = node
+            if point < center:
+                for low, high, number in by_low:
+                    if low > point:
+                        break
+                    result.append(number)
+                node = left
+            elif point > center:
+                for low, high, number in by_high:
+                    if high < point:
+                        break
+                    result.append(number)
+                node = right
+            else:
+                result.extend(number for low, high, number in by_low)
+                break
+        return result
+
+    def overlap(self, low: float, high: float):
+        """Возвращает номера интервалов, пересекающихся с отрезком [low, high], в порядке обхода дерева
+
+        Args:
+            low (float): Нижняя граница отрезка
+            high (float): Верхняя граница отрезка
+        """
+
+        result = []
+        nodes = [self.__root]
+        while nodes:
+            node = nodes.pop()
+            if node is None:
+                continue
+            center, by_low, by_high, left, right = node
+            if high < center:
+                for interval_low, interval_high, number in by_low:
+                    if interval_low > high:
+                        break
+                    result.append(number)
+                nodes.append(left)
+            elif low > center:
+                for interval_low, interval_high, number in by_high:
+                    if interval_high < low:
+                        break
+                    result.append(number)
+                nodes.append(right)
+            else:
+                result.extend(number for interval_low, interval_high, number in by_low)
+                nodes.append(left)
+                nodes.append(right)
+        return result
@@ -3,17 +3,24 @@ from report import Report
 from statistic import Statistic
 from table import Table
 from csvsplit import CsvSplitterByYear
+from statistic_cache import StatisticCache
 
 
-def print_statistics_report(vacancy_data: list):
+def print_statistics_report(file_name: str, statistic_cache: StatisticCache = None):
     """Выводит необходимую по заданию статистику и генерирует с ней же файлы
 
     Args:
-        vacancy_data (list): Список словарей с вакансиями для статистики
+        file_name (str): Имя csv-файла с вакансиями для статистики
+        statistic_cache (StatisticCache or NoneType): Кэш статистики. Если не задан, файл считывается потоково
     """
 
     profession_name = input("Введите название профессии: ")
-    statistic = Statistic(profession_name, vacancy_data)
+    if statistic_cache is not None:
+        statistic = statistic_cache.get_statistic(file_name, profession_name)
+    else:
+        dataset = DataSet(file_name, is_streaming=True)
+        statistic = Statistic(profession_name, [])
+        statistic.enter_rows(dataset.iterate_rows(), dataset.titles)
     statistic.print_statistics()
     report = Report(statistic)
     report.generate_excel()
@@ -39,12 +46,11 @@ def print_vacancy_table(vacancy_data: list):
 """Интерфейс для взаимодействия пользователя с вышеобъявленными методами"""
 
 # file_name = input('Введите название файла: ')
-# data = DataSet(file_name).data
 # output_settings = input('Вакансии или Статистика? ').lower()
 # if output_settings == 'вакансии':
-#     print_vacancy_table(data)
+#     print_vacancy_table(DataSet(file_name).data)
 # elif output_settings == 'статистика':
-#     print_statistics_report(data)
+#     print_statistics_report(file_name, StatisticCache('statistic_cache'))
 # else:
 #     raise Exception('Неверно введён праметр вывода')
 
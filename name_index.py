@@ -0,0 +1,170 @@
+import math
+import pickle
+from dataset import DataSet
+from exact_sum import add_exact, merge_exact
+from vacancy import Vacancy
+
+
+class NameIndex:
+    """Класс инвертированного индекса по названиям вакансий. Для каждого различного названия хранятся количество
+       вакансий и точная сумма их средних зарплат по годам, а по триграммам названий строятся списки названий, в
+       которых они встречаются. Запрос по профессии пересекает списки триграмм, проверяет подстроку только у
+       оставшихся названий и складывает их готовые суммы, не обращаясь к самим вакансиям
+
+    Attributes:
+        self.__names (list): Список различных названий вакансий в порядке появления
+        self.__sums (list): Для каждого названия словарь, где ключ - год, а значение - количество и частичные суммы
+                            зарплат
+        self.__years (list): Список годов в порядке появления в данных
+        self.__trigrams (dict): Словарь, где ключ - триграмма, а значение - список индексов названий с ней
+    """
+
+    def __init__(self, names: dict, years: list):
+        """Инициализирует объект NameIndex, строя списки триграмм
+
+        Args:
+            names (dict): Словарь, где ключ - название вакансии, а значение - словарь
+                          (год: [количество, частичные суммы])
+            years (list): Список годов в порядке появления в данных
+
+        >>> NameIndex({'Программист': {2015: [1, [10.0]]}, 'Художник': {2015: [2, [4.0]]}, 'Программист 1С': {2015: [1, [5.0]], 2016: [3, [3.0]]}}, [2015, 2016]).selected_sums('Программист')
+        {2015: (2, [15.0]), 2016: (3, [3.0])}
+        """
+
+        self.__names = list(names.keys())
+        self.__sums = [{year: (count, list(partials)) for year, (count, partials) in name_years.items()}
+                       for name_years in names.values()]
+        self.__years = list(years)
+        self.__trigrams = {}
+        for index, name in enumerate(self.__names):
+            for trigram in {name[i:i + 3] for i in range(len(name) - 2)}:
+                self.__trigrams.setdefault(trigram, []).append(index)
+
+    @classmethod
+    def from_data(cls, data):
+        """Создаёт NameIndex, однократно перебирая вакансии
+
+        Args:
+            data (list or generator): Список словарей с вакансиями или генератор потокового DataSet
+        """
+
+        return cls.from_vacancies(Vacancy(row_dict) for row_dict in data)
+
+    @classmethod
+    def from_vacancies(cls, vacancies):
+        """Создаёт NameIndex по объектам Vacancy, однократно перебирая их
+
+        Args:
+            vacancies (iterable): Объекты Vacancy, например генератор Vacancy.from_rows
+        """
+
+        names = {}
+        years = {}
+        for vacancy in vacancies:
+            years[vacancy.year] = None
+            name_years = names.setdefault(vacancy.name, {})
+            sums = name_years.get(vacancy.year)
+            if sums is None:
+                name_years[vacancy.year] = [1, [vacancy.average_salary]]
+            else:
+                sums[0] += 1
+                add_exact(sums[1], vacancy.average_salary)
+        return cls(names, list(years))
+
+    @classmethod
+    def from_file(cls, file_name: str):
+        """Создаёт NameIndex по csv-файлу, считывая его потоково
+
+        Args:
+            file_name (str): Имя csv-файла с вакансиями
+        """
+
+        return cls.from_data(DataSet(file_name, is_streaming=True).data)
+
+    @classmethod
+    def load(cls, file_name: str):
+        """Загружает сохранённый индекс
+
+        Args:
+            file_name (str): Имя файла индекса
+        """
+
+        with open(file_name, 'rb') as file:
+            return pickle.load(file)
+
+    def save(self, file_name: str):
+        """Сохраняет индекс в файл
+
+        Args:
+            file_name (str): Имя файла индекса
+        """
+
+        with open(file_name, 'wb') as file:
+            pickle.dump(self, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @property
+    def years(self):
+        """Возвращает значение приватного поля со списком годов"""
+
+        return self.__years
+
+    def find_names(self, selected_vacancy: str):
+        """Возвращает индексы названий, содержащих выбранное название вакансии, в порядке появления названий
+
+        Args:
+            selected_vacancy (str): Выбранное название вакансии
+        """
+
+        if len(selected_vacancy) < 3:
+            candidates = range(len(self.__names))
+        else:
+            postings = sorted((self.__trigrams.get(selected_vacancy[i:i + 3], [])
+                               for i in range(len(selected_vacancy) - 2)), key=len)
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                if not candidates:
+                    break
+                candidates.intersection_update(posting)
+            candidates = sorted(candidates)
+        return [index for index in candidates if selected_vacancy in self.__names[index]]
+
+    def selected_sums(self, selected_vacancy: str):
+        """Возвращает словарь, где ключ - год, а значение - количество и частичные суммы средних зарплат вакансий, в
+           названии которых встречается выбранное название. Суммы названий объединяются точно, поэтому средние
+           совпадают с подсчитанными Statistic
+
+        Args:
+            selected_vacancy (str): Выбранное название вакансии
+        """
+
+        selected = {}
+        for index in self.find_names(selected_vacancy):
+            for year, (count, partials) in self.__sums[index].items():
+                previous_count, previous_partials = selected.get(year, (0, []))
+                merge_exact(previous_partials, partials)
+                selected[year] = (previous_count + count, previous_partials)
+        return selected
+
+    def selected_salary_dynamics(self, selected_vacancy: str):
+        """Возвращает динамику зарплат по годам для выбранной профессии в том же виде, что и Statistic
+
+        Args:
+            selected_vacancy (str): Выбранное название вакансии
+
+        >>> NameIndex({'Программист': {2015: [2, [10.0]]}, 'Художник': {2016: [2, [4.0]]}}, [2015, 2016]).selected_salary_dynamics('Программист')
+        {2015: 5, 2016: 0}
+        """
+
+        selected = self.selected_sums(selected_vacancy)
+        return {year: math.floor(math.fsum(selected[year][1]) / selected[year][0]) if year in selected else 0
+                for year in self.__years}
+
+    def selected_num_vacancies_dynamics(self, selected_vacancy: str):
+        """Возвращает динамику количества вакансий по годам для выбранной профессии в том же виде, что и Statistic
+
+        Args:
+            selected_vacancy (str): Выбранное название вакансии
+        """
+
+        selected = self.selected_sums(selected_vacancy)
+        return {year: selected[year][0] if year in selected else 0 for year in self.__years}
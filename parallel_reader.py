@@ -0,0 +1,177 @@
+import csv
+import io
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from statistic import Statistic
+
+
+def parse_range(file_name: str, titles: list, start: int, end: int):
+    """Считывает и разбирает часть файла между двумя границами записей, возвращая строки, прошедшие проверку.
+       Выполняется в дочернем процессе
+
+    Args:
+        file_name (str): Имя csv-файла
+        titles (list): Заголовки файла
+        start (int): Позиция в байтах начала первой записи части
+        end (int): Позиция в байтах конца последней записи части
+    """
+
+    with open(file_name, 'rb') as file:
+        file.seek(start)
+        text = file.read(end - start).decode('utf-8')
+    titles_count = len(titles)
+    return [row for row in csv.reader(io.StringIO(text, newline=None), delimiter=',')
+            if len(row) == titles_count and "" not in row]
+
+
+def aggregate_range(file_name: str, titles: list, start: int, end: int, selected_vacancy: str):
+    """Считает частичную статистику по части файла. Выполняется в дочернем процессе
+
+    Args:
+        file_name (str): Имя csv-файла
+        titles (list): Заголовки файла
+        start (int): Позиция в байтах начала первой записи части
+        end (int): Позиция в байтах конца последней записи части
+        selected_vacancy (str): Выбранное название вакансии для дополнительной статистики
+    """
+
+    return Statistic(selected_vacancy, (dict(zip(titles, row)) for row in parse_range(file_name, titles, start, end)))
+
+
+class ParallelReader:
+    """Класс для параллельного разбора csv-файла в пуле процессов. Файл делится на диапазоны байтов, границы которых
+       сдвигаются на ближайший перевод строки вне кавычек, поэтому многострочные поля description не разрываются.
+       Чётность кавычек считается одним последовательным проходом по байтам файла, который намного быстрее разбора
+       csv. Каждый процесс разбирает свои диапазоны и возвращает строки или частичную статистику, результаты
+       объединяются в порядке диапазонов
+
+    Attributes:
+        self.__file_name (str): Имя csv-файла
+        self.__titles (list): Заголовки, полученные первой строкой с файла
+        self.__processes (int): Количество процессов
+        self.__ranges (list): Список пар позиций начала и конца диапазонов в байтах
+    """
+
+    def __init__(self, file_name: str, processes: int = None, range_size: int = 1 << 25, block_size: int = 1 << 20):
+        """Инициализирует объект ParallelReader, считывает заголовки и делит файл на диапазоны
+
+        Args:
+            file_name (str): Имя csv-файла
+            processes (int or NoneType): Количество процессов, по умолчанию - количество ядер
+            range_size (int): Примерный размер одного диапазона в байтах
+            block_size (int): Размер блока при поиске границ диапазонов
+
+        >>> ParallelReader('vacancies.csv', 1).titles[:3]
+        ['name', 'description', 'key_skills']
+        """
+
+        self.__file_name = file_name
+        self.__processes = processes or os.cpu_count() or 1
+        with open(file_name, 'r', encoding='utf-8-sig') as file:
+            self.__titles = next(csv.reader(file, delimiter=','))
+        self.__ranges = self.split_ranges(range_size, block_size)
+
+    @property
+    def titles(self):
+        """Возвращает значение приватного поля со списком заголовков"""
+
+        return self.__titles
+
+    @property
+    def ranges(self):
+        """Возвращает значение приватного поля со списком диапазонов"""
+
+        return self.__ranges
+
+    def split_ranges(self, range_size: int, block_size: int):
+        """Делит файл после строки заголовков на диапазоны примерно по range_size байт. Каждая граница сдвигается на
+           первый перевод строки, перед которым в файле чётное число кавычек, то есть на конец записи
+
+        Args:
+            range_size (int): Примерный размер одного диапазона в байтах
+            block_size (int): Размер блока при поиске границ диапазонов
+        """
+
+        size = os.path.getsize(self.__file_name)
+        with open(self.__file_name, 'rb') as file:
+            header = file.readline()
+            position, quotes = len(header), header.count(b'"')
+            boundaries = [position]
+            while position + range_size < size:
+                target = position + range_size
+                while position < target:
+                    block = file.read(min(block_size, target - position))
+                    quotes += block.count(b'"')
+                    position += len(block)
+                boundary = None
+                while boundary is None:
+                    block = file.read(block_size)
+                    if not block:
+                        break
+                    newline, counted, block_quotes = block.find(b'\n'), 0, 0
+                    while newline != -1:
+                        block_quotes += block.count(b'"', counted, newline)
+                        counted = newline
+                        if (quotes + block_quotes) % 2 == 0:
+                            boundary = position + newline + 1
+                            break
+                        newline = block.find(b'\n', newline + 1)
+                    if boundary is None:
+                        quotes += block.count(b'"')
+                        position += len(block)
+                    else:
+                        quotes += block_quotes
+                        position = boundary
+                        file.seek(boundary)
+                if boundary is None or boundary >= size:
+                    break
+                boundaries.append(boundary)
+            boundaries.append(size)
+        return [(start, end) for start, end in zip(boundaries, boundaries[1:]) if start < end]
+
+    def map_ranges(self, function, *args):
+        """Применяет функцию к диапазонам в пуле процессов и отдаёт результаты в порядке диапазонов. Одновременно в
+           обработке находится не больше 2 * processes диапазонов
+
+        Args:
+            function (function): Функция от имени файла, заголовков, границ диапазона и дополнительных аргументов
+            *args: Дополнительные аргументы функции
+        """
+
+        if self.__processes == 1:
+            for start, end in self.__ranges:
+                yield function(self.__file_name, self.__titles, start, end, *args)
+            return
+        with ProcessPoolExecutor(max_workers=self.__processes) as executor:
+            futures = deque()
+            for start, end in self.__ranges:
+                futures.append(executor.submit(function, self.__file_name, self.__titles, start, end, *args))
+                if len(futures) >= 2 * self.__processes:
+                    yield futures.popleft().result()
+            while futures:
+                yield futures.popleft().result()
+
+    def iterate_rows(self):
+        """Лениво отдаёт прошедшие проверку строки файла в виде списков значений в порядке файла"""
+
+        for rows in self.map_ranges(parse_range):
+            yield from rows
+
+    def iterate_dictionaries(self):
+        """Лениво отдаёт словари вакансий в порядке файла, как потоковый DataSet"""
+
+        for row in self.iterate_rows():
+            yield dict(zip(self.__titles, row))
+
+    def statistic(self, selected_vacancy: str):
+        """Возвращает Statistic по всему файлу, объединяя частичную статистику, посчитанную процессами
+
+        Args:
+            selected_vacancy (str): Выбранное название вакансии для дополнительной статистики
+        """
+
+        statistic = Statistic(selected_vacancy, [])
+        for other in self.map_ranges(aggregate_range, selected_vacancy):
+            statistic.merge(other)
+        return statistic
@@ -0,0 +1,172 @@
+import csv
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from partitioner import CsvPartitioner
+
+
+class PartitionedDataSet:
+    """Класс для представления директории с частями csv-файла, разделённого по годам (или по годам и месяцам), в виде
+       списка словарей вакансий. Считываются только части, попадающие в заданный диапазон годов, несколько файлов
+       считываются одновременно. Если в директории есть манифест CsvPartitioner, количество вакансий по годам
+       берётся из него без считывания строк. Без манифеста части ищутся по именам файлов, а файлы без строки
+       заголовков (первый файл старого CsvSplitterByYear) считываются целиком как данные
+
+    Attributes:
+        self.__directory_name (str): Директория с частями
+        self.__first_year (int or NoneType): Первый год диапазона включительно
+        self.__last_year (int or NoneType): Последний год диапазона включительно
+        self.__titles (list): Заголовки частей
+        self.__partitions (dict): Словарь, где ключ - ключ части, а значение - имя её файла и количество строк
+                                  (None, если манифеста нет)
+        self.__is_streaming (bool): Отдаются ли словари вакансий лениво, по одному файлу за раз
+        self.__threads (int): Количество одновременно считываемых файлов
+        self.__data (generator or list): Словари вакансий выбранных частей в порядке годов
+    """
+
+    def __init__(self, directory_name: str, first_year: int = None, last_year: int = None,
+                 is_streaming: bool = False, threads: int = 4):
+        """Инициализирует объект PartitionedDataSet, выбирает части по диапазону годов и считывает их
+
+        Args:
+            directory_name (str): Директория с частями
+            first_year (int or NoneType): Первый год диапазона включительно, по умолчанию без ограничения
+            last_year (int or NoneType): Последний год диапазона включительно, по умолчанию без ограничения
+            is_streaming (bool): Если True, data будет одноразовым генератором словарей, а не списком
+            threads (int): Количество одновременно считываемых файлов
+        """
+
+        self.__directory_name = directory_name
+        self.__first_year = first_year
+        self.__last_year = last_year
+        self.__is_streaming = is_streaming
+        self.__threads = threads
+        self.__titles, partitions = self.read_manifest()
+        self.__partitions = {key: partition for key, partition in sorted(partitions.items())
+                             if self.is_year_selected(int(key[:4]))}
+        self.__data = self.iterate_dictionaries()
+        if not is_streaming:
+            self.__data = list(self.__data)
+
+    @property
+    def data(self):
+        """Возвращает значение приватного поля с данными"""
+
+        return self.__data
+
+    @property
+    def titles(self):
+        """Возвращает значение приватного поля со списком заголовков"""
+
+        return self.__titles
+
+    @property
+    def partitions(self):
+        """Возвращает значение приватного поля со словарём выбранных частей"""
+
+        return self.__partitions
+
+    @property
+    def files(self):
+        """Возвращает список путей к файлам выбранных частей"""
+
+        return [os.path.join(self.__directory_name, partition['file']) for partition in self.__partitions.values()]
+
+    @property
+    def num_vacancies_dynamics(self):
+        """Возвращает словарь, где ключ - год, а значение - количество вакансий в этот год. При наличии манифеста
+           строки частей не считываются"""
+
+        dynamics = {}
+        for key, partition in self.__partitions.items():
+            count = partition['rows']
+            if count is None:
+                count = sum(1 for _ in self.iterate_partition(os.path.join(self.__directory_name, partition['file'])))
+            dynamics[int(key[:4])] = dynamics.get(int(key[:4]), 0) + count
+        return dynamics
+
+    def is_year_selected(self, year: int):
+        """Проверяет, попадает ли год в заданный диапазон
+
+        Args:
+            year (int): Год
+        """
+
+        return (self.__first_year is None or year >= self.__first_year) and \
+            (self.__last_year is None or year <= self.__last_year)
+
+    def read_manifest(self):
+        """Возвращает заголовки и части директории из манифеста CsvPartitioner, а если его нет - из имён файлов
+           вида 2022.csv или 2022-07.csv"""
+
+        manifest_path = os.path.join(self.__directory_name, CsvPartitioner.manifest_name)
+        if os.path.isfile(manifest_path):
+            with open(manifest_path, 'r', encoding='utf-8') as file:
+                manifest = json.load(file)
+            if manifest['key'] not in ('year', 'year_month'):
+                raise Exception('Части директории разделены не по годам')
+            return manifest['titles'], manifest['partitions']
+        partitions = {}
+        for file_name in os.listdir(self.__directory_name):
+            key, extension = os.path.splitext(file_name)
+            if extension == '.csv' and key[:4].isdigit():
+                partitions[key] = {'file': file_name, 'rows': None}
+        if not partitions:
+            raise Exception('В директории нет частей, разделённых по годам')
+        return self.read_titles(partitions), partitions
+
+    def read_titles(self, partitions: dict):
+        """Возвращает строку заголовков первой части, в которой она есть
+
+        Args:
+            partitions (dict): Словарь частей директории
+        """
+
+        for partition in partitions.values():
+            with open(os.path.join(self.__directory_name, partition['file']), 'r', encoding='utf-8-sig') as file:
+                first_row = next(csv.reader(file, delimiter=','), [])
+            if 'published_at' in first_row:
+                return first_row
+        raise Exception('Ни в одной части нет строки заголовков')
+
+    def iterate_partition(self, file_name: str):
+        """Лениво отдаёт строки файла части, прошедшие проверку, в виде списков значений. Строка заголовков
+           пропускается, если она есть. По окончании файл закрывается
+
+        Args:
+            file_name (str): Путь к файлу части
+        """
+
+        titles_count = len(self.__titles)
+        with open(file_name, 'r', encoding='utf-8-sig') as file:
+            reader = csv.reader(file, delimiter=',')
+            first_row = next(reader, None)
+            if first_row is None:
+                return
+            for row in reader if first_row == self.__titles else chain([first_row], reader):
+                if len(row) == titles_count and "" not in row:
+                    yield row
+
+    def read_partition(self, file_name: str):
+        """Считывает файл части и возвращает строки, прошедшие проверку, в виде списков значений
+
+        Args:
+            file_name (str): Путь к файлу части
+        """
+
+        return list(self.iterate_partition(file_name))
+
+    def iterate_dictionaries(self):
+        """Лениво отдаёт словари вакансий выбранных частей в порядке годов. В потоковом режиме строки файлов
+           считываются по одной, поэтому в памяти хранится одна строка, иначе файлы считываются одновременно в пуле
+           потоков"""
+
+        if self.__is_streaming:
+            rows_by_file = map(self.iterate_partition, self.files)
+        else:
+            with ThreadPoolExecutor(max_workers=self.__threads) as executor:
+                rows_by_file = list(executor.map(self.read_partition, self.files))
+        for rows in rows_by_file:
+            for row in rows:
+                yield dict(zip(self.__titles, row))
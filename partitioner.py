@@ -0,0 +1,177 @@
+import csv
+import hashlib
+import json
+import os
+import re
+from collections import OrderedDict
+from dataset import DataSet
+from parallel_reader import ParallelReader
+
+
+class CsvPartitioner:
+    """Класс для разделения csv-файла на части по произвольному ключу (год, год и месяц, город, валюта). Входной файл
+       не обязан быть отсортирован: открытые файлы частей хранятся в ограниченном пуле, давно не использованный файл
+       закрывается и при следующей строке его части дописывается. По окончании в директорию записывается манифест с
+       количеством строк в каждой части
+
+    Attributes:
+        self.__data (generator): Прошедшие проверку строки изначального csv-файла, считываемые лениво через DataSet
+                                 или, если задано несколько процессов, через ParallelReader
+        self.__titles (list): Заголовки, полученные первой строкой с изначального файла
+        self.__directory_name (str): Директория для хранения частей
+        self.__key (str or function): Название ключа из partition_keys или функция от словаря вакансии
+        self.__key_function (function): Функция, возвращающая ключ части по строке
+        self.__max_open_files (int): Максимальное количество одновременно открытых файлов частей
+        self.__buffer_size (int): Размер буфера записи каждого файла в байтах
+        self.__writers (OrderedDict): Открытые файлы частей и writer для них в порядке последнего использования
+        self.__partitions (dict): Словарь, где ключ - ключ части, а значение - имя её файла и количество строк
+        self.__file_names (set): Занятые имена файлов частей в нижнем регистре для поиска совпадений
+    """
+
+    partition_keys = {'year': ('published_at', 4), 'year_month': ('published_at', 7), 'city': ('area_name', None),
+                      'currency': ('salary_currency', None)}
+    """Статический словарь встроенных ключей: столбец и длина префикса его значения"""
+
+    manifest_name = 'manifest.json'
+    """Статическое поле с именем файла манифеста частей"""
+
+    def __init__(self, file_name: str, directory_name: str, key='year', max_open_files: int = 64,
+                 buffer_size: int = 1 << 20, processes: int = 1):
+        """Инициализирует объект CsvPartitioner и разделяет файл на части
+
+        Args:
+            file_name (str): Имя изначального файла для считывания
+            directory_name (str): Имя директории для хранения частей
+            key (str or function): Название ключа из partition_keys или функция, возвращающая ключ по словарю вакансии
+            max_open_files (int): Максимальное количество одновременно открытых файлов частей
+            buffer_size (int): Размер буфера записи каждого файла в байтах
+            processes (int): Количество процессов для разбора изначального файла
+        """
+
+        reader = ParallelReader(file_name, processes) if processes > 1 else DataSet(file_name, is_streaming=True)
+        self.__data = reader.iterate_rows()
+        self.__titles = reader.titles
+        self.__directory_name = directory_name
+        self.__key = key
+        self.__key_function = self.create_key_function(key)
+        self.__max_open_files = max_open_files
+        self.__buffer_size = buffer_size
+        self.__writers = OrderedDict()
+        self.__partitions = {}
+        self.__file_names = set()
+        os.makedirs(directory_name, exist_ok=True)
+        self.partition()
+
+    @property
+    def titles(self):
+        """Возвращает значение приватного поля со списком заголовков"""
+
+        return self.__titles
+
+    @property
+    def partitions(self):
+        """Возвращает значение приватного поля со словарём частей"""
+
+        return self.__partitions
+
+    def create_key_function(self, key):
+        """Создаёт функцию, возвращающую ключ части по строке-списку значений
+
+        Args:
+            key (str or function): Название ключа из partition_keys или функция от словаря вакансии
+        """
+
+        if callable(key):
+            return lambda row: str(key(dict(zip(self.__titles, row))))
+        column, length = self.partition_keys[key]
+        index = self.__titles.index(column)
+        if length is None:
+            return lambda row: row[index]
+        return lambda row: row[index][:length]
+
+    def partition(self):
+        """Проходится по всем строкам изначального файла, записывая каждую в файл её части. Открытые файлы
+           закрываются и при ошибке, но манифест записывается только после обработки всех строк"""
+
+        last_key, last_writer = None, None
+        try:
+            for row in self.__data:
+                key = self.__key_function(row)
+                if key != last_key or key not in self.__writers:
+                    last_key, last_writer = key, self.get_writer(key)
+                last_writer.writerow(row)
+                self.__partitions[key]['rows'] += 1
+        finally:
+            self.close_writers()
+        self.close()
+
+    def get_writer(self, key: str):
+        """Возвращает writer части, открывая её файл при необходимости. Если открыто слишком много файлов, закрывается
+           файл, который дольше всего не использовался
+
+        Args:
+            key (str): Ключ части
+        """
+
+        if key in self.__writers:
+            self.__writers.move_to_end(key)
+            return self.__writers[key][1]
+        if len(self.__writers) >= self.__max_open_files:
+            self.__writers.popitem(last=False)[1][0].close()
+        is_new_partition = key not in self.__partitions
+        if is_new_partition:
+            self.__partitions[key] = {'file': self.unique_file_name(key), 'rows': 0}
+        file = open(os.path.join(self.__directory_name, self.__partitions[key]['file']), 'w' if is_new_partition
+                    else 'a', newline='', encoding='utf-8-sig', buffering=self.__buffer_size)
+        writer = csv.writer(file, delimiter=',')
+        if is_new_partition:
+            writer.writerow(self.__titles)
+        self.__writers[key] = (file, writer)
+        return writer
+
+    @staticmethod
+    def create_file_name(key: str):
+        """Создаёт имя файла части, заменяя недопустимые в именах файлов символы
+
+        Args:
+            key (str): Ключ части
+
+        >>> CsvPartitioner.create_file_name('2022-07')
+        '2022-07.csv'
+        >>> CsvPartitioner.create_file_name('Комсомольск/Амуре')
+        'Комсомольск_Амуре.csv'
+        """
+
+        return re.sub(r'[\\/:*?"<>|]', '_', key or '_') + '.csv'
+
+    def unique_file_name(self, key: str):
+        """Создаёт имя файла части, не совпадающее с именами других частей даже без учёта регистра. Если ключи
+           различаются только недопустимыми символами (например, 'a/b' и 'a:b'), к имени добавляется короткий хэш
+           ключа, а при совпадении и его - номер
+
+        Args:
+            key (str): Ключ части
+        """
+
+        file_name = self.create_file_name(key)
+        if file_name.casefold() in self.__file_names:
+            stem = f'{file_name[:-len(".csv")]}-{hashlib.blake2b(key.encode(), digest_size=4).hexdigest()}'
+            file_name, number = f'{stem}.csv', 1
+            while file_name.casefold() in self.__file_names:
+                file_name, number = f'{stem}-{number}.csv', number + 1
+        self.__file_names.add(file_name.casefold())
+        return file_name
+
+    def close_writers(self):
+        """Закрывает все открытые файлы частей"""
+
+        while self.__writers:
+            self.__writers.popitem(last=False)[1][0].close()
+
+    def close(self):
+        """Закрывает все открытые файлы частей и записывает манифест"""
+
+        self.close_writers()
+        with open(os.path.join(self.__directory_name, self.manifest_name), 'w', encoding='utf-8') as file:
+            json.dump({'titles': self.__titles, 'key': self.__key if isinstance(self.__key, str) else None,
+                       'partitions': dict(sorted(self.__partitions.items()))}, file, ensure_ascii=False, indent=1)
@@ -0,0 +1,119 @@
+import copy
+from aho_corasick import AhoCorasick
+from exact_sum import add_exact
+from statistic import Statistic
+from vacancy import Vacancy
+from year import Year
+
+
+class ProfessionsStatistic:
+    """Класс для подсчёта статистики сразу по нескольким профессиям за один проход по вакансиям. Названия вакансий
+       проверяются автоматом Ахо-Корасик, поэтому стоимость проверки не растёт линейно с количеством профессий
+
+    Attributes:
+        self.__professions (list): Список выбранных названий вакансий
+        self.__matcher (AhoCorasick): Автомат для поиска названий профессий в названии вакансии
+        self.__matches (dict): Словарь, где ключ - название вакансии, а значение - индексы найденных в нём профессий
+        self.__general_statistic (Statistic): Статистика по всем вакансиям без учёта профессий
+        self.__selected (list): Для каждой профессии словарь, где ключ - год, а значение - список из количества и
+                                частичных сумм средних зарплат вакансий этой профессии
+    """
+
+    max_remembered_names = 100000
+    """Статическое поле с максимальным количеством запоминаемых результатов поиска по названиям вакансий"""
+
+    def __init__(self, professions: list, data):
+        """Инициализирует объект ProfessionsStatistic и заносит в него все вакансии
+
+        Args:
+            professions (list): Список выбранных названий вакансий
+            data (list or generator): Список словарей с вакансиями или генератор потокового DataSet
+
+        >>> statistic = ProfessionsStatistic(['Программист', 'Аналитик'], [{'name': 'Программист', 'salary_from': '80000', 'salary_to': '100000', 'salary_currency': 'RUR', 'area_name': 'Москва', 'published_at': '2022-07-17T18:23:06+0300'}, {'name': 'Аналитик', 'salary_from': '10000', 'salary_to': '20000', 'salary_currency': 'RUR', 'area_name': 'Москва', 'published_at': '2022-07-17T18:23:06+0300'}])
+        >>> statistic.selected_salary_dynamics
+        {'Программист': {2022: 90000}, 'Аналитик': {2022: 15000}}
+        >>> statistic.statistic('Аналитик').selected_num_vacancies_dynamics
+        {2022: 1}
+        """
+
+        self.__professions = list(professions)
+        self.__matcher = AhoCorasick(self.__professions)
+        self.__matches = {}
+        self.__general_statistic = Statistic('', [])
+        self.__selected = [{} for _ in self.__professions]
+        self.enter_static_data(data)
+
+    @property
+    def professions(self):
+        """Возвращает значение приватного поля со списком профессий"""
+
+        return self.__professions
+
+    @property
+    def selected_salary_dynamics(self):
+        """Возвращает словарь, где ключ - профессия, а значение - её динамика зарплат по годам"""
+
+        return {profession: self.statistic(profession).selected_salary_dynamics for profession in self.__professions}
+
+    @property
+    def selected_num_vacancies_dynamics(self):
+        """Возвращает словарь, где ключ - профессия, а значение - её динамика количества вакансий по годам"""
+
+        return {profession: self.statistic(profession).selected_num_vacancies_dynamics
+                for profession in self.__professions}
+
+    def enter_static_data(self, data):
+        """Заносит все вакансии за один проход
+
+        Args:
+            data (list or generator): Список словарей с вакансиями или генератор потокового DataSet
+        """
+
+        for row_dict in data:
+            self.update(row_dict)
+
+    def find_professions(self, name: str):
+        """Возвращает индексы профессий, встречающихся в названии вакансии, запоминая результат для повторных названий
+
+        Args:
+            name (str): Название вакансии
+        """
+
+        found = self.__matches.get(name)
+        if found is None:
+            if len(self.__matches) >= self.max_remembered_names:
+                self.__matches.clear()
+            found = self.__matches[name] = tuple(self.__matcher.find(name))
+        return found
+
+    def update(self, row_dict: dict):
+        """Обновляет статистику данными одной вакансии
+
+        Args:
+            row_dict (dict): Словарь вакансии
+        """
+
+        vacancy = Vacancy(row_dict)
+        self.__general_statistic.update_vacancy(vacancy)
+        for index in self.find_professions(vacancy.name):
+            sums = self.__selected[index].get(vacancy.year)
+            if sums is None:
+                self.__selected[index][vacancy.year] = [1, [vacancy.average_salary]]
+            else:
+                sums[0] += 1
+                add_exact(sums[1], vacancy.average_salary)
+
+    def statistic(self, profession: str):
+        """Возвращает Statistic для одной из профессий, которую можно передать в Report. Скетчи и объекты City
+           копируются, поэтому изменение одной статистики не меняет другие
+
+        Args:
+            profession (str): Название профессии из списка профессий
+        """
+
+        selected = self.__selected[self.__professions.index(profession)]
+        years = {name: Year.from_sums(name, profession, year.vacancy_count, year.salary_partials,
+                                      *selected.get(name, (0, [])), year.salary_sketch)
+                 for name, year in self.__general_statistic.years.items()}
+        return Statistic.from_aggregates(profession, years, copy.deepcopy(self.__general_statistic.cities),
+                                         self.__general_statistic.vacancies_count)
@@ -0,0 +1,76 @@
+import sys
+import time
+import tracemalloc
+from dataset import DataSet
+from statistic import Statistic
+from vacancy import Vacancy
+
+
+def measure_retained_memory(create_objects):
+    """Возвращает количество байт, которое остаётся занятым созданными объектами, в пересчёте на одну строку
+
+    Attributes:
+        create_objects (function): Функция, возвращающая список объектов по одному на строку
+    """
+
+    tracemalloc.start()
+    objects = create_objects()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / len(objects)
+
+
+def measure_time(function, rows_count: int, repeats: int = 7):
+    """Возвращает лучшее из нескольких запусков время выполнения функции в микросекундах на одну строку
+
+    Attributes:
+        function (function): Измеряемая функция
+        rows_count (int): Количество обработанных функцией строк
+        repeats (int): Количество запусков
+    """
+
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / rows_count * 1e6
+
+
+def statistic_from_dictionaries(rows: list, titles: list):
+    """Считает статистику, предварительно объединяя каждую строку с заголовками в словарь, как DataSet
+
+    Attributes:
+        rows (list): Строки в виде списков значений
+        titles (list): Заголовки столбцов
+    """
+
+    return Statistic('Программист', (dict(zip(titles, row)) for row in rows)).salary_dynamics
+
+
+def statistic_from_rows(rows: list, titles: list):
+    """Считает статистику по строкам csv.reader без промежуточных словарей
+
+    Attributes:
+        rows (list): Строки в виде списков значений
+        titles (list): Заголовки столбцов
+    """
+
+    statistic = Statistic('Программист', [])
+    statistic.enter_rows(rows, titles)
+    return statistic.salary_dynamics
+
+
+dataset = DataSet('vacancies_by_year/2010.csv', is_streaming=True)
+titles = dataset.titles
+rows = list(dataset.iterate_rows())
+print(f'Строк: {len(rows)}')
+print(f'Промежуточный словарь строки: {sys.getsizeof(dict(zip(titles, rows[0])))} Б')
+print(f'Vacancy из словаря, занято на строку: '
+      f'{measure_retained_memory(lambda: [Vacancy(dict(zip(titles, row))) for row in rows]):.0f} Б')
+print(f'Vacancy.from_rows, занято на строку: '
+      f'{measure_retained_memory(lambda: list(Vacancy.from_rows(rows, titles))):.0f} Б')
+print(f'Statistic по словарям: '
+      f'{measure_time(lambda: statistic_from_dictionaries(rows, titles), len(rows)):.2f} мкс на строку')
+print(f'Statistic.enter_rows: {measure_time(lambda: statistic_from_rows(rows, titles), len(rows)):.2f} мкс на строку')
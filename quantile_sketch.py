@@ -0,0 +1,213 @@
+class KllSketch:
+    """Класс скетча KLL для приближённого подсчёта квантилей (медианы, перцентилей) потока зарплат в памяти, не
+       зависящей от количества значений. Значения хранятся в уровнях-компакторах, значение уровня h имеет вес 2 ** h.
+       Переполненный уровень сортируется, и каждое второе его значение переходит на следующий уровень. Вместимость
+       уровней убывает в 2/3 раза от верхнего к нижнему, поэтому в скетче хранится около 3 * k значений.
+       Пока значений меньше k, квантили точные. Иначе ошибка ранга квантиля с k = 200
+       обычно не больше 1.65% от количества значений, а медиана и 90-й перцентиль попадают между точными квантилями
+       уровней q - 0.0165 и q + 0.0165. Скетчи частей данных объединяются с той же точностью. Для выбора сдвига
+       при сжатии используется собственный линейный конгруэнтный генератор, поэтому результат воспроизводим
+
+    Attributes:
+        self.__k (int): Вместимость верхнего уровня, определяющая точность
+        self.__count (int): Количество учтённых значений
+        self.__compactors (list): Список уровней, каждый уровень - список значений
+        self.__min (float or NoneType): Наименьшее учтённое значение
+        self.__max (float or NoneType): Наибольшее учтённое значение
+        self.__state (int): Состояние генератора случайных сдвигов
+        self.__size (int): Количество хранимых значений
+        self.__capacities (list): Вместимости уровней, пересчитываемые при добавлении уровня
+        self.__max_size (int): Суммарная вместимость уровней: при её достижении скетч сжимается
+    """
+
+    __slots__ = ('__k', '__count', '__compactors', '__min', '__max', '__state', '__size', '__capacities', '__max_size')
+    """Статический кортеж полей: у объектов нет __dict__"""
+
+    def __init__(self, k: int = 200):
+        """Инициализирует пустой объект KllSketch
+
+        Args:
+            k (int): Вместимость верхнего уровня, определяющая точность
+
+        >>> sketch = KllSketch()
+        >>> for salary in [30000.0, 50000.0, 40000.0, 90000.0]:
+        ...     sketch.update(salary)
+        >>> sketch.quantile(0.5), sketch.quantile(0.9), sketch.count
+        (40000.0, 90000.0, 4)
+        """
+
+        if k < 8:
+            raise Exception('Точность скетча должна быть не меньше 8')
+        self.__k = k
+        self.__count = 0
+        self.__compactors = [[]]
+        self.__min = None
+        self.__max = None
+        self.__state = 0
+        self.__size = 0
+        self.__capacities = [k]
+        self.__max_size = k
+
+    @property
+    def k(self):
+        """Возвращает значение приватного поля с вместимостью верхнего уровня"""
+
+        return self.__k
+
+    @property
+    def count(self):
+        """Возвращает значение приватного поля с количеством учтённых значений"""
+
+        return self.__count
+
+    @property
+    def compactors(self):
+        """Возвращает значение приватного поля со списком уровней"""
+
+        return self.__compactors
+
+    @property
+    def min(self):
+        """Возвращает значение приватного поля с наименьшим учтённым значением"""
+
+        return self.__min
+
+    @property
+    def max(self):
+        """Возвращает значение приватного поля с наибольшим учтённым значением"""
+
+        return self.__max
+
+    @property
+    def size(self):
+        """Возвращает значение приватного поля с количеством хранимых значений"""
+
+        return self.__size
+
+    def copy(self):
+        """Возвращает независимую копию скетча: изменение копии не меняет исходный скетч
+
+        >>> sketch = KllSketch()
+        >>> sketch.update(100.0)
+        >>> copy = sketch.copy()
+        >>> copy.update(300.0)
+        >>> sketch.count, copy.count
+        (1, 2)
+        """
+
+        sketch = KllSketch.__new__(KllSketch)
+        sketch.__k = self.__k
+        sketch.__count = self.__count
+        sketch.__compactors = [list(compactor) for compactor in self.__compactors]
+        sketch.__min = self.__min
+        sketch.__max = self.__max
+        sketch.__state = self.__state
+        sketch.__size = self.__size
+        sketch.__capacities = list(self.__capacities)
+        sketch.__max_size = self.__max_size
+        return sketch
+
+    def add_level(self):
+        """Добавляет пустой верхний уровень и пересчитывает вместимости уровней"""
+
+        self.__compactors.append([])
+        height = len(self.__compactors)
+        self.__capacities = [max(2, int(self.__k * (2 / 3) ** (height - 1 - level))) for level in range(height)]
+        self.__max_size = sum(self.__capacities)
+
+    def update(self, value: float):
+        """Учитывает очередное значение
+
+        Args:
+            value (float): Значение, например средняя зарплата вакансии
+        """
+
+        self.__count += 1
+        if self.__count == 1:
+            self.__min = self.__max = value
+        elif value < self.__min:
+            self.__min = value
+        elif value > self.__max:
+            self.__max = value
+        self.__compactors[0].append(value)
+        self.__size += 1
+        if self.__size >= self.__max_size:
+            self.compress()
+
+    def merge(self, other):
+        """Объединяет скетч со скетчем другой части данных
+
+        Args:
+            other (KllSketch): Скетч другой части данных
+        """
+
+        if other.count == 0:
+            return
+        while len(self.__compactors) < len(other.compactors):
+            self.add_level()
+        for compactor, other_compactor in zip(self.__compactors, other.compactors):
+            compactor.extend(other_compactor)
+        self.__count += other.count
+        self.__min = other.min if self.__min is None else min(self.__min, other.min)
+        self.__max = other.max if self.__max is None else max(self.__max, other.max)
+        self.__size += other.size
+        while self.__size >= self.__max_size:
+            self.compress()
+
+    def compress(self):
+        """Сжимает нижний переполненный уровень: его значения сортируются, и каждое второе со случайным сдвигом
+           переходит на следующий уровень с удвоенным весом. При нечётном количестве одно значение остаётся. Нижние
+           уровни могут временно занимать свободное место верхних, поэтому сжатие нужно только при заполнении
+           всего скетча"""
+
+        for level, compactor in enumerate(self.__compactors):
+            if len(compactor) >= self.__capacities[level]:
+                if level + 1 == len(self.__compactors):
+                    self.add_level()
+                compactor.sort()
+                kept = [compactor.pop()] if len(compactor) % 2 else []
+                self.__state = (self.__state * 6364136223846793005 + 1442695040888963407) & 0xFFFFFFFFFFFFFFFF
+                promoted = compactor[self.__state >> 63::2]
+                self.__compactors[level + 1].extend(promoted)
+                self.__compactors[level] = kept
+                self.__size -= len(compactor) - len(promoted)
+                break
+
+    def quantiles(self, fractions: list):
+        """Возвращает квантили для списка долей: наименьшее значение, ранг которого с учётом весов не меньше доли
+           от количества значений. Для пустого скетча возвращаются нули
+
+        Args:
+            fractions (list): Доли от 0 до 1, например [0.5, 0.9] для медианы и 90-го перцентиля
+        """
+
+        if self.__count == 0:
+            return [0 for _ in fractions]
+        weighted = sorted((value, 1 << level) for level, compactor in enumerate(self.__compactors)
+                          for value in compactor)
+        result = []
+        for fraction in fractions:
+            if fraction <= 0:
+                result.append(self.__min)
+                continue
+            if fraction >= 1:
+                result.append(self.__max)
+                continue
+            target, rank = fraction * self.__count, 0
+            quantile = self.__max
+            for value, weight in weighted:
+                rank += weight
+                if rank >= target:
+                    quantile = value
+                    break
+            result.append(quantile)
+        return result
+
+    def quantile(self, fraction: float):
+        """Возвращает квантиль для доли значений
+
+        Args:
+            fraction (float): Доля от 0 до 1, например 0.5 для медианы
+        """
+
+        return self.quantiles([fraction])[0]
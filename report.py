@@ -13,7 +13,9 @@ class Report:
     """Класс для генерации файлов с отчётами по статистическим данным
 
     Attributes:
-        self.__statistic (Statistic): статистика для генерации отчётов
+        self.__statistic (Statistic or ColumnarStatistic): статистика для генерации отчётов
+        self.__period_title (str): заголовок столбца периодов динамики
+        self.__period_suffix (str): окончание подписей динамики, например 'по месяцам'
         self.__book (Workbook): excel книга, содержащая старницы с отчётами
         self.__year_list (Worksheet): страница со статистикой по годам
         self.__city_list (Worksheet): страница со статистикой по городам
@@ -27,6 +29,9 @@ class Report:
                     top=Side(border_style="thin", color='FF000000'),
                     bottom=Side(border_style="thin", color='FF000000'))
     fig_height, fig_width = 13, 13
+    max_ticks = 24
+    period_titles = {'year': ('Год', 'по годам'), 'quarter': ('Квартал', 'по кварталам'),
+                     'month': ('Месяц', 'по месяцам')}
 
     def __init__(self, statistic: Statistic):
         """Инициализирует объект Report
@@ -39,9 +44,10 @@ class Report:
         """
 
         self.__statistic = statistic
+        self.__period_title, self.__period_suffix = self.period_titles[statistic.period]
         self.__book = Workbook()
         self.__year_list = self.__book.active
-        self.__year_list.title = "Статистика по годам"
+        self.__year_list.title = "Статистика " + self.__period_suffix
         self.__city_list = self.__book.create_sheet("Статистика по городам")
         self.fig, self.axs = plt.subplots(nrows=2, ncols=2)
         self.fig.set_figheight(self.fig_height)
@@ -49,19 +55,27 @@ class Report:
         plt.rc('axes', titlesize=20)
 
     def generate_excel(self):
-        """Генерирует и сохраняет в корневую директорию excel-файл со статистикой"""
+        """Генерирует и сохраняет в корневую директорию excel-файл со статистикой. Кроме средних зарплат в файл
+           выводятся медиана и 90-й перцентиль зарплат"""
 
-        self.print_columns(['Год', 'Средняя зарплата', 'Средняя зарплата - ' + self.__statistic.selected_vacancy,
-                            'Количество вакансий', 'Количество вакансий - ' + self.__statistic.selected_vacancy],
+        self.print_columns([self.__period_title, 'Средняя зарплата',
+                            'Средняя зарплата - ' + self.__statistic.selected_vacancy, 'Количество вакансий',
+                            'Количество вакансий - ' + self.__statistic.selected_vacancy, 'Медиана зарплат',
+                            '90-й перцентиль зарплат'],
                            (list(self.__statistic.salary_dynamics.keys()), 'right', False),
                            (list(self.__statistic.salary_dynamics.values()), 'right', False),
                            (list(self.__statistic.selected_salary_dynamics.values()), 'right', False),
                            (list(self.__statistic.num_vacancies_dynamics.values()), 'right', False),
-                           (list(self.__statistic.selected_num_vacancies_dynamics.values()), 'right', False))
+                           (list(self.__statistic.selected_num_vacancies_dynamics.values()), 'right', False),
+                           (list(self.__statistic.salary_median_dynamics.values()), 'right', False),
+                           (list(self.__statistic.salary_p90_dynamics.values()), 'right', False))
         self.__book.active = self.__city_list
-        self.print_columns(['Город', 'Уровень зарплат', '', 'Город', 'Доля вакансий'],
+        self.print_columns(['Город', 'Уровень зарплат', 'Медиана зарплат', '90-й перцентиль зарплат', '', 'Город',
+                            'Доля вакансий'],
                            (list(self.__statistic.city_salary_dynamics.keys()), 'left', False),
                            (list(self.__statistic.city_salary_dynamics.values()), 'right', False),
+                           (list(self.__statistic.city_salary_median_dynamics.values()), 'right', False),
+                           (list(self.__statistic.city_salary_p90_dynamics.values()), 'right', False),
                            (list(), 'right', False),
                            (list(self.__statistic.city_num_vacancies_dynamics.keys()), 'left', False),
                            (list(self.__statistic.city_num_vacancies_dynamics.values()), 'right', True))
@@ -122,11 +136,12 @@ class Report:
         self.create_two_labels_graph(0, 0, self.__statistic.salary_dynamics.values(),
                                      self.__statistic.selected_salary_dynamics.values(), 'средняя з/п',
                                      'з/п ' + self.__statistic.selected_vacancy,
-                                     self.__statistic.salary_dynamics.keys(), 'Уровень зарплат по годам')
+                                     self.__statistic.salary_dynamics.keys(), 'Уровень зарплат ' + self.__period_suffix)
         self.create_two_labels_graph(0, 1, self.__statistic.num_vacancies_dynamics.values(),
                                      self.__statistic.selected_num_vacancies_dynamics.values(), 'Количество вакансий',
                                      'Количество вакансий ' + '\n' + self.__statistic.selected_vacancy,
-                                     self.__statistic.num_vacancies_dynamics.keys(), 'Количество вакансий по годам')
+                                     self.__statistic.num_vacancies_dynamics.keys(),
+                                     'Количество вакансий ' + self.__period_suffix)
         self.create_horizontal_graph(1, 0, list(self.__statistic.city_salary_dynamics.values()),
                                      list(self.__statistic.city_salary_dynamics.keys()), 'Уровень зарплат по городам')
         other_num_vacancies = 1 - sum(self.__statistic.city_num_vacancies_dynamics.values())
@@ -137,7 +152,8 @@ class Report:
 
     def create_two_labels_graph(self, x: int, y: int, first_labels, second_labels, first_labels_name: str,
                                 second_labels_name: str, ticks, title: str):
-        """Добавляет в изображение граффик с двумя столбцами
+        """Добавляет в изображение граффик с двумя столбцами. Если периодов больше max_ticks, подписывается только
+           каждый n-й из них, чтобы месячные ряды оставались читаемыми
         Args:
             x (int): Расположение в матрице граффиков по шкале x
             y (int): Расположение в матрице граффиков по шкале y
@@ -154,7 +170,8 @@ class Report:
         self.axs[x, y].bar(slots - width / 2, first_labels, width, label=first_labels_name)
         self.axs[x, y].bar(slots + width / 2, second_labels, width, label=second_labels_name)
         self.axs[x, y].set_title(title)
-        self.axs[x, y].set_xticks(slots, ticks, rotation=90)
+        step = max(1, -(-len(slots) // self.max_ticks))
+        self.axs[x, y].set_xticks(slots[::step], list(ticks)[::step], rotation=90)
         self.axs[x, y].yaxis.grid(visible=True, which='major', color='grey', alpha=.25)
         self.axs[x, y].legend()
 
@@ -203,6 +220,8 @@ class Report:
 
         pdf_template = template.render({'selected_vacancy': self.__statistic.selected_vacancy,
                                         'year_statistics_trs': years_statistics_trs,
+                                        'period_title': self.__period_title,
+                                        'period_suffix': self.__period_suffix,
                                         'city_salary_statistics_trs': cities_salary_statistics_trs,
                                         'city_vacancy_statistics_trs': cities_vacancy_num_statistics_trs,
                                         'image_path': image_path})
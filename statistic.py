@@ -1,7 +1,11 @@
 import math
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from vacancy import Vacancy
 from year import Year
 from city import City
+from heavy_hitters import SpaceSaving
 
 
 def check_statistics_preparedness(method):
@@ -15,6 +19,19 @@ def check_statistics_preparedness(method):
     return wrapper
 
 
+def aggregate_chunk(selected_vacancy: str, chunk: list, currency_rates=None, cities_capacity: int = None):
+    """Считает частичную статистику по части вакансий. Выполняется в дочернем процессе
+
+    Args:
+        selected_vacancy (str): Выбранное название вакансии для дополнительной статистики
+        chunk (list): Список словарей с вакансиями
+        currency_rates (CurrencyRates or NoneType): Таблица курсов валют по месяцам
+        cities_capacity (int or NoneType): Размер сводки SpaceSaving городов
+    """
+
+    return Statistic(selected_vacancy, chunk, currency_rates=currency_rates, cities_capacity=cities_capacity)
+
+
 class Statistic:
     """Класс для представления статистики по вакансиям
 
@@ -22,6 +39,8 @@ class Statistic:
         self.__selected_vacancy (str): Выбранное название вакансии для дополнительной статистики
         self.__vacancies_count (int): Количество вакансий
         self.__cities (dict): Словарь, где ключ - название города, а значение - соответсвующий ему объект City
+        self.__city_summary (SpaceSaving or NoneType): Сводка городов фиксированного размера, используемая вместо
+                                                       словаря cities, если задан cities_capacity
         self.__years (dict): Словарь, где ключ - год, а значение - соответсвующий ему объект Year
 
         self.__salary_dynamics (dict): Словарь, где ключ - год, а значение - средняя зарплата по всем вакансиям
@@ -35,16 +54,43 @@ class Statistic:
                                             в этом городе
         self.__city_num_vacancies_dynamics (dict): Словарь, где ключ - название города, а значение - количество
                                                    вакансий в этом городе
-
+        self.__city_count_bounds (dict): Словарь, где ключ - название города из статистики по городам, а значение -
+                                         нижняя и верхняя границы количества его вакансий
+        self.__salary_median_dynamics (dict): Словарь, где ключ - год, а значение - медиана зарплат в этот год
+        self.__salary_p90_dynamics (dict): Словарь, где ключ - год, а значение - 90-й перцентиль зарплат в этот год
+        self.__city_salary_median_dynamics (dict): Словарь, где ключ - название города из статистики зарплат по
+                                                   городам, а значение - медиана зарплат в этом городе
+        self.__city_salary_p90_dynamics (dict): Словарь, где ключ - название города из статистики зарплат по
+                                                городам, а значение - 90-й перцентиль зарплат в этом городе
+
+        self.__currency_rates (CurrencyRates or NoneType): Таблица курсов валют по месяцам. Если не задана,
+                                                           используется статический курс Vacancy.currency_to_rub
         self.__fulfillment (bool): Была ли посчитана статистика
     """
 
-    def __init__(self, selected_vacancy: str, data: list):
+    period = 'year'
+    """Статическое поле с периодом динамики: Statistic считает динамику только по годам"""
+
+    quantile_fractions = (0.5, 0.9)
+    """Статический кортеж долей для медианы и 90-го перцентиля. Квантили берутся из скетчей KllSketch объектов
+       Year и City и отличаются от точных не больше чем на 1.65% по рангу"""
+
+    def __init__(self, selected_vacancy: str, data: list, processes: int = 1, chunk_size: int = 50000,
+                 currency_rates=None, cities_capacity: int = None):
         """Инициализирует объект Statistic
 
         Args:
             selected_vacancy (str): Выбранное название вакансии для дополнительной статистики
-            data (list): Список словарей с вакансиями
+            data (list or generator): Список словарей с вакансиями или генератор потокового DataSet
+            processes (int): Количество процессов для подсчёта частичной статистики. При значении больше 1 данные
+                             делятся на части по chunk_size вакансий и обрабатываются в ProcessPoolExecutor
+            chunk_size (int): Количество вакансий в одной части
+            currency_rates (CurrencyRates or NoneType): Таблица курсов валют по месяцам публикации
+            cities_capacity (int or NoneType): Если задан, города учитываются в сводке SpaceSaving из стольких
+                                               счётчиков, и память не растёт с количеством разных городов. Города,
+                                               в которых больше 1% вакансий, не теряются при cities_capacity >= 100,
+                                               а количество вакансий города завышается не больше чем на
+                                               vacancies_count / cities_capacity
 
         >>> type(Statistic('Программист', [{'name': 'Программист', 'description': 'Уровень ЗП обсуждается индивидуально', 'key_skills': 'Организаторские навыки', 'experience_id': 'between3And6', 'premium': 'FALSE', 'employer_name': 'ПМЦ Авангард', 'salary_from': '80000', 'salary_to': '100000', 'salary_gross': 'FALSE', 'salary_currency': 'RUR', 'area_name': 'Санкт-Петербург', 'published_at': '2022-07-17T18:23:06+0300'}])).__name__
         'Statistic'
@@ -69,6 +115,7 @@ class Statistic:
         self.__selected_vacancy = selected_vacancy
         self.__vacancies_count = 0
         self.__cities = {}
+        self.__city_summary = SpaceSaving(cities_capacity) if cities_capacity is not None else None
         self.__years = {}
 
         self.__salary_dynamics = {}
@@ -77,9 +124,35 @@ class Statistic:
         self.__selected_num_vacancies_dynamics = {}
         self.__city_salary_dynamics = {}
         self.__city_num_vacancies_dynamics = {}
+        self.__city_count_bounds = {}
+        self.__salary_median_dynamics = {}
+        self.__salary_p90_dynamics = {}
+        self.__city_salary_median_dynamics = {}
+        self.__city_salary_p90_dynamics = {}
 
+        self.__currency_rates = currency_rates
         self.__fulfillment = False
-        self.enter_static_data(data)
+        if processes > 1:
+            self.enter_parallel_data(data, processes, chunk_size)
+        else:
+            self.enter_static_data(data)
+
+    @classmethod
+    def from_aggregates(cls, selected_vacancy: str, years: dict, cities: dict, vacancies_count: int):
+        """Создаёт объект Statistic по уже посчитанным объектам Year и City, не перебирая вакансии
+
+        Args:
+            selected_vacancy (str): Выбранное название вакансии для дополнительной статистики
+            years (dict): Словарь, где ключ - год, а значение - соответсвующий ему объект Year
+            cities (dict): Словарь, где ключ - название города, а значение - соответсвующий ему объект City
+            vacancies_count (int): Количество вакансий
+        """
+
+        statistic = cls(selected_vacancy, [])
+        statistic.__years = years
+        statistic.__cities = cities
+        statistic.__vacancies_count = vacancies_count
+        return statistic
 
     @property
     @check_statistics_preparedness
@@ -123,6 +196,41 @@ class Statistic:
 
         return self.__city_num_vacancies_dynamics
 
+    @property
+    @check_statistics_preparedness
+    def city_count_bounds(self):
+        """Возвращает значение приватного поля с границами количества вакансий городов из статистики по городам"""
+
+        return self.__city_count_bounds
+
+    @property
+    @check_statistics_preparedness
+    def salary_median_dynamics(self):
+        """Возвращает значение приватного поля с динамикой медианы зарплат"""
+
+        return self.__salary_median_dynamics
+
+    @property
+    @check_statistics_preparedness
+    def salary_p90_dynamics(self):
+        """Возвращает значение приватного поля с динамикой 90-го перцентиля зарплат"""
+
+        return self.__salary_p90_dynamics
+
+    @property
+    @check_statistics_preparedness
+    def city_salary_median_dynamics(self):
+        """Возвращает значение приватного поля с медианой зарплат по городам"""
+
+        return self.__city_salary_median_dynamics
+
+    @property
+    @check_statistics_preparedness
+    def city_salary_p90_dynamics(self):
+        """Возвращает значение приватного поля с 90-м перцентилем зарплат по городам"""
+
+        return self.__city_salary_p90_dynamics
+
     @property
     def years(self):
         """Возвращает значение приватного поля со словарём  (номер года: Year)"""
@@ -135,12 +243,24 @@ class Statistic:
 
         return self.__cities
 
+    @property
+    def city_summary(self):
+        """Возвращает значение приватного поля со сводкой городов фиксированного размера"""
+
+        return self.__city_summary
+
     @property
     def selected_vacancy(self):
         """Возвращает значение приватного поля с выбранным названием вакансии"""
 
         return self.__selected_vacancy
 
+    @property
+    def vacancies_count(self):
+        """Возвращает значение приватного поля с количеством вакансий"""
+
+        return self.__vacancies_count
+
     @property
     def fulfillment(self):
         """Возвращает значение приватного поля со значением того, была ли посчитана статистика"""
@@ -148,15 +268,79 @@ class Statistic:
         return self.__fulfillment
 
     def enter_static_data(self, data):
-        """Заносит в Statistic все вакансии из списка
+        """Заносит в Statistic все вакансии из списка. Данные перебираются однократно, поэтому генератор потокового
+           DataSet обрабатывается без загрузки всего файла в память
 
         Args:
-            data (list): Список словарей с вакансиями
+            data (list or generator): Список словарей с вакансиями или генератор потокового DataSet
         """
 
         for row_dict in data:
             self.update(row_dict)
 
+    def enter_rows(self, rows, titles: list):
+        """Заносит в Statistic строки csv.reader, создавая вакансии по индексам столбцов без словарей
+
+        Args:
+            rows (list or generator): Прошедшие проверку строки в виде списков значений, например iterate_rows DataSet
+            titles (list): Заголовки столбцов
+        """
+
+        for vacancy in Vacancy.from_rows(rows, titles, self.__currency_rates):
+            self.update_vacancy(vacancy)
+
+    def enter_parallel_data(self, data, processes: int, chunk_size: int):
+        """Делит вакансии на части, считает по ним частичную статистику в пуле процессов и объединяет её в порядке
+           частей. Одновременно в обработке находится не больше 2 * processes частей, поэтому генератор потокового
+           DataSet не считывается в память целиком
+
+        Args:
+            data (list or generator): Список словарей с вакансиями или генератор потокового DataSet
+            processes (int): Количество процессов
+            chunk_size (int): Количество вакансий в одной части
+        """
+
+        data = iter(data)
+        cities_capacity = self.__city_summary.capacity if self.__city_summary is not None else None
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            futures = deque()
+            while True:
+                chunk = list(islice(data, chunk_size))
+                if chunk:
+                    futures.append(executor.submit(aggregate_chunk, self.__selected_vacancy, chunk,
+                                                   self.__currency_rates, cities_capacity))
+                while futures and (len(futures) >= 2 * processes or not chunk):
+                    self.merge(futures.popleft().result())
+                if not chunk:
+                    break
+
+    def merge(self, other):
+        """Добавляет в Statistic частичную статистику, посчитанную по другой части данных. Объекты Year и City
+           другой статистики, которых ещё нет в этой, переходят в неё без копирования
+
+        Args:
+            other (Statistic): Статистика с тем же выбранным названием вакансии
+        """
+
+        if other.selected_vacancy != self.__selected_vacancy:
+            raise Exception('Нельзя объединить статистику разных вакансий')
+        for name, year in other.years.items():
+            if name in self.__years:
+                self.__years[name].merge(year)
+            else:
+                self.__years[name] = year
+        if (self.__city_summary is None) != (other.city_summary is None):
+            raise Exception('Нельзя объединить статистику с точным и приближённым подсчётом городов')
+        if self.__city_summary is not None:
+            self.__city_summary.merge(other.city_summary)
+        for name, city in other.cities.items():
+            if name in self.__cities:
+                self.__cities[name].merge(city)
+            else:
+                self.__cities[name] = city
+        self.__vacancies_count += other.vacancies_count
+        self.__fulfillment = False
+
     def update(self, row_dict: dict):
         """Обновляет поля Statistic данными одной вакансии
 
@@ -164,35 +348,78 @@ class Statistic:
             row_dict (dict): Словарь вакансии
         """
 
-        vacancy = Vacancy(row_dict)
-        if vacancy.area_name not in self.__cities.keys():
-            self.__cities[vacancy.area_name] = City(vacancy)
+        self.update_vacancy(Vacancy(row_dict, self.__currency_rates))
+
+    def update_vacancy(self, vacancy: Vacancy):
+        """Обновляет поля Statistic уже созданным объектом Vacancy
+
+        Args:
+            vacancy (Vacancy): Вакансия
+        """
+
+        average_salary = vacancy.average_salary
+        if self.__city_summary is not None:
+            self.__city_summary.update(vacancy.area_name, average_salary)
         else:
-            self.__cities[vacancy.area_name].update(vacancy)
-        if vacancy.year not in self.__years.keys():
+            city = self.__cities.get(vacancy.area_name)
+            if city is None:
+                self.__cities[vacancy.area_name] = City(vacancy)
+            else:
+                city.add(average_salary)
+        year = self.__years.get(vacancy.year)
+        if year is None:
             self.__years[vacancy.year] = Year(vacancy, self.__selected_vacancy)
         else:
-            self.__years[vacancy.year].update(vacancy)
+            year.add(vacancy.name, average_salary)
         self.__vacancies_count += 1
+        self.__fulfillment = False
 
     def calculate_statistics(self):
-        """Считает статистику, сортирует словари статистики по убыванию"""
+        """Считает статистику, сортирует словари статистики по убыванию. Накопленные объекты Year и City не
+           изменяются, поэтому после подсчёта в статистику можно добавлять новые данные"""
 
         for year in self.__years.values():
             self.__salary_dynamics[year.name] = math.floor(year.average_salary)
             self.__num_vacancies_dynamics[year.name] = year.vacancy_count
             self.__selected_salary_dynamics[year.name] = math.floor(year.selected_vacancy_average_salary)
             self.__selected_num_vacancies_dynamics[year.name] = year.selected_vacancy_count
-        self.__cities = dict(filter(lambda x: x[1].vacancy_count >= (self.__vacancies_count / 100),
-                                    self.__cities.items()))
-        self.__city_salary_dynamics = dict(sorted(self.__cities.items(),
+            median, p90 = year.salary_sketch.quantiles(self.quantile_fractions)
+            self.__salary_median_dynamics[year.name] = math.floor(median)
+            self.__salary_p90_dynamics[year.name] = math.floor(p90)
+        if self.__city_summary is not None:
+            self.calculate_summary_statistics()
+            return
+        cities = dict(filter(lambda x: x[1].vacancy_count >= (self.__vacancies_count / 100), self.__cities.items()))
+        self.__city_salary_dynamics = dict(sorted(cities.items(),
                                                   key=lambda x: x[1].average_salary, reverse=True)[:10])
         self.__city_salary_dynamics = {key: math.floor(val.average_salary)
                                        for key, val in self.__city_salary_dynamics.items()}
-        self.__city_num_vacancies_dynamics = dict(sorted(self.__cities.items(),
+        self.__city_num_vacancies_dynamics = dict(sorted(cities.items(),
                                                          key=lambda x: x[1].vacancy_count, reverse=True)[:10])
         self.__city_num_vacancies_dynamics = {key: round(val.vacancy_count / self.__vacancies_count, 4)
                                               for key, val in self.__city_num_vacancies_dynamics.items()}
+        for name in self.__city_salary_dynamics:
+            median, p90 = cities[name].salary_sketch.quantiles(self.quantile_fractions)
+            self.__city_salary_median_dynamics[name] = math.floor(median)
+            self.__city_salary_p90_dynamics[name] = math.floor(p90)
+        self.__city_count_bounds = {name: (cities[name].vacancy_count, cities[name].vacancy_count)
+                                    for name in {**self.__city_salary_dynamics, **self.__city_num_vacancies_dynamics}}
+        self.__fulfillment = True
+
+    def calculate_summary_statistics(self):
+        """Считает статистику по городам из сводки SpaceSaving. Пока в сводке не было вытеснений, результат совпадает
+           с точным подсчётом, иначе количества вакансий - оценки сверху с границами в city_count_bounds, а средние
+           зарплаты посчитаны по вакансиям, пришедшим, пока город был в сводке, и только для городов, в которых
+           гарантированно не меньше 1% вакансий. Квантили зарплат по городам в этом режиме не считаются"""
+
+        summary = self.__city_summary
+        min_count = self.__vacancies_count / 100
+        self.__city_salary_dynamics = {name: math.floor(summary.average_salary(name))
+                                       for name in summary.top(10, by_salary=True, min_count=min_count)}
+        self.__city_num_vacancies_dynamics = {name: round(summary.count(name) / self.__vacancies_count, 4)
+                                              for name in summary.top(10, min_count=min_count)}
+        self.__city_count_bounds = {name: summary.bounds(name)
+                                    for name in {**self.__city_salary_dynamics, **self.__city_num_vacancies_dynamics}}
         self.__fulfillment = True
 
     def print_statistics(self):
@@ -205,3 +432,5 @@ class Statistic:
         print("Динамика количества вакансий по годам для выбранной профессии:", self.__selected_num_vacancies_dynamics)
         print("Уровень зарплат по городам (в порядке убывания):", self.__city_salary_dynamics)
         print("Доля вакансий по городам (в порядке убывания):", self.__city_num_vacancies_dynamics)
+        if self.__city_summary is not None:
+            print("Границы количества вакансий по городам:", self.__city_count_bounds)
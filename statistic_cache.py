@@ -0,0 +1,253 @@
+import copy
+import hashlib
+import json
+import os
+import pickle
+import time
+from dataset import DataSet
+from name_index import NameIndex
+from statistic import Statistic
+from vacancy import Vacancy
+from year import Year
+
+
+def file_content_hash(file_name: str, block_size: int = 1 << 20):
+    """Возвращает хэш содержимого файла, считывая его блоками
+
+    Args:
+        file_name (str): Имя файла
+        block_size (int): Размер блока в байтах
+    """
+
+    content_hash = hashlib.blake2b(digest_size=16)
+    with open(file_name, 'rb') as file:
+        for block in iter(lambda: file.read(block_size), b''):
+            content_hash.update(block)
+    return content_hash.hexdigest()
+
+
+class StatisticCache:
+    """Класс для хранения посчитанной статистики на диске. Запись ищется по отпечатку файла (размер, время изменения
+       и хэш содержимого) и выбранной профессии. Независимая от профессии часть (динамика по годам, объекты City и
+       NameIndex с суммами по парам (название вакансии, год)) хранится отдельно, поэтому статистика для другой
+       профессии по тому же файлу собирается без повторного считывания файла. Размер кэша ограничен, при переполнении
+       удаляются записи, к которым дольше всего не обращались
+
+    Attributes:
+        self.__directory_name (str): Директория для хранения записей кэша
+        self.__max_size (int): Максимальный суммарный размер записей в байтах
+        self.__index (dict): Индекс кэша: время последнего обращения и исходный файл каждой записи, а также
+                             запомненные хэши файлов по их размеру и времени изменения
+    """
+
+    index_name = 'index.json'
+    """Статическое поле с именем файла индекса кэша"""
+
+    entry_format = 4
+    """Статическое поле с версией формата записей: записи прошлых версий не читаются"""
+
+    def __init__(self, directory_name: str, max_size: int = 256 * 1024 * 1024):
+        """Инициализирует объект StatisticCache, создавая директорию кэша при необходимости
+
+        Args:
+            directory_name (str): Директория для хранения записей кэша
+            max_size (int): Максимальный суммарный размер записей в байтах
+        """
+
+        self.__directory_name = directory_name
+        self.__max_size = max_size
+        os.makedirs(directory_name, exist_ok=True)
+        self.__index = {'entries': {}, 'hashes': {}}
+        index_path = os.path.join(directory_name, self.index_name)
+        if os.path.isfile(index_path):
+            with open(index_path, 'r', encoding='utf-8') as file:
+                self.__index = json.load(file)
+
+    @property
+    def entries(self):
+        """Возвращает список имён записей кэша от давно использованных к недавно использованным"""
+
+        return sorted(self.__index['entries'], key=lambda entry: self.__index['entries'][entry]['access'])
+
+    def fingerprint(self, file_name: str):
+        """Возвращает отпечаток файла из размера, времени изменения и хэша содержимого. Хэш пересчитывается, только
+           если размер или время изменения файла отличаются от запомненных
+
+        Args:
+            file_name (str): Имя файла
+        """
+
+        path = os.path.abspath(file_name)
+        stat = os.stat(path)
+        remembered = self.__index['hashes'].get(path)
+        if remembered is None or remembered[:2] != [stat.st_size, stat.st_mtime_ns]:
+            remembered = [stat.st_size, stat.st_mtime_ns, file_content_hash(path)]
+            self.__index['hashes'][path] = remembered
+            self.save_index()
+        return f'{remembered[0]}-{remembered[1]}-{remembered[2]}'
+
+    def get_statistic(self, file_name: str, selected_vacancy: str):
+        """Возвращает статистику по файлу для выбранной профессии, по возможности не считывая файл
+
+        Args:
+            file_name (str): Имя csv-файла с вакансиями
+            selected_vacancy (str): Выбранное название вакансии для дополнительной статистики
+        """
+
+        fingerprint = self.fingerprint(file_name)
+        general_entry = f'{fingerprint}-general-{self.entry_format}.pickle'
+        profession_hash = hashlib.blake2b(selected_vacancy.encode(), digest_size=8).hexdigest()
+        selected_entry = f'{fingerprint}-{profession_hash}-{self.entry_format}.pickle'
+        general = self.read_entry(general_entry)
+        if general is None:
+            general, selected = self.scan(file_name, selected_vacancy)
+            self.write_entry(general_entry, general, file_name)
+            self.write_entry(selected_entry, selected, file_name)
+        else:
+            selected = self.read_entry(selected_entry)
+            if selected is None:
+                selected = general['index'].selected_sums(selected_vacancy)
+                self.write_entry(selected_entry, selected, file_name)
+        return self.build_statistic(general, selected, selected_vacancy)
+
+    def scan(self, file_name: str, selected_vacancy: str):
+        """Считывает файл и возвращает независимую от профессии часть статистики и суммы для выбранной профессии
+
+        Args:
+            file_name (str): Имя csv-файла с вакансиями
+            selected_vacancy (str): Выбранное название вакансии для дополнительной статистики
+        """
+
+        statistic = Statistic(selected_vacancy, [])
+        dataset = DataSet(file_name, is_streaming=True)
+        vacancies = Vacancy.from_rows(dataset.iterate_rows(), dataset.titles)
+        index = NameIndex.from_vacancies(self.counted(statistic, vacancies))
+        general = {'years': {name: (year.vacancy_count, list(year.salary_partials), year.salary_sketch)
+                             for name, year in statistic.years.items()},
+                   'cities': statistic.cities, 'vacancies_count': statistic.vacancies_count,
+                   'index': index}
+        selected = {name: (year.selected_vacancy_count, list(year.selected_salary_partials))
+                    for name, year in statistic.years.items()}
+        return general, selected
+
+    @staticmethod
+    def counted(statistic: Statistic, vacancies):
+        """Возвращает генератор тех же вакансий, по пути добавляющий каждую в статистику
+
+        Args:
+            statistic (Statistic): Статистика, в которую добавляются вакансии
+            vacancies (iterable): Объекты Vacancy
+        """
+
+        for vacancy in vacancies:
+            statistic.update_vacancy(vacancy)
+            yield vacancy
+
+    @staticmethod
+    def build_statistic(general: dict, selected: dict, selected_vacancy: str):
+        """Собирает Statistic из независимой от профессии части и сумм для выбранной профессии. Скетчи и объекты City
+           копируются, поэтому изменение статистики не меняет запись кэша
+
+        Args:
+            general (dict): Независимая от профессии часть статистики
+            selected (dict): Словарь, где ключ - год, а значение - количество и частичные суммы зарплат выбранных
+                             вакансий
+            selected_vacancy (str): Выбранное название вакансии
+        """
+
+        years = {name: Year.from_sums(name, selected_vacancy, count, partials, *selected.get(name, (0, [])), sketch)
+                 for name, (count, partials, sketch) in general['years'].items()}
+        return Statistic.from_aggregates(selected_vacancy, years, copy.deepcopy(general['cities']),
+                                         general['vacancies_count'])
+
+    def read_entry(self, entry: str):
+        """Считывает запись кэша и отмечает обращение к ней. Возвращает None, если записи нет. Запись, которую не
+           удаётся считать (например, сохранённая прошлой версией классов), удаляется
+
+        Args:
+            entry (str): Имя записи
+        """
+
+        path = os.path.join(self.__directory_name, entry)
+        if entry not in self.__index['entries'] or not os.path.isfile(path):
+            return None
+        try:
+            with open(path, 'rb') as file:
+                value = pickle.load(file)
+        except (pickle.UnpicklingError, AttributeError, EOFError):
+            self.remove_entry(entry)
+            self.save_index()
+            return None
+        self.__index['entries'][entry]['access'] = time.time()
+        self.save_index()
+        return value
+
+    def write_entry(self, entry: str, value, file_name: str):
+        """Атомарно сохраняет запись кэша и удаляет давно использованные записи при превышении размера кэша
+
+        Args:
+            entry (str): Имя записи
+            value: Сохраняемые данные
+            file_name (str): Имя исходного csv-файла
+        """
+
+        path = os.path.join(self.__directory_name, entry)
+        with open(path + '.tmp', 'wb') as file:
+            pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + '.tmp', path)
+        self.__index['entries'][entry] = {'access': time.time(), 'source': os.path.abspath(file_name),
+                                          'size': os.path.getsize(path)}
+        self.evict()
+        self.save_index()
+
+    def evict(self):
+        """Удаляет записи, к которым дольше всего не обращались, пока суммарный размер кэша больше допустимого"""
+
+        entries = self.entries
+        total_size = sum(self.__index['entries'][entry]['size'] for entry in entries)
+        for entry in entries:
+            if total_size <= self.__max_size:
+                break
+            total_size -= self.__index['entries'][entry]['size']
+            self.remove_entry(entry)
+
+    def remove_entry(self, entry: str):
+        """Удаляет запись кэша
+
+        Args:
+            entry (str): Имя записи
+        """
+
+        del self.__index['entries'][entry]
+        path = os.path.join(self.__directory_name, entry)
+        if os.path.isfile(path):
+            os.remove(path)
+
+    def invalidate(self, file_name: str):
+        """Удаляет все записи кэша, посчитанные по указанному файлу
+
+        Args:
+            file_name (str): Имя csv-файла с вакансиями
+        """
+
+        path = os.path.abspath(file_name)
+        for entry in [entry for entry, info in self.__index['entries'].items() if info['source'] == path]:
+            self.remove_entry(entry)
+        self.__index['hashes'].pop(path, None)
+        self.save_index()
+
+    def clear(self):
+        """Удаляет все записи кэша"""
+
+        for entry in list(self.__index['entries']):
+            self.remove_entry(entry)
+        self.__index['hashes'] = {}
+        self.save_index()
+
+    def save_index(self):
+        """Атомарно сохраняет индекс кэша"""
+
+        path = os.path.join(self.__directory_name, self.index_name)
+        with open(path + '.tmp', 'w', encoding='utf-8') as file:
+            json.dump(self.__index, file, ensure_ascii=False)
+        os.replace(path + '.tmp', path)
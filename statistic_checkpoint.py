@@ -0,0 +1,124 @@
+import hashlib
+import os
+import pickle
+from dataset import DataSet
+from statistic import Statistic
+
+
+def file_head_hash(file_name: str, head_size: int = 65536):
+    """Возвращает хэш начала файла, по которому определяется, что файл был заменён, а не дополнен
+
+    Args:
+        file_name (str): Имя файла
+        head_size (int): Количество байт начала файла для хэширования
+    """
+
+    with open(file_name, 'rb') as file:
+        return hashlib.blake2b(file.read(head_size)).hexdigest()
+
+
+class StatisticCheckpoint:
+    """Класс для инкрементального подсчёта статистики по csv-файлу, который только дополняется новыми строками.
+       В файле контрольной точки сохраняются позиция в байтах, до которой файл уже обработан, и частичная статистика
+       (суммы и количества Year и City). Следующий запуск считывает только дописанный хвост файла
+
+    Attributes:
+        self.__file_name (str): Имя дополняемого csv-файла
+        self.__checkpoint_name (str): Имя файла контрольной точки
+        self.__selected_vacancy (str): Выбранное название вакансии для дополнительной статистики
+        self.__offset (int): Позиция в байтах, до которой файл уже обработан
+        self.__head_hash (str or NoneType): Хэш обработанного начала файла (не больше head_size байт)
+        self.__statistic (Statistic): Накопленная статистика
+    """
+
+    head_size = 65536
+    """Статическое поле с количеством байт начала файла, по которым проверяется, что файл не был заменён"""
+
+    checkpoint_format = 3
+    """Статическое поле с версией формата контрольной точки: точки прошлых версий (в том числе без версии, с
+       объектами Year и City без скетчей зарплат) отбрасываются, и файл обрабатывается с начала"""
+
+    def __init__(self, file_name: str, checkpoint_name: str, selected_vacancy: str):
+        """Инициализирует объект StatisticCheckpoint, загружая контрольную точку, если она сохранена для того же
+           файла и той же вакансии
+
+        Args:
+            file_name (str): Имя дополняемого csv-файла
+            checkpoint_name (str): Имя файла контрольной точки
+            selected_vacancy (str): Выбранное название вакансии для дополнительной статистики
+        """
+
+        self.__file_name = file_name
+        self.__checkpoint_name = checkpoint_name
+        self.__selected_vacancy = selected_vacancy
+        self.reset()
+        self.load()
+
+    @property
+    def offset(self):
+        """Возвращает значение приватного поля с позицией, до которой файл уже обработан"""
+
+        return self.__offset
+
+    @property
+    def statistic(self):
+        """Возвращает значение приватного поля с накопленной статистикой"""
+
+        return self.__statistic
+
+    def reset(self):
+        """Сбрасывает накопленную статистику, чтобы файл был обработан с начала"""
+
+        self.__offset = 0
+        self.__head_hash = None
+        self.__statistic = Statistic(self.__selected_vacancy, [])
+
+    def load(self):
+        """Загружает контрольную точку из файла, если она подходит к текущему csv-файлу. Контрольная точка, которую
+           не удаётся считать или сохранённая в другой версии формата, игнорируется"""
+
+        if not os.path.isfile(self.__checkpoint_name):
+            return
+        try:
+            with open(self.__checkpoint_name, 'rb') as file:
+                checkpoint = pickle.load(file)
+        except (pickle.UnpicklingError, AttributeError, EOFError):
+            return
+        if not isinstance(checkpoint, dict) or checkpoint.get('format') != self.checkpoint_format:
+            return
+        if checkpoint['selected_vacancy'] == self.__selected_vacancy:
+            self.__offset = checkpoint['offset']
+            self.__head_hash = checkpoint['head_hash']
+            self.__statistic = checkpoint['statistic']
+
+    def save(self):
+        """Атомарно сохраняет контрольную точку в файл"""
+
+        temporary_name = self.__checkpoint_name + '.tmp'
+        with open(temporary_name, 'wb') as file:
+            pickle.dump({'format': self.checkpoint_format, 'selected_vacancy': self.__selected_vacancy,
+                         'offset': self.__offset, 'head_hash': self.__head_hash, 'statistic': self.__statistic}, file,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_name, self.__checkpoint_name)
+
+    def is_file_appended(self):
+        """Проверяет, что csv-файл был только дополнен с момента сохранения контрольной точки: он не стал короче
+           обработанной части и его начало не изменилось"""
+
+        if self.__head_hash is None:
+            return self.__offset == 0
+        return os.path.getsize(self.__file_name) >= self.__offset and \
+            file_head_hash(self.__file_name, min(self.head_size, self.__offset)) == self.__head_hash
+
+    def refresh(self):
+        """Добавляет в статистику вакансии из дописанного хвоста файла и сохраняет новую контрольную точку. Если файл
+           был заменён или укорочен, статистика пересчитывается с начала"""
+
+        if not self.is_file_appended():
+            self.reset()
+        dataset = DataSet(self.__file_name, is_streaming=True, start_offset=self.__offset)
+        self.__statistic.enter_rows(dataset.iterate_rows(), dataset.titles)
+        self.__offset = dataset.offset
+        self.__head_hash = file_head_hash(self.__file_name, min(self.head_size, self.__offset))
+        self.save()
+        return self.__statistic
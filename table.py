@@ -1,5 +1,44 @@
 from prettytable import PrettyTable
+from functools import lru_cache
+import heapq
 import re
+import sys
+from vacancy import Vacancy
+from table_index import TableIndex
+
+html_tag = re.compile('<.*?>')
+"""Скомпилированное один раз регулярное выражение html-тега"""
+
+
+def clean(string: str):
+    """Очищает строку от html-тегов и лишних пробелов в каждой строке текста без кэша и интернирования
+
+    Attributes:
+        string (str): Строка для очистки
+
+    >>> clean('<p>Большой   опыт</p>\\n <b>Python</b> ')
+    'Большой опыт\\nPython'
+    """
+
+    result = html_tag.sub('', string).split("\n")
+    return "\n".join(" ".join(value.split()) for value in result)
+
+
+@lru_cache(maxsize=1 << 16)
+def clean_string(string: str):
+    """Очищает строку функцией clean. Результаты запоминаются в ограниченном кэше, поэтому повторяющиеся значения
+       (навыки, компании, регионы, заголовки) очищаются один раз и разделяются между строками таблицы как
+       интернированные строки. Интернируются только значения, попавшие в кэш. Счётчики попаданий -
+       clean_string.cache_info()
+
+    Attributes:
+        string (str): Строка для очистки
+
+    >>> clean_string('<p>Большой   опыт</p>\\n <b>Python</b> ')
+    'Большой опыт\\nPython'
+    """
+
+    return sys.intern(clean(string))
 
 
 def format_time(time: str):
@@ -40,17 +79,26 @@ def format_money(money: str):
 
 
 class Table:
-    """Класс для печати вакансий в консоль в табличном виде
+    """Класс для печати вакансий в консоль в табличном виде. Таблица строится лениво: фильтрация и сортировка
+       работают с номерами вакансий и считывают только нужные им поля, а очистка от html-тегов, перевод,
+       форматирование оклада и даты и обрезка длинных значений выполняются только для выводимых строк и столбцов.
+       Выводимые строки печатаются страницами по page_size строк: каждая страница - отдельная таблица PrettyTable,
+       поэтому время и память вывода зависят от размера страницы, а не от количества найденных вакансий. Если
+       страниц больше одной, ширина столбцов на всех страницах одинакова и не зависит от их строк
 
     Attributes:
-        self.vacancies_data (list): список словарей с данными по вакансиям
+        self.vacancies_data (list): список словарей с исходными данными по вакансиям
         self.settings (dict): словарь с настройками вывода таблицы
         self.filter (tuple): параметр фильтрации
         self.sort_option (str): параметр сортировки
         self.is_reverse_sort (bool): обратная ли сортировка
         self.need_rows (list): список требуемых колонок
         self.need_columns (NoneType or list): требуемые строки
-        self.table (PrettyTable): таблица для вывода
+        self.fields (dict): словарь, где ключ - переведённое название поля, а значение - исходный ключ словарей
+        self.titles (list): заголовки всех столбцов таблицы, кроме номера
+        self.indexes (list): номера вакансий в vacancies_data, прошедших фильтрацию, в порядке сортировки
+        self.table_index (TableIndex): хэш-индексы столбцов vacancies_data для фильтров равенства
+        self.table (PrettyTable): первая страница вывода, содержащая только выводимые строки и столбцы
     """
 
     transl_dict = {"name": "Название", "description": "Описание", "key_skills": "Навыки",
@@ -70,21 +118,42 @@ class Table:
     experience_weight = {"Нет опыта": 0, "От 1 года до 3 лет": 1, "От 3 до 6 лет": 2, "Более 6 лет": 3}
     """Статический словарь для сортировки по опыту"""
 
-    currency_to_rub = {"Манаты": 35.68, "Белорусские рубли": 23.91, "Евро": 59.90, "Грузинский лари": 21.74,
-                       "Киргизский сом": 0.76, "Тенге": 0.13, "Рубли": 1, "Гривны": 1.64, "Доллары": 60.66,
-                       "Узбекский сум": 0.0055}
-    """Статический словарь с курсом валют"""
+    currency_to_rub = dict(zip(map(transl_dict.get, Vacancy.currency_to_rub), Vacancy.currency_to_rub.values()))
+    """Статический словарь с курсом валют по их переведённым названиям, построенный по Vacancy.currency_to_rub"""
 
     possible_titles = ["№", "Название", "Описание", "Навыки", "Опыт работы", "Премиум-вакансия", "Компания",
                        "Оклад", "Название региона", "Дата публикации вакансии"]
     """Статический список с возможными заголовками для валидации настройки вывода столбцов"""
 
-    def __init__(self, data: list, settings: dict):
+    max_cached_length = 256
+    """Статическое поле с наибольшей длиной значения, очищаемого через кэш clean_string. Более длинные значения
+       (например, описания) почти не повторяются и очищаются функцией clean без кэша и интернирования, чтобы не
+       вытеснять из кэша короткие и не держать их в памяти интерпретатора"""
+
+    indexed_titles = ["Компания", "Название региона", "Идентификатор валюты оклада", "Опыт работы", "Премиум-вакансия",
+                      "Дата публикации вакансии"]
+    """Статический список столбцов, фильтр равенства по которым выполняется через хэш-индекс TableIndex"""
+
+    page_size = 50
+    """Статическое поле с количеством строк на одной странице вывода"""
+
+    column_width = 20
+    """Статическое поле с наибольшей шириной столбца, более длинные значения переносятся на следующие строки"""
+
+    sortable_titles = [title for title in possible_titles if title != "№"]
+    """Статический список столбцов, по которым возможна сортировка"""
+
+    salary_titles = ["Нижняя граница вилки оклада", "Верхняя граница вилки оклада", "Идентификатор валюты оклада"]
+    """Статический список полей, которые выводятся одним столбцом 'Оклад' в конце таблицы"""
+
+    def __init__(self, data: list, settings: dict, table_index: TableIndex = None):
         """Инициализирует объект Table, проверяя корректность настроек
 
         Attributes:
             data (list): Список словарей с данными о вакансиях
             settings (dict): Словарь с настройками вывода таблицы
+            table_index (TableIndex or NoneType): Индексы тех же данных, построенные прошлыми запросами. Если не
+                                                  задан, создаётся пустой
 
         >>> type(Table([{'name': 'Руководитель', 'description': 'испытательный срок до 3 месяцев', 'key_skills': 'Организаторские навыки', 'experience_id': 'between3And6', 'premium': 'FALSE', 'employer_name': 'ПМЦ Авангард', 'salary_from': '80000', 'salary_to': '100000', 'salary_gross': 'FALSE', 'salary_currency': 'RUR', 'area_name': 'Санкт-Петербург', 'published_at': '2022-07-17T18:23:06+0300'}], {'need_filter': '', 'sort_option': '', 'is_reverse_sort': '', 'need_rows': '', 'need_columns': ''})).__name__
         'Table'
@@ -95,9 +164,12 @@ class Table:
         >>> Table([{'name': 'Руководитель', 'description': 'испытательный срок до 3 месяцев', 'key_skills': 'Организаторские навыки', 'experience_id': 'between3And6', 'premium': 'FALSE', 'employer_name': 'ПМЦ Авангард', 'salary_from': '80000', 'salary_to': '100000', 'salary_gross': 'FALSE', 'salary_currency': 'RUR', 'area_name': 'Санкт-Петербург', 'published_at': '2022-07-17T18:23:06+0300'}], {'need_filter': '', 'sort_option': '', 'is_reverse_sort': 'Да', 'need_rows': '', 'need_columns': ''}).is_reverse_sort
         True
         """
-        self.vacancies_data = self.translate_and_clear_data(data)
+        self.vacancies_data = data
         self.settings = settings
         self.check_settings()
+        if table_index is not None and table_index.data is not data:
+            raise Exception('Индексы построены по другим данным')
+        self.table_index = table_index if table_index is not None else TableIndex(data)
 
         self.filter = self.get_formatted_filter()
         self.sort_option = settings['sort_option']
@@ -106,11 +178,12 @@ class Table:
             if len(settings['need_rows']) > 0 else [None]
         self.need_columns = settings['need_columns'].split(", ") if len(settings['need_columns']) > 0 else None
 
+        self.fields = {self.translate_and_clean_string(key): key for key in data[0]} if data else {}
+        self.titles = [title for title in self.fields if title not in self.salary_titles] + ["Оклад"]
+        self.indexes = list(range(len(data)))
         self.apply_filtering()
         self.apply_sorting()
-        self.format_vacancies_data()
 
-        self.table = PrettyTable()
         self.fill_table()
 
     def check_settings(self):
@@ -167,37 +240,45 @@ class Table:
 
         return float(money) * self.currency_to_rub[salary_currency]
 
-    def format_row(self, row: dict):
-        """Конвертирует словарь с данными по вакансии для вывода в таблицу, объединяя значения, касающиеся оклада,
-           если это возможно
+    def field(self, index: int, title: str):
+        """Возвращает очищенное и переведённое значение одного поля вакансии
 
         Attributes:
-            row (dict): Словарь с данными по вакансии
+            index (int): Номер вакансии в vacancies_data
+            title (str): Переведённое название поля
         """
 
-        salary_from = format_money(row.pop('Нижняя граница вилки оклада'))
-        salary_to = format_money(row.pop('Верхняя граница вилки оклада'))
-        salary_currency = row.pop('Идентификатор валюты оклада')
-        row['Дата публикации вакансии'] = format_time(row['Дата публикации вакансии'])
-        row['Оклад'] = f'{salary_from} - {salary_to} ({salary_currency})'
-        if ('С вычетом налогов' or 'Оклад указан до вычета налогов') in row.keys():
-            salary_gross = 'С вычетом налогов' \
-                if row.pop('Оклад указан до вычета налогов') == 'Нет' else 'Без вычета налогов'
-            row['Оклад'] += f" ({salary_gross})"
-        return row
+        return self.translate_and_clean_string(self.vacancies_data[index][self.fields[title]])
+
+    def format_value(self, index: int, title: str):
+        """Возвращает значение столбца таблицы для вакансии, объединяя поля оклада в один столбец и форматируя дату
+
+        Attributes:
+            index (int): Номер вакансии в vacancies_data
+            title (str): Заголовок столбца
+        """
 
-    def format_vacancies_data(self):
-        """Форматирует все словари с вакансиями для вывода в таблицу"""
+        if title == "Оклад":
+            return f'{format_money(self.field(index, "Нижняя граница вилки оклада"))} - ' \
+                   f'{format_money(self.field(index, "Верхняя граница вилки оклада"))} ' \
+                   f'({self.field(index, "Идентификатор валюты оклада")})'
+        if title == "Дата публикации вакансии":
+            return format_time(self.field(index, title))
+        return self.field(index, title)
 
-        result = []
-        for row in self.vacancies_data:
-            result.append(self.format_row(row))
-        self.vacancies_data = result
+    def format_row(self, index: int, titles: list):
+        """Форматирует для вывода в таблицу только требуемые столбцы вакансии, обрезая значения длиннее 100 символов
 
-    def create_titles(self):
-        """Создаёт заголовки"""
+        Attributes:
+            index (int): Номер вакансии в vacancies_data
+            titles (list): Заголовки выводимых столбцов
+        """
 
-        self.table.field_names = ["№"] + list(self.vacancies_data[0].keys())
+        row = []
+        for title in titles:
+            value = self.format_value(index, title)
+            row.append(f"{value[:100]}..." if len(value) > 100 else value)
+        return row
 
     def apply_filtering(self):
         """Применяет фильтрацию к данным о вакансиях и выводит сообщения, прекращая выполнение программы,
@@ -205,81 +286,172 @@ class Table:
 
         if self.filter[0] != '':
             self.filter_vacancies()
-            if len(self.vacancies_data) == 0:
+            if len(self.indexes) == 0:
                 print("Ничего не найдено")
                 exit()
 
     def apply_sorting(self):
         """Применяет сортировку, если параметр для неё указан"""
 
-        if self.sort_option != '':
+        if self.sort_option not in ['', '№']:
             self.sort_vacancies()
 
     def print_vacancies_table(self):
-        """Печатает таблицу, обрезая её по конфигурации вывода столбцов и строк"""
+        """Печатает таблицу, уже обрезанную по конфигурации вывода столбцов и строк. Первая страница уже построена
+           в fill_table, следующие печатаются без заголовков и верхней границы, продолжая её"""
 
-        print(self.table[slice(*(self.need_rows + [None]))].get_string(
-            fields=[] if not self.need_columns else ["№"] + self.need_columns))
+        print(self.table.get_string())
+        for page in self.pages(1):
+            print("\n".join(page.get_string(header=False).splitlines()[1:]))
+
+    def salary_key(self, index: int):
+        """Возвращает средний оклад вакансии в рублях для сортировки, очищая поле валюты один раз
+
+        Attributes:
+            index (int): Номер вакансии в vacancies_data
+        """
+
+        currency = self.field(index, "Идентификатор валюты оклада")
+        return (self.convert(self.field(index, "Нижняя граница вилки оклада"), currency)
+                + self.convert(self.field(index, "Верхняя граница вилки оклада"), currency)) / 2
+
+    def skills(self, index: int):
+        """Возвращает список навыков вакансии
+
+        Attributes:
+            index (int): Номер вакансии в vacancies_data
+        """
+
+        return self.field(index, "Навыки").split("\n")
+
+    def salary_interval(self, index: int):
+        """Возвращает вилку оклада вакансии кортежем (нижняя граница, верхняя граница) без перевода валюты
+
+        Attributes:
+            index (int): Номер вакансии в vacancies_data
+        """
+
+        return float(self.field(index, "Нижняя граница вилки оклада")), \
+            float(self.field(index, "Верхняя граница вилки оклада"))
+
+    def sort_key(self, title: str):
+        """Возвращает функцию ключа сортировки по номеру вакансии для столбца
+
+        Attributes:
+            title (str): Название столбца из sortable_titles
+        """
+
+        if title == "Навыки":
+            return self.table_index.build_skills(self.skills).__getitem__
+        if title == "Оклад":
+            return self.salary_key
+        if title == "Опыт работы":
+            return lambda index: self.experience_weight[self.field(index, "Опыт работы")]
+        return lambda index: self.field(index, title)
+
+    def precompute_orders(self):
+        """Строит в table_index перестановки для сортировки по каждому столбцу из sortable_titles в обоих
+           порядках. Следующие объекты Table с тем же table_index, в том числе загруженным через TableIndex.load,
+           сортируют вакансии по перестановке без вычисления ключей"""
+
+        for title in self.sortable_titles:
+            for is_reverse in [False, True]:
+                self.table_index.build_order(title, is_reverse, self.sort_key(title))
 
     def sort_vacancies(self):
-        """Сортирует данные о вакансиях по указанному параметру сортировки"""
-
-        if self.sort_option == "Навыки":
-            self.vacancies_data = sorted(self.vacancies_data,
-                                         key=lambda x: len(x["Навыки"].split("\n")), reverse=self.is_reverse_sort)
-        elif self.sort_option == "Оклад":
-            self.vacancies_data = sorted(self.vacancies_data,
-                                         key=lambda x: (self.convert(x["Нижняя граница вилки оклада"],
-                                                                     x["Идентификатор валюты оклада"])
-                                                        + self.convert(x["Верхняя граница вилки оклада"],
-                                                                       x["Идентификатор валюты оклада"])) / 2,
-                                         reverse=self.is_reverse_sort)
-        elif self.sort_option == "Опыт работы":
-            self.vacancies_data = sorted(self.vacancies_data, key=lambda x: self.experience_weight[x["Опыт работы"]],
-                                         reverse=self.is_reverse_sort)
+        """Сортирует номера вакансий по указанному параметру сортировки, считывая только нужные для него поля.
+           Ключ считается один раз для каждой вакансии. Если диапазон вывода ограничен сверху, вместо полной
+           сортировки кучей выбираются только первые вакансии до конца диапазона: heapq.nsmallest и heapq.nlargest
+           дают тот же порядок, что и устойчивая sorted, в том числе для равных ключей. Тогда в indexes остаются
+           только эти вакансии. Если в table_index уже есть перестановка для параметра сортировки, ключи не
+           вычисляются: вакансии упорядочиваются по ней"""
+
+        end = self.need_rows[1] if len(self.need_rows) > 1 else None
+        if (self.sort_option, self.is_reverse_sort) in self.table_index.orders:
+            self.indexes = self.table_index.sort(self.indexes, self.sort_option, self.is_reverse_sort,
+                                                 end if end is not None and end >= 0 else None)
+            return
+        key = self.sort_key(self.sort_option)
+        if end is not None and 0 <= end < len(self.indexes):
+            select = heapq.nlargest if self.is_reverse_sort else heapq.nsmallest
+            self.indexes = select(end, self.indexes, key=key)
         else:
-            self.vacancies_data = sorted(self.vacancies_data, key=lambda x: x[self.sort_option],
-                                         reverse=self.is_reverse_sort)
+            self.indexes = sorted(self.indexes, key=key, reverse=self.is_reverse_sort)
 
     def filter_vacancies(self):
-        """Фильтрует данные о вакансиях по указанному параметру фильтрации"""
+        """Фильтрует номера вакансий по указанному параметру фильтрации, считывая только нужные для него поля.
+           Фильтры равенства по столбцам indexed_titles ищут вакансии в хэш-индексе, остальные проверяют каждую.
+           Фильтр по окладу ищет в дереве интервалов вилки, содержащие значение, а для диапазона "от - до" - вилки,
+           пересекающиеся с ним"""
 
         if self.filter[0] == "Навыки":
             self.skills_filter()
         elif self.filter[0] == "Оклад":
-            self.vacancies_data = [i for i in self.vacancies_data if float(i["Нижняя граница вилки оклада"])
-                                   <= float(self.filter[1]) <= float(i["Верхняя граница вилки оклада"])]
+            bounds = [float(bound) for bound in self.filter[1].split(" - ")]
+            if len(bounds) == 1:
+                self.indexes = self.table_index.stab("Оклад", bounds[0], self.salary_interval)
+            else:
+                self.indexes = self.table_index.overlap("Оклад", bounds[0], bounds[1], self.salary_interval)
         elif self.filter[0] == "Дата публикации вакансии":
-            self.vacancies_data = [i for i in self.vacancies_data
-                                   if format_time(i[self.filter[0]]) == self.filter[1]]
-        self.vacancies_data = [i for i in self.vacancies_data if i[self.filter[0]] == self.filter[1]]
+            self.indexes = self.table_index.lookup(self.filter[0], self.filter[1],
+                                                   lambda index: format_time(self.field(index, self.filter[0])))
+        elif self.filter[0] in self.indexed_titles:
+            self.indexes = self.table_index.lookup(self.filter[0], self.filter[1],
+                                                   lambda index: self.field(index, self.filter[0]))
+        else:
+            self.indexes = [index for index in self.indexes if self.field(index, self.filter[0]) == self.filter[1]]
 
     def skills_filter(self):
-        """Фильтрует данные о вакансиях по указанным навыкам"""
-
-        skill_requests = list(self.filter[1].split(", "))
-        result = []
-        for vacancy in self.vacancies_data:
-            found = []
-            for skill_request in skill_requests:
-                for skill in vacancy["Навыки"].split("\n"):
-                    if skill == skill_request:
-                        found.append(skill)
-            if len(found) == len(skill_requests):
-                result.append(vacancy)
-        self.vacancies_data = result
+        """Фильтрует номера вакансий по указанным навыкам пересечением списков вакансий навыков из индекса"""
+
+        self.indexes = self.table_index.find_skills(self.filter[1].split(", "), self.skills)
 
     def fill_table(self):
-        """Заполняет таблицу данными, обрезая строки, если они длиннее 100 символов"""
+        """Заполняет таблицу первой страницей выводимых строк и столбцов"""
+
+        self.table = next(self.pages())
+
+    def pages(self, first_page: int = 0):
+        """Возвращает генератор страниц вывода. Строки страницы форматируются только при её создании. Если выводимых
+           строк нет, создаётся одна страница с заголовками. Единственная страница получает ширину столбцов по своим
+           строкам, как таблица целиком. Если страниц больше, ширина столбцов всех страниц задаётся заранее: столбцы
+           значений шириной column_width или заголовка, если он длиннее (заголовки не переносятся), столбец номеров -
+           по самому длинному номеру. Так границы страниц совпадают без повторного форматирования строк ради их
+           ширины
+
+        Attributes:
+            first_page (int): Номер первой создаваемой страницы, предыдущие пропускаются без форматирования
+        """
+
+        titles = self.titles if not self.need_columns else \
+            [title for title in self.titles if title in self.need_columns]
+        positions = range(len(self.indexes))[slice(*(self.need_rows + [None]))]
+        widths = {}
+        if len(positions) > self.page_size:
+            widths = {title: max(self.column_width, len(title)) for title in titles}
+            widths["№"] = len(str(positions[-1] + 1))
+        for start in range(first_page * self.page_size, max(len(positions), 1), self.page_size):
+            yield self.create_page(titles, positions[start:start + self.page_size], widths)
+
+    def create_page(self, titles: list, positions: range, widths: dict):
+        """Создаёт страницу вывода. Номера строк сквозные: они соответствуют позиции вакансии после фильтрации и
+           сортировки, а не позиции в выводимом диапазоне
+
+        Attributes:
+            titles (list): Заголовки выводимых столбцов
+            positions (range): Позиции выводимых вакансий в indexes
+            widths (dict): Словарь, где ключ - заголовок столбца, а значение - его наименьшая ширина
+        """
 
-        self.create_titles()
-        self.table.max_width = 20
-        self.table.hrules = True
-        self.table.align = 'l'
-        for i, row in enumerate(self.vacancies_data):
-            for key, value in row.items():
-                row[key] = f"{value[:100]}..." if len(value) > 100 else value
-            self.table.add_row([i + 1] + [value for value in row.values()])
+        page = PrettyTable()
+        page.field_names = ["№"] + titles
+        page.max_width = self.column_width
+        page.min_width = widths
+        page.hrules = True
+        page.align = 'l'
+        for position in positions:
+            page.add_row([position + 1] + self.format_row(self.indexes[position], titles))
+        return page
 
     def translate_and_clean_string(self, string: str):
         """Очищает строку от html-хэштегов и переводит, если это возможно
@@ -290,18 +462,12 @@ class Table:
         'Название'
         """
 
-        result = re.sub(re.compile('<.*?>'), '', string).split("\n")
-        result = [" ".join(value.strip().split()) for value in result]
-        result = "\n".join(result)
-        return self.transl_dict[result] if result in self.transl_dict.keys() else result
-
-    def translate_and_clear_data(self, data: list):
-        """Очищает словарь с вакансиями от html-хэштегов и переводит значения, если это возможно"""
-
-        translated_data = []
-        for vacancy_dict in data:
-            translated_dict = {}
-            for item in vacancy_dict.items():
-                translated_dict[self.translate_and_clean_string(item[0])] = self.translate_and_clean_string(item[1])
-            translated_data.append(translated_dict)
-        return translated_data
+        result = clean_string(string) if len(string) <= self.max_cached_length else clean(string)
+        return self.transl_dict.get(result, result)
+
+    @staticmethod
+    def cleaning_hit_rate():
+        """Возвращает долю значений, очищенных из кэша clean_string, среди всех обращений к нему"""
+
+        info = clean_string.cache_info()
+        return info.hits / (info.hits + info.misses) if info.hits + info.misses > 0 else 0
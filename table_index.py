@@ -0,0 +1,301 @@
+import hashlib
+import heapq
+import pickle
+import numpy as np
+from interval_tree import IntervalTree
+
+
+def data_hash(data: list):
+    """Возвращает хэш содержимого вакансий с учётом их порядка: ключей и значений каждого словаря
+
+    Args:
+        data (list): Список словарей с исходными данными по вакансиям
+
+    >>> data_hash([{'name': 'a'}, {'name': 'b'}]) == data_hash([{'name': 'b'}, {'name': 'a'}])
+    False
+    """
+
+    content_hash = hashlib.blake2b(digest_size=16)
+    for row in data:
+        content_hash.update('\x1f'.join(f'{key}\x1d{value}' for key, value in row.items()).encode() + b'\x1e')
+    return content_hash.hexdigest()
+
+
+class TableIndex:
+    """Класс вторичных хэш-индексов для фильтров равенства Table. Индекс столбца строится по требованию при первом
+       фильтре по нему: один проход по вакансиям раскладывает их номера по значениям столбца. Следующие фильтры по
+       тому же столбцу тех же данных, в том числе в других объектах Table, выполняются поиском в словаре за время,
+       пропорциональное количеству найденных вакансий. Также по требованию строятся деревья интервалов IntervalTree
+       для фильтров по вилке оклада и инвертированный индекс навыков: для каждого навыка отсортированный массив номеров
+       вакансий с ним и для каждой вакансии количество её навыков. Для сортировки хранятся перестановки: номера всех
+       вакансий в порядке сортировки по столбцу и позиция каждой вакансии в этом порядке. Построенные индексы можно
+       сохранить в файл и загрузить для тех же данных при следующих запусках
+
+    Attributes:
+        self.__data (list): Список словарей с исходными данными по вакансиям, по которым построены индексы
+        self.__columns (dict): Словарь, где ключ - название столбца, а значение - словарь, где ключ - значение
+                               столбца, а значение - список номеров вакансий с ним по возрастанию
+        self.__trees (dict): Словарь, где ключ - название столбца с интервалами, а значение - IntervalTree
+        self.__skills (dict or NoneType): Словарь, где ключ - навык, а значение - массив numpy номеров вакансий с ним
+                                          по возрастанию. None, пока индекс навыков не построен
+        self.__skill_counts (list or NoneType): Список количеств навыков вакансий для ключа сортировки
+        self.__orders (dict): Словарь, где ключ - кортеж (название столбца, обратный ли порядок), а значение - кортеж
+                              из списка номеров вакансий в порядке сортировки и списка позиций вакансий в нём
+    """
+
+    def __init__(self, data: list):
+        """Инициализирует объект TableIndex без построенных индексов
+
+        Args:
+            data (list): Список словарей с исходными данными по вакансиям
+
+        >>> index = TableIndex([{'area_name': 'Москва'}, {'area_name': 'Тверь'}, {'area_name': 'Москва'}])
+        >>> index.lookup('Название региона', 'Москва', lambda number: index.data[number]['area_name'])
+        [0, 2]
+        """
+
+        self.__data = data
+        self.__columns = {}
+        self.__trees = {}
+        self.__skills = None
+        self.__skill_counts = None
+        self.__orders = {}
+
+    @property
+    def data(self):
+        """Возвращает значение приватного поля с данными"""
+
+        return self.__data
+
+    @property
+    def columns(self):
+        """Возвращает значение приватного поля со словарём построенных индексов"""
+
+        return self.__columns
+
+    @property
+    def skills(self):
+        """Возвращает значение приватного поля со словарём массивов номеров вакансий по навыкам"""
+
+        return self.__skills
+
+    @property
+    def skill_counts(self):
+        """Возвращает значение приватного поля со списком количеств навыков вакансий"""
+
+        return self.__skill_counts
+
+    @property
+    def orders(self):
+        """Возвращает значение приватного поля со словарём перестановок для сортировки"""
+
+        return self.__orders
+
+    @property
+    def trees(self):
+        """Возвращает значение приватного поля со словарём построенных деревьев интервалов"""
+
+        return self.__trees
+
+    def build(self, column: str, key):
+        """Строит индекс столбца, если он ещё не построен, и возвращает его
+
+        Args:
+            column (str): Название столбца
+            key (function): Функция, возвращающая значение столбца по номеру вакансии
+        """
+
+        values = self.__columns.get(column)
+        if values is None:
+            values = {}
+            for number in range(len(self.__data)):
+                values.setdefault(key(number), []).append(number)
+            self.__columns[column] = values
+        return values
+
+    def lookup(self, column: str, value: str, key):
+        """Возвращает новый список номеров вакансий, у которых значение столбца равно заданному
+
+        Args:
+            column (str): Название столбца
+            value (str): Искомое значение
+            key (function): Функция, возвращающая значение столбца по номеру вакансии, для построения индекса
+        """
+
+        return list(self.build(column, key).get(value, ()))
+
+    def build_tree(self, column: str, key):
+        """Строит дерево интервалов столбца, если оно ещё не построено, и возвращает его
+
+        Args:
+            column (str): Название столбца с интервалами
+            key (function): Функция, возвращающая кортеж (нижняя граница, верхняя граница) по номеру вакансии
+        """
+
+        tree = self.__trees.get(column)
+        if tree is None:
+            tree = IntervalTree([key(number) + (number,) for number in range(len(self.__data))])
+            self.__trees[column] = tree
+        return tree
+
+    def stab(self, column: str, point: float, key):
+        """Возвращает номера вакансий по возрастанию, интервал которых содержит точку
+
+        Args:
+            column (str): Название столбца с интервалами
+            point (float): Значение, например оклад
+            key (function): Функция, возвращающая кортеж (нижняя граница, верхняя граница) по номеру вакансии
+
+        >>> index = TableIndex([{'salary_from': '10000', 'salary_to': '30000'}, {'salary_from': '5000', 'salary_to': '9000'}])
+        >>> index.stab('Оклад', 20000.0, lambda number: (float(index.data[number]['salary_from']), float(index.data[number]['salary_to'])))
+        [0]
+        """
+
+        return sorted(self.build_tree(column, key).stab(point))
+
+    def overlap(self, column: str, low: float, high: float, key):
+        """Возвращает номера вакансий по возрастанию, интервал которых пересекается с отрезком [low, high]
+
+        Args:
+            column (str): Название столбца с интервалами
+            low (float): Нижняя граница отрезка
+            high (float): Верхняя граница отрезка
+            key (function): Функция, возвращающая кортеж (нижняя граница, верхняя граница) по номеру вакансии
+        """
+
+        return sorted(self.build_tree(column, key).overlap(low, high))
+
+    def build_skills(self, key):
+        """Строит инвертированный индекс навыков, если он ещё не построен, и возвращает список количеств навыков
+           вакансий. Каждая строка навыков разбивается один раз
+
+        Args:
+            key (function): Функция, возвращающая список навыков по номеру вакансии
+        """
+
+        if self.__skills is None:
+            postings, counts = {}, []
+            for number in range(len(self.__data)):
+                skills = key(number)
+                counts.append(len(skills))
+                for skill in set(skills):
+                    postings.setdefault(skill, []).append(number)
+            self.__skills = {skill: np.array(numbers, dtype=np.int64) for skill, numbers in postings.items()}
+            self.__skill_counts = counts
+        return self.__skill_counts
+
+    def find_skills(self, skills: list, key):
+        """Возвращает номера вакансий по возрастанию, у которых есть все указанные навыки. Пересечение начинается с
+           самого редкого навыка, и каждый следующий массив проверяется бинарным поиском только для оставшихся
+           номеров, поэтому время зависит от частоты самого редкого навыка, а не от количества вакансий
+
+        Args:
+            skills (list): Список навыков
+            key (function): Функция, возвращающая список навыков по номеру вакансии, для построения индекса
+
+        >>> index = TableIndex([{'key_skills': 'Git\\nSQL'}, {'key_skills': 'SQL'}, {'key_skills': 'Git\\nSQL\\nLinux'}])
+        >>> index.find_skills(['SQL', 'Git'], lambda number: index.data[number]['key_skills'].split('\\n'))
+        [0, 2]
+        """
+
+        self.build_skills(key)
+        postings = sorted((self.__skills.get(skill, np.empty(0, dtype=np.int64)) for skill in set(skills)), key=len)
+        result = postings[0]
+        for numbers in postings[1:]:
+            if len(result) == 0:
+                break
+            positions = np.searchsorted(numbers, result)
+            found = positions < len(numbers)
+            found[found] = numbers[positions[found]] == result[found]
+            result = result[found]
+        return result.tolist()
+
+    def build_order(self, column: str, is_reverse: bool, key):
+        """Строит перестановку для сортировки по столбцу, если она ещё не построена, и возвращает её. Порядок
+           совпадает с устойчивой sorted по номерам вакансий, в том числе для равных ключей
+
+        Args:
+            column (str): Название столбца
+            is_reverse (bool): Обратный ли порядок сортировки
+            key (function): Функция ключа сортировки по номеру вакансии
+        """
+
+        order = self.__orders.get((column, is_reverse))
+        if order is None:
+            numbers = sorted(range(len(self.__data)), key=key, reverse=is_reverse)
+            positions = [0] * len(numbers)
+            for position, number in enumerate(numbers):
+                positions[number] = position
+            order = self.__orders[column, is_reverse] = numbers, positions
+        return order
+
+    def sort(self, numbers: list, column: str, is_reverse: bool, end: int = None):
+        """Сортирует номера вакансий, перечисленные по возрастанию, по построенной перестановке без вычисления
+           ключей и возвращает первые end из них. Если выбрано много вакансий, номера собираются одним проходом по
+           перестановке с отметками выбранных, иначе сортируются по позициям в ней
+
+        Args:
+            numbers (list): Номера вакансий по возрастанию, например результат фильтрации
+            column (str): Название столбца
+            is_reverse (bool): Обратный ли порядок сортировки
+            end (int or NoneType): Количество первых вакансий в порядке сортировки. None - все
+
+        >>> index = TableIndex([{'salary_from': '300'}, {'salary_from': '100'}, {'salary_from': '200'}])
+        >>> _ = index.build_order('Нижняя граница вилки оклада', False, lambda number: float(index.data[number]['salary_from']))
+        >>> index.sort([0, 1, 2], 'Нижняя граница вилки оклада', False), index.sort([0, 2], 'Нижняя граница вилки оклада', False, 1)
+        ([1, 2, 0], [2])
+        """
+
+        order, positions = self.__orders[column, is_reverse]
+        end = len(numbers) if end is None else min(end, len(numbers))
+        if len(numbers) == len(order):
+            return order[:end]
+        if len(numbers) * 8 >= len(order):
+            selected = bytearray(len(order))
+            for number in numbers:
+                selected[number] = 1
+            result = []
+            for number in order:
+                if selected[number]:
+                    result.append(number)
+                    if len(result) == end:
+                        break
+            return result
+        if end < len(numbers):
+            return heapq.nsmallest(end, numbers, key=positions.__getitem__)
+        return sorted(numbers, key=positions.__getitem__)
+
+    @classmethod
+    def load(cls, file_name: str, data: list):
+        """Загружает сохранённые индексы для данных. Если количество вакансий или хэш их содержимого отличаются от
+           данных, по которым индексы были построены, вызывается исключение
+
+        Args:
+            file_name (str): Имя файла индексов
+            data (list): Список словарей с исходными данными по вакансиям, по которым индексы были построены
+        """
+
+        with open(file_name, 'rb') as file:
+            saved = pickle.load(file)
+        if saved['size'] != len(data) or saved['data_hash'] != data_hash(data):
+            raise Exception('Индексы построены по другим данным')
+        index = cls(data)
+        index.__columns = saved['columns']
+        index.__trees = saved['trees']
+        index.__skills = saved['skills']
+        index.__skill_counts = saved['skill_counts']
+        index.__orders = saved['orders']
+        return index
+
+    def save(self, file_name: str):
+        """Сохраняет построенные индексы в файл без исходных данных, но с хэшем их содержимого
+
+        Args:
+            file_name (str): Имя файла индексов
+        """
+
+        with open(file_name, 'wb') as file:
+            pickle.dump({'size': len(self.__data), 'data_hash': data_hash(self.__data), 'columns': self.__columns,
+                         'trees': self.__trees, 'skills': self.__skills, 'skill_counts': self.__skill_counts,
+                         'orders': self.__orders},
+                        file, protocol=pickle.HIGHEST_PROTOCOL)
@@ -1,11 +1,36 @@
+import collections
+import contextlib
+import io
+import json
+import os
+import pickle
+import sys
+import tempfile
+import numpy as np
 from unittest import TestCase
 from city import City
 from dataset import DataSet
 from vacancy import Vacancy
 from year import Year
 from statistic import Statistic
-from table import Table
+from table import Table, clean_string, format_time
+from table_index import TableIndex
+from interval_tree import IntervalTree
 from report import Report
+from columnar_dataset import ColumnarDataSet
+from columnar_statistic import ColumnarStatistic
+from statistic_checkpoint import StatisticCheckpoint
+from statistic_cache import StatisticCache
+from aho_corasick import AhoCorasick
+from professions_statistic import ProfessionsStatistic
+from name_index import NameIndex
+from partitioner import CsvPartitioner
+from csvsplit import CsvSplitterByYear
+from parallel_reader import ParallelReader
+from partitioned_dataset import PartitionedDataSet
+from currency import CurrencyRates
+from heavy_hitters import SpaceSaving
+from quantile_sketch import KllSketch
 
 circumcised_data = [{'area_name': 'Санкт-Петербург',
                      'description': '<p><strong>Обязанности:',
@@ -26,6 +51,11 @@ circumcised_data = [{'area_name': 'Санкт-Петербург',
                      'salary_gross': 'FALSE',
                      'salary_to': '100000'}]
 
+float_order_data = [{'name': 'Программист', 'salary_from': salary_from, 'salary_to': salary_to,
+                     'salary_currency': currency, 'area_name': 'Москва', 'published_at': '2022-07-17T18:23:06+0300'}
+                    for salary_from, salary_to, currency in [('18500', '19700', 'UAH'), ('4200', '7900', 'AZN'),
+                                                             ('24000', '27400', 'UAH'), ('17500', '21300', 'GEL')]]
+
 
 class CityTests(TestCase):
     first_vacancy = Vacancy({'name': 'Программист', 'area_name': 'Екатеринбург', 'published_at': '2015',
@@ -55,6 +85,15 @@ class CityTests(TestCase):
     def test_updated_city_vacancy_count(self):
         self.assertEqual(self.updated_city.vacancy_count, 2)
 
+    merged_city = City(first_vacancy)
+    merged_city.merge(City(second_vacancy))
+
+    def test_merged_city_average_salary(self):
+        self.assertEqual(self.merged_city.average_salary, 42425.0)
+
+    def test_merged_city_vacancy_count(self):
+        self.assertEqual(self.merged_city.vacancy_count, 2)
+
 
 class DataSetTests(TestCase):
     dataset = DataSet('vacancies.csv')
@@ -115,6 +154,104 @@ class DataSetTests(TestCase):
     def test_dataset_circumcised_data(self):
         self.assertEqual(self.dataset.data[:1], self.data)
 
+    streaming_dataset = DataSet('vacancies.csv', is_streaming=True)
+
+    def test_streaming_dataset_data_type(self):
+        self.assertEqual(type(DataSet('vacancies.csv', is_streaming=True).data).__name__, 'generator')
+
+    def test_streaming_dataset_titles(self):
+        self.assertEqual(self.streaming_dataset.titles, self.titles)
+
+    def test_streaming_dataset_same_rows(self):
+        self.assertEqual(list(DataSet('vacancies.csv', is_streaming=True).data), self.dataset.data)
+
+    def test_streaming_dataset_statistic(self):
+        self.assertEqual(Statistic('Программист', DataSet('vacancies.csv', is_streaming=True).data).salary_dynamics,
+                         Statistic('Программист', self.dataset.data).salary_dynamics)
+
+
+class ColumnarDataSetTests(TestCase):
+    dataset = ColumnarDataSet.from_dictionaries(circumcised_data + [
+        {'name': 'Программист', 'area_name': 'Москва', 'published_at': '2021-07-05T18:23:15+0300',
+         'salary_from': '4500', 'salary_to': '5500', 'salary_currency': 'EUR', 'employer_name': 'ПМЦ Авангард',
+         'experience_id': 'moreThan6', 'key_skills': 'Python', 'description': '', 'premium': 'FALSE',
+         'salary_gross': 'FALSE'}])
+
+    def test_columnar_dataset_type(self):
+        self.assertEqual(type(self.dataset).__name__, 'ColumnarDataSet')
+
+    def test_columnar_dataset_vacancies_count(self):
+        self.assertEqual(self.dataset.vacancies_count, 2)
+
+    def test_columnar_dataset_years(self):
+        self.assertEqual(self.dataset.years.tolist(), [2022, 2021])
+
+    def test_columnar_dataset_salary_from(self):
+        self.assertEqual(self.dataset.salary_from.tolist(), [80000.0, 4500.0])
+
+    def test_columnar_dataset_categories(self):
+        self.assertEqual(self.dataset.categories('salary_currency'), ['RUR', 'EUR'])
+
+    def test_columnar_dataset_shared_category_code(self):
+        self.assertEqual(self.dataset.codes('employer_name').tolist(), [0, 0])
+
+    def test_columnar_dataset_decode(self):
+        self.assertEqual(self.dataset.decode('area_name').tolist(), ['Санкт-Петербург', 'Москва'])
+
+    def test_columnar_dataset_average_salary(self):
+        self.assertEqual(self.dataset.average_salary.tolist(),
+                         [Vacancy(row_dict).average_salary for row_dict in circumcised_data] + [299500.0])
+
+    def test_columnar_dataset_from_file(self):
+        self.assertEqual(ColumnarDataSet.from_file('vacancies.csv').vacancies_count,
+                         len(DataSet('vacancies.csv').data))
+
+    def test_columnar_dataset_saved(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.dataset.save(directory)
+            dataset = ColumnarDataSet.load(directory)
+            self.assertEqual([dataset.years.tolist(), dataset.codes('area_name').tolist(),
+                              dataset.categories('area_name'), dataset.average_salary.tolist()],
+                             [self.dataset.years.tolist(), self.dataset.codes('area_name').tolist(),
+                              self.dataset.categories('area_name'), self.dataset.average_salary.tolist()])
+
+    def test_columnar_dataset_memory_map(self):
+        with tempfile.TemporaryDirectory() as directory:
+            ColumnarDataSet.from_cache('vacancies.csv', directory)
+            self.assertEqual(type(ColumnarDataSet.from_cache('vacancies.csv', directory).salary_to).__name__,
+                             'memmap')
+
+    def test_columnar_dataset_save_over_open_memory_map(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.dataset.save(directory)
+            opened = ColumnarDataSet.load(directory)
+            expected = opened.salary_to.tolist()
+            ColumnarDataSet.from_dictionaries(DataSet('vacancies.csv').data[:100]).save(directory)
+            self.assertEqual(opened.salary_to.tolist(), expected)
+            self.assertEqual(ColumnarDataSet.load(directory).vacancies_count, 100)
+            self.assertEqual([name for name in os.listdir(directory) if name.endswith('.tmp')], [])
+
+    def test_columnar_dataset_outdated_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.dataset.save(directory, source=[0, 0])
+            self.assertEqual(ColumnarDataSet.from_cache('vacancies.csv', directory).vacancies_count,
+                             len(DataSet('vacancies.csv').data))
+
+    def test_columnar_dataset_cache_other_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_names = [os.path.join(directory, name) for name in ['first.csv', 'second.csv']]
+            for file_name, area_name in zip(file_names, ['Москва', 'Казань']):
+                with open(file_name, 'w', encoding='utf-8-sig') as file:
+                    file.write('\n'.join(','.join(row) for row in [float_order_data[0].keys()] +
+                                          [dict(row, area_name=area_name).values() for row in float_order_data]))
+            stat = os.stat(file_names[0])
+            os.utime(file_names[1], ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            cache_directory = os.path.join(directory, 'cache')
+            self.assertEqual(ColumnarDataSet.from_cache(file_names[0], cache_directory).categories('area_name'),
+                             ['Москва'])
+            self.assertEqual(ColumnarDataSet.from_cache(file_names[1], cache_directory).categories('area_name'),
+                             ['Казань'])
+
 
 class VacancyTests(TestCase):
     first_vacancy = Vacancy({'name': 'Программист', 'area_name': 'Екатеринбург', 'published_at': '2015',
@@ -143,6 +280,24 @@ class VacancyTests(TestCase):
     def test_vacancy_foreign_area_name(self):
         self.assertEqual(self.second_vacancy.area_name, 'Мінск')
 
+    def test_vacancy_slots(self):
+        self.assertFalse(hasattr(self.first_vacancy, '__dict__'))
+
+    def test_vacancy_from_rows(self):
+        dataset = DataSet('vacancies.csv', is_streaming=True)
+        rows = list(dataset.iterate_rows())
+        self.assertEqual([(vacancy.name, vacancy.area_name, vacancy.year, vacancy.average_salary)
+                          for vacancy in Vacancy.from_rows(rows, dataset.titles)],
+                         [(vacancy.name, vacancy.area_name, vacancy.year, vacancy.average_salary)
+                          for vacancy in (Vacancy(dict(zip(dataset.titles, row))) for row in rows)])
+
+    def test_vacancy_from_rows_column_order(self):
+        vacancy = next(Vacancy.from_rows([['BYR', '2015-05-01', 'Мінск', '90', '70', 'Пакавальнік']],
+                                         ['salary_currency', 'published_at', 'area_name', 'salary_to', 'salary_from',
+                                          'name']))
+        self.assertEqual((vacancy.name, vacancy.area_name, vacancy.year, vacancy.average_salary),
+                         ('Пакавальнік', 'Мінск', 2015, 1912.8))
+
 
 class YearTests(TestCase):
     first_vacancy = Vacancy({'name': 'Программист', 'area_name': 'Екатеринбург', 'published_at': '2015',
@@ -190,6 +345,19 @@ class YearTests(TestCase):
     def test_updated_year_selected_vacancy_average_salary(self):
         self.assertEqual(self.updated_year.selected_vacancy_average_salary, 282500.0)
 
+    merged_year = Year(first_vacancy, 'Программист')
+    merged_year.merge(Year(second_vacancy, 'Программист'))
+
+    def test_merged_year_average_salary(self):
+        self.assertEqual(self.merged_year.average_salary, 282500.0)
+
+    def test_merged_year_selected_vacancy_count(self):
+        self.assertEqual(self.merged_year.selected_vacancy_count, 2)
+
+    def test_merged_other_year(self):
+        self.assertRaises(Exception, Year(self.first_vacancy, 'Программист').merge,
+                          Year(self.vacancy_at_other_year, 'Программист'))
+
     vacancy_at_other_year = Vacancy({'name': 'Программист', 'area_name': 'Москва', 'published_at': '2020',
                                      'salary_from': '70000', 'salary_to': '900000', 'salary_currency': 'RUR'})
     other_updated_year = Year(first_vacancy, 'Программист')
@@ -319,6 +487,744 @@ class StatisticTests(TestCase):
     def test_selected_updated_statistic_fulfillment(self):
         self.assertEqual(self.selected_updated_statistic.fulfillment, True)
 
+    merged_statistic = Statistic('Руководитель проекта', circumcised_data)
+    merged_statistic.merge(Statistic('Руководитель проекта', [row_for_update]))
+
+    def test_merged_statistic_salary_dynamics(self):
+        self.assertEqual(self.merged_statistic.salary_dynamics, {2022: 194750})
+
+    def test_merged_statistic_city_salary_dynamics(self):
+        self.assertEqual(self.merged_statistic.city_salary_dynamics, {'Москва': 299500, 'Санкт-Петербург': 90000})
+
+    def test_merged_statistic_vacancies_count(self):
+        self.assertEqual(self.merged_statistic.vacancies_count, 2)
+
+    def test_parallel_statistic_same_as_serial(self):
+        data = DataSet('vacancies.csv').data
+        statistic = Statistic('Программист', data)
+        parallel_statistic = Statistic('Программист', data, processes=2, chunk_size=300)
+        self.assertEqual([statistic.salary_dynamics, statistic.selected_salary_dynamics,
+                          statistic.city_salary_dynamics, statistic.city_num_vacancies_dynamics],
+                         [parallel_statistic.salary_dynamics, parallel_statistic.selected_salary_dynamics,
+                          parallel_statistic.city_salary_dynamics, parallel_statistic.city_num_vacancies_dynamics])
+
+
+    def test_parallel_statistic_float_order(self):
+        data = [{'name': 'Программист', 'salary_from': str(salary), 'salary_to': str(salary), 'salary_currency': 'RUR',
+                 'area_name': 'Москва', 'published_at': '2022-07-17T18:23:06+0300'} for salary in [2 ** 53] + [1] * 19]
+        statistic = Statistic('Программист', data)
+        parallel_statistic = Statistic('Программист', data, processes=2, chunk_size=10)
+        self.assertEqual(statistic.salary_dynamics, {2022: (2 ** 53 + 19) // 20})
+        self.assertEqual([statistic.salary_dynamics, statistic.selected_salary_dynamics,
+                          statistic.city_salary_dynamics],
+                         [parallel_statistic.salary_dynamics, parallel_statistic.selected_salary_dynamics,
+                          parallel_statistic.city_salary_dynamics])
+
+    def test_statistic_exact_salary_sum(self):
+        statistic = Statistic('Программист', float_order_data)
+        self.assertEqual([statistic.salary_dynamics, statistic.selected_salary_dynamics,
+                          statistic.city_salary_dynamics], [{2022: 177772}, {2022: 177772}, {'Москва': 177772}])
+
+
+class StatisticRowsTests(TestCase):
+    dataset = DataSet('vacancies.csv', is_streaming=True)
+    titles = dataset.titles
+    rows = list(dataset.iterate_rows())
+
+    def test_statistic_enter_rows(self):
+        statistic = Statistic('Программист', [])
+        statistic.enter_rows(self.rows, self.titles)
+        expected = Statistic('Программист', (dict(zip(self.titles, row)) for row in self.rows))
+        self.assertEqual([statistic.salary_dynamics, statistic.selected_salary_dynamics,
+                          statistic.city_salary_dynamics, statistic.city_num_vacancies_dynamics],
+                         [expected.salary_dynamics, expected.selected_salary_dynamics,
+                          expected.city_salary_dynamics, expected.city_num_vacancies_dynamics])
+
+    def test_statistic_slotted_aggregates(self):
+        statistic = Statistic('Программист', [])
+        statistic.enter_rows(self.rows[:10], self.titles)
+        self.assertFalse(any(hasattr(aggregate, '__dict__')
+                             for aggregate in list(statistic.years.values()) + list(statistic.cities.values())))
+
+
+class ColumnarStatisticTests(TestCase):
+    row_for_update = {'name': 'Senior Python Developer (Crypto)', 'description': '<p>With over 1,500 employees </div>',
+                      'key_skills': 'Development\nPython\nAgile\nBlockchain\nInformation Technology',
+                      'experience_id': 'moreThan6', 'premium': 'FALSE', 'employer_name': 'EXNESS Global Limited',
+                      'salary_from': '4500', 'salary_to': '5500', 'salary_gross': 'FALSE', 'salary_currency': 'EUR',
+                      'area_name': 'Москва', 'published_at': '2022-07-05T18:23:15+0300'}
+    statistic = ColumnarStatistic('Руководитель проекта',
+                                  ColumnarDataSet.from_dictionaries(circumcised_data + [row_for_update]))
+
+    def test_columnar_statistic_exact_salary_sum(self):
+        statistic = ColumnarStatistic('Программист', ColumnarDataSet.from_dictionaries(float_order_data))
+        self.assertEqual([statistic.salary_dynamics, statistic.selected_salary_dynamics,
+                          statistic.city_salary_dynamics], [{2022: 177772}, {2022: 177772}, {'Москва': 177772}])
+
+    def test_columnar_statistic_type(self):
+        self.assertEqual(type(self.statistic).__name__, 'ColumnarStatistic')
+
+    def test_columnar_statistic_salary_dynamics(self):
+        self.assertEqual(self.statistic.salary_dynamics, {2022: 194750})
+
+    def test_columnar_statistic_num_vacancies_dynamics(self):
+        self.assertEqual(self.statistic.num_vacancies_dynamics, {2022: 2})
+
+    def test_columnar_statistic_selected_salary_dynamics(self):
+        self.assertEqual(self.statistic.selected_salary_dynamics, {2022: 90000})
+
+    def test_columnar_statistic_selected_num_vacancies_dynamics(self):
+        self.assertEqual(self.statistic.selected_num_vacancies_dynamics, {2022: 1})
+
+    def test_columnar_statistic_city_salary_dynamics(self):
+        self.assertEqual(self.statistic.city_salary_dynamics, {'Москва': 299500, 'Санкт-Петербург': 90000})
+
+    def test_columnar_statistic_city_num_vacancies_dynamics(self):
+        self.assertEqual(self.statistic.city_num_vacancies_dynamics, {'Москва': 0.5, 'Санкт-Петербург': 0.5})
+
+    def test_columnar_statistic_years(self):
+        self.assertEqual(self.statistic.years, [2022])
+
+    def test_columnar_statistic_same_as_statistic(self):
+        statistic = Statistic('Программист', DataSet('vacancies.csv').data)
+        columnar_statistic = ColumnarStatistic('Программист', ColumnarDataSet.from_file('vacancies.csv'))
+        self.assertEqual([statistic.salary_dynamics, statistic.num_vacancies_dynamics,
+                          statistic.selected_salary_dynamics, statistic.selected_num_vacancies_dynamics,
+                          statistic.city_salary_dynamics, statistic.city_num_vacancies_dynamics],
+                         [columnar_statistic.salary_dynamics, columnar_statistic.num_vacancies_dynamics,
+                          columnar_statistic.selected_salary_dynamics,
+                          columnar_statistic.selected_num_vacancies_dynamics,
+                          columnar_statistic.city_salary_dynamics, columnar_statistic.city_num_vacancies_dynamics])
+
+    def test_columnar_statistic_report_type(self):
+        self.assertEqual(type(Report(self.statistic)).__name__, 'Report')
+
+
+class ColumnarStatisticPeriodTests(TestCase):
+    data = DataSet('vacancies.csv').data
+    dataset = ColumnarDataSet.from_dictionaries(data)
+
+    def expected_dynamics(self, period_name):
+        sums = {}
+        for row_dict in self.data:
+            vacancy = Vacancy(row_dict)
+            period = period_name(row_dict['published_at'])
+            count, salary = sums.get(period, (0, 0))
+            sums[period] = (count + 1, salary + vacancy.average_salary)
+        return {period: int(salary // count) for period, (count, salary) in sums.items()}
+
+    def test_columnar_statistic_months(self):
+        statistic = ColumnarStatistic('Программист', self.dataset, 'month')
+        self.assertEqual({month: salary for month, salary in statistic.salary_dynamics.items()
+                          if statistic.num_vacancies_dynamics[month] > 0},
+                         self.expected_dynamics(lambda published_at: published_at[:7]))
+        self.assertEqual(list(statistic.salary_dynamics), sorted(statistic.salary_dynamics))
+
+    def test_columnar_statistic_quarters(self):
+        statistic = ColumnarStatistic('Программист', self.dataset, 'quarter')
+        self.assertEqual({quarter: salary for quarter, salary in statistic.salary_dynamics.items()
+                          if statistic.num_vacancies_dynamics[quarter] > 0},
+                         self.expected_dynamics(lambda published_at:
+                                                f'{published_at[:4]}-Q{(int(published_at[5:7]) - 1) // 3 + 1}'))
+
+    def test_columnar_statistic_selected_months(self):
+        statistic = ColumnarStatistic('Программист', self.dataset, 'month')
+        self.assertEqual(sum(statistic.selected_num_vacancies_dynamics.values()),
+                         sum('Программист' in row_dict['name'] for row_dict in self.data))
+
+    def test_columnar_statistic_unknown_period(self):
+        with self.assertRaises(Exception):
+            ColumnarStatistic('Программист', self.dataset, 'week')
+
+    def test_columnar_statistic_month_report(self):
+        self.assertEqual(type(Report(ColumnarStatistic('Программист', self.dataset, 'month'))).__name__, 'Report')
+
+
+class StatisticCheckpointTests(TestCase):
+    with open('vacancies.csv', 'rb') as vacancies_file:
+        lines = vacancies_file.read().splitlines(keepends=True)
+
+    def check_refresh(self, parts: list):
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, 'vacancies.csv')
+            checkpoint_name = os.path.join(directory, 'checkpoint.pickle')
+            for part in parts:
+                with open(file_name, 'ab') as file:
+                    file.write(part)
+                statistic = StatisticCheckpoint(file_name, checkpoint_name, 'Программист').refresh()
+            expected = Statistic('Программист', DataSet(file_name).data)
+            self.assertEqual([statistic.salary_dynamics, statistic.selected_salary_dynamics,
+                              statistic.city_num_vacancies_dynamics, statistic.vacancies_count],
+                             [expected.salary_dynamics, expected.selected_salary_dynamics,
+                              expected.city_num_vacancies_dynamics, expected.vacancies_count])
+
+    def test_checkpoint_full_file(self):
+        self.check_refresh([b''.join(self.lines)])
+
+    def test_checkpoint_appended_file(self):
+        self.check_refresh([b''.join(self.lines[:700]), b''.join(self.lines[700:1500]), b''.join(self.lines[1500:])])
+
+    def test_checkpoint_unfinished_line(self):
+        self.check_refresh([b''.join(self.lines[:700]) + self.lines[700][:10], self.lines[700][10:],
+                            b''.join(self.lines[701:])])
+
+    def test_checkpoint_offset(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, 'vacancies.csv')
+            with open(file_name, 'wb') as file:
+                file.write(b''.join(self.lines[:50]) + b'unfinished')
+            checkpoint = StatisticCheckpoint(file_name, os.path.join(directory, 'checkpoint.pickle'), 'Программист')
+            checkpoint.refresh()
+            self.assertEqual(checkpoint.offset, len(b''.join(self.lines[:50])))
+
+    def test_checkpoint_replaced_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, 'vacancies.csv')
+            checkpoint_name = os.path.join(directory, 'checkpoint.pickle')
+            with open(file_name, 'wb') as file:
+                file.write(b''.join(self.lines))
+            StatisticCheckpoint(file_name, checkpoint_name, 'Программист').refresh()
+            with open(file_name, 'wb') as file:
+                file.write(b''.join(self.lines[:1] + self.lines[300:]))
+            statistic = StatisticCheckpoint(file_name, checkpoint_name, 'Программист').refresh()
+            self.assertEqual(statistic.vacancies_count, len(DataSet(file_name).data))
+
+
+    def test_checkpoint_old_format(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, 'vacancies.csv')
+            checkpoint_name = os.path.join(directory, 'checkpoint.pickle')
+            with open(file_name, 'wb') as file:
+                file.write(b''.join(self.lines[:700]))
+            StatisticCheckpoint(file_name, checkpoint_name, 'Программист').refresh()
+            with open(checkpoint_name, 'rb') as file:
+                checkpoint = pickle.load(file)
+            del checkpoint['format']
+            for year in checkpoint['statistic'].years.values():
+                del year._Year__salary_sketch
+            for city in checkpoint['statistic'].cities.values():
+                del city._City__salary_sketch
+            with open(checkpoint_name, 'wb') as file:
+                pickle.dump(checkpoint, file)
+            with open(file_name, 'ab') as file:
+                file.write(b''.join(self.lines[700:]))
+            checkpoint = StatisticCheckpoint(file_name, checkpoint_name, 'Программист')
+            self.assertEqual(checkpoint.offset, 0)
+            statistic = checkpoint.refresh()
+            self.assertEqual(statistic.vacancies_count, len(DataSet(file_name).data))
+            self.assertEqual(statistic.salary_median_dynamics,
+                             Statistic('Программист', DataSet(file_name).data).salary_median_dynamics)
+
+
+class StatisticCacheTests(TestCase):
+    def check_statistic(self, statistic: Statistic, selected_vacancy: str):
+        expected = Statistic(selected_vacancy, DataSet('vacancies.csv').data)
+        self.assertEqual([statistic.salary_dynamics, statistic.num_vacancies_dynamics,
+                          statistic.selected_salary_dynamics, statistic.selected_num_vacancies_dynamics,
+                          statistic.city_salary_dynamics, statistic.city_num_vacancies_dynamics],
+                         [expected.salary_dynamics, expected.num_vacancies_dynamics,
+                          expected.selected_salary_dynamics, expected.selected_num_vacancies_dynamics,
+                          expected.city_salary_dynamics, expected.city_num_vacancies_dynamics])
+
+    def test_cache_scanned_profession(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = StatisticCache(directory)
+            cache.get_statistic('vacancies.csv', 'Программист')
+            self.check_statistic(StatisticCache(directory).get_statistic('vacancies.csv', 'Программист'),
+                                 'Программист')
+
+    def test_cache_built_statistics_independent(self):
+        with tempfile.TemporaryDirectory() as directory:
+            general, selected = StatisticCache(directory).scan('vacancies.csv', 'Программист')
+        first = StatisticCache.build_statistic(general, selected, 'Программист')
+        second = StatisticCache.build_statistic(general, selected, 'Программист')
+        year, city = next(iter(first.years.values())), next(iter(first.cities.values()))
+        year.add('Программист', 10 ** 9)
+        city.add(10 ** 9)
+        self.assertEqual(second.years[year.name].salary_sketch.count + 1, year.salary_sketch.count)
+        self.assertEqual(general['years'][year.name][2].count + 1, year.salary_sketch.count)
+        self.assertEqual(second.cities[city.name].vacancy_count + 1, city.vacancy_count)
+
+    def test_cache_other_profession(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = StatisticCache(directory)
+            cache.get_statistic('vacancies.csv', 'Программист')
+            self.check_statistic(cache.get_statistic('vacancies.csv', 'Аналитик'), 'Аналитик')
+            self.assertEqual(len(cache.entries), 3)
+
+    def test_cache_exact_salary_sum(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, 'vacancies.csv')
+            with open(file_name, 'w', encoding='utf-8-sig') as file:
+                file.write('\n'.join(','.join(row) for row in [float_order_data[0].keys()] +
+                                      [row.values() for row in float_order_data]) + '\n')
+            cache = StatisticCache(os.path.join(directory, 'cache'))
+            cache.get_statistic(file_name, 'Аналитик')
+            statistic = cache.get_statistic(file_name, 'Программист')
+        self.assertEqual([statistic.salary_dynamics, statistic.selected_salary_dynamics,
+                          statistic.city_salary_dynamics], [{2022: 177772}, {2022: 177772}, {'Москва': 177772}])
+
+    def test_cache_eviction(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = StatisticCache(directory, max_size=1)
+            cache.get_statistic('vacancies.csv', 'Программист')
+            self.assertEqual(len(cache.entries), 0)
+
+    def test_cache_least_recently_used_eviction(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = StatisticCache(directory)
+            cache.get_statistic('vacancies.csv', 'Программист')
+            cache.get_statistic('vacancies.csv', 'Аналитик')
+            last_used_entry = cache.entries[-1]
+            cache.get_statistic('vacancies.csv', 'Программист')
+            self.assertEqual(cache.entries[0], last_used_entry)
+
+    def test_cache_invalidation(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = StatisticCache(directory)
+            cache.get_statistic('vacancies.csv', 'Программист')
+            cache.invalidate('vacancies.csv')
+            self.assertEqual(cache.entries, [])
+
+    def test_cache_unreadable_entry(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = StatisticCache(directory)
+            cache.get_statistic('vacancies.csv', 'Программист')
+            for entry in cache.entries:
+                with open(os.path.join(directory, entry), 'wb') as file:
+                    file.write(b'outdated')
+            self.check_statistic(StatisticCache(directory).get_statistic('vacancies.csv', 'Программист'),
+                                 'Программист')
+
+
+class CsvPartitionerTests(TestCase):
+    data = DataSet('vacancies.csv').data
+
+    def read_partitions(self, directory: str, partitioner: CsvPartitioner):
+        return {key: DataSet(os.path.join(directory, partition['file'])).data
+                for key, partition in partitioner.partitions.items()}
+
+    def test_partitioner_unsorted_years(self):
+        with tempfile.TemporaryDirectory() as directory:
+            partitions = self.read_partitions(directory, CsvSplitterByYear('vacancies.csv', directory))
+            self.assertEqual(partitions, {year: [row for row in self.data if row['published_at'][:4] == year]
+                                          for year in {row['published_at'][:4] for row in self.data}})
+
+    def test_partitioner_evicted_writers(self):
+        with tempfile.TemporaryDirectory() as directory:
+            partitioner = CsvPartitioner('vacancies.csv', directory, key='city', max_open_files=2)
+            partitions = self.read_partitions(directory, partitioner)
+            self.assertEqual(sum(len(rows) for rows in partitions.values()), len(self.data))
+            self.assertTrue(all(row['area_name'] == key for key, rows in partitions.items() for row in rows))
+
+    def test_partitioner_manifest(self):
+        with tempfile.TemporaryDirectory() as directory:
+            CsvPartitioner('vacancies.csv', directory, key='year_month', max_open_files=3)
+            with open(os.path.join(directory, CsvPartitioner.manifest_name), encoding='utf-8') as file:
+                manifest = json.load(file)
+            self.assertEqual(manifest['key'], 'year_month')
+            self.assertEqual({key: partition['rows'] for key, partition in manifest['partitions'].items()},
+                             dict(collections.Counter(row['published_at'][:7] for row in self.data)))
+
+    def test_partitioner_key_function(self):
+        with tempfile.TemporaryDirectory() as directory:
+            partitioner = CsvPartitioner('vacancies.csv', directory, key=lambda row: row['area_name'] == 'Москва')
+            self.assertEqual(sorted(partitioner.partitions), ['False', 'True'])
+
+
+    def test_partitioner_colliding_file_names(self):
+        keys = ['a/b', 'a:b', 'A/B']
+        with tempfile.TemporaryDirectory() as directory:
+            partitioner = CsvPartitioner('vacancies.csv', directory,
+                                         key=lambda row: keys[len(row['name']) % len(keys)])
+            files = [partition['file'] for partition in partitioner.partitions.values()]
+            self.assertEqual(len({file.casefold() for file in files}), len(keys))
+            partitions = self.read_partitions(directory, partitioner)
+            self.assertEqual({key: len(rows) for key, rows in partitions.items()},
+                             dict(collections.Counter(keys[len(row['name']) % len(keys)] for row in self.data)))
+
+    def test_partitioner_closes_files_on_error(self):
+        def key(row):
+            if row == self.data[100]:
+                raise ValueError
+            return row['published_at'][:4]
+
+        with tempfile.TemporaryDirectory() as directory:
+            with self.assertRaises(ValueError):
+                CsvPartitioner('vacancies.csv', directory, key=key)
+            self.assertFalse(os.path.exists(os.path.join(directory, CsvPartitioner.manifest_name)))
+            written = sum(len(DataSet(os.path.join(directory, name)).data) for name in os.listdir(directory))
+            self.assertEqual(written, 100)
+
+
+class ParallelReaderTests(TestCase):
+    rows = list(DataSet('vacancies.csv', is_streaming=True).iterate_rows())
+
+    def test_parallel_reader_ranges(self):
+        reader = ParallelReader('vacancies.csv', 1, range_size=5000, block_size=100)
+        self.assertEqual(reader.ranges[-1][1], os.path.getsize('vacancies.csv'))
+        self.assertTrue(all(end == start for (_, end), (start, _) in zip(reader.ranges, reader.ranges[1:])))
+
+    def test_parallel_reader_multiline_fields(self):
+        self.assertEqual(list(ParallelReader('vacancies.csv', 1, range_size=1000, block_size=64).iterate_rows()),
+                         self.rows)
+
+    def test_parallel_reader_processes(self):
+        self.assertEqual(list(ParallelReader('vacancies.csv', 2, range_size=50000).iterate_rows()), self.rows)
+
+    def test_parallel_reader_statistic(self):
+        statistic = ParallelReader('vacancies.csv', 2, range_size=50000).statistic('Программист')
+        expected = Statistic('Программист', DataSet('vacancies.csv').data)
+        self.assertEqual([statistic.salary_dynamics, statistic.selected_num_vacancies_dynamics,
+                          statistic.city_salary_dynamics, statistic.vacancies_count],
+                         [expected.salary_dynamics, expected.selected_num_vacancies_dynamics,
+                          expected.city_salary_dynamics, expected.vacancies_count])
+
+    def test_parallel_reader_partitioner(self):
+        with tempfile.TemporaryDirectory() as directory:
+            partitioner = CsvPartitioner('vacancies.csv', directory, processes=2)
+            self.assertEqual(sum(partition['rows'] for partition in partitioner.partitions.values()), len(self.rows))
+
+
+class PartitionedDataSetTests(TestCase):
+    data = DataSet('vacancies.csv').data
+
+    def test_partitioned_dataset_pruning(self):
+        with tempfile.TemporaryDirectory() as directory:
+            CsvSplitterByYear('vacancies.csv', directory)
+            dataset = PartitionedDataSet(directory, 2008, 2010)
+            self.assertEqual(sorted(dataset.partitions), ['2008', '2009', '2010'])
+            self.assertEqual(sorted(dataset.data, key=lambda row: row['published_at'][:4]),
+                             sorted((row for row in self.data if '2008' <= row['published_at'][:4] <= '2010'),
+                                    key=lambda row: row['published_at'][:4]))
+
+    def test_partitioned_dataset_manifest_counts(self):
+        with tempfile.TemporaryDirectory() as directory:
+            CsvPartitioner('vacancies.csv', directory, key='year_month')
+            dataset = PartitionedDataSet(directory, 2008, is_streaming=True)
+            expected = Statistic('', [row for row in self.data if row['published_at'][:4] >= '2008'])
+            self.assertEqual(dataset.num_vacancies_dynamics, dict(sorted(expected.num_vacancies_dynamics.items())))
+
+    def test_partitioned_dataset_without_manifest(self):
+        dataset = PartitionedDataSet('vacancies_by_year', 2007, 2008)
+        self.assertEqual(dataset.files, [os.path.join('vacancies_by_year', '2007.csv'),
+                                         os.path.join('vacancies_by_year', '2008.csv')])
+        self.assertEqual(len(dataset.data), sum(dataset.num_vacancies_dynamics.values()))
+        self.assertEqual(dataset.data[0]['published_at'][:4], '2007')
+
+    def test_partitioned_dataset_streaming_rows(self):
+        dataset = PartitionedDataSet('vacancies_by_year', 2007, 2009, is_streaming=True)
+        self.assertEqual(type(dataset.iterate_partition(dataset.files[0])).__name__, 'generator')
+        self.assertEqual(list(dataset.data), PartitionedDataSet('vacancies_by_year', 2007, 2009).data)
+
+    def test_partitioned_dataset_not_by_years(self):
+        with tempfile.TemporaryDirectory() as directory:
+            CsvPartitioner('vacancies.csv', directory, key='city')
+            with self.assertRaises(Exception):
+                PartitionedDataSet(directory)
+
+
+class CurrencyRatesTests(TestCase):
+    rates_rows = 'date,USD,EUR\n2007-01,26.5,\n2007-02,,34.6\n2007-04,26.0,35.0\n'
+    data = [{'name': 'Программист', 'salary_from': '1000', 'salary_to': '2000', 'salary_currency': currency,
+             'area_name': 'Москва', 'published_at': published_at}
+            for currency, published_at in [('USD', '2006-12-31T10:00:00+0300'), ('USD', '2007-01-20T10:00:00+0300'),
+                                           ('EUR', '2007-01-20T10:00:00+0300'), ('USD', '2007-03-01T10:00:00+0300'),
+                                           ('EUR', '2007-04-02T10:00:00+0300'), ('RUR', '2022-07-17T18:23:06+0300'),
+                                           ('USD', '2022-07-17T18:23:06+0300'), ('KZT', '2007-02-01T10:00:00+0300')]]
+
+    def load_rates(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, 'currencies.csv')
+            with open(file_name, 'w', encoding='utf-8') as file:
+                file.write(self.rates_rows)
+            return CurrencyRates.from_file(file_name)
+
+    def test_currency_rates_months(self):
+        self.assertEqual(self.load_rates().months, ['2007-01', '2007-02', '2007-03', '2007-04'])
+
+    def test_currency_rates_lookup(self):
+        rates = self.load_rates()
+        self.assertEqual([rates.rate(row['salary_currency'], row['published_at']) for row in self.data],
+                         [60.66, 26.5, 59.90, 26.5, 35.0, 1, 26.0, 0.13])
+
+    def test_currency_rates_unknown_currency(self):
+        with self.assertRaises(Exception):
+            self.load_rates().rate('XXX', '2007-01')
+
+    def test_currency_rates_vacancy(self):
+        self.assertEqual(Vacancy(self.data[2], self.load_rates()).average_salary, 1500 * 59.90)
+
+    def test_currency_rates_vectorized(self):
+        rates = self.load_rates()
+        dataset = ColumnarDataSet.from_dictionaries(self.data)
+        dataset.set_currency_rates(rates)
+        self.assertEqual(dataset.average_salary.tolist(), [Vacancy(row, rates).average_salary for row in self.data])
+
+    def test_currency_rates_vectorized_same_as_lookup(self):
+        for rates, month, expected in [({'BYN': {'2020-01': 30.0}}, '2019-05', None),
+                                       ({'USD': {'2020-01': 70.0}, 'BYN': {'2020-02': 31.0}}, '2020-03', 31.0),
+                                       ({'USD': {'2020-01': 70.0}, 'BYN': {'2020-02': 31.0}}, '2020-01', None)]:
+            rates = CurrencyRates(rates)
+            published_at = np.array([f'{month}-01', f'{month}-01'], dtype='datetime64[D]')
+            if expected is None:
+                with self.assertRaises(Exception):
+                    rates.rate('BYN', month)
+                with self.assertRaises(Exception):
+                    rates.convert(np.array([1.0, 1.0]), ['RUR', 'BYN'], np.array([0, 1]), published_at)
+            else:
+                self.assertEqual(rates.rate('BYN', month), expected)
+                self.assertEqual(rates.convert(np.array([1.0, 1.0]), ['RUR', 'BYN', 'XXX'], np.array([0, 1]),
+                                               published_at).tolist(), [1.0, expected])
+
+    def test_currency_rates_statistic(self):
+        rates = self.load_rates()
+        self.assertEqual(Statistic('Программист', self.data, currency_rates=rates).salary_dynamics,
+                         {2006: 90990, 2007: 44409, 2022: 20250})
+
+
+class SpaceSavingTests(TestCase):
+    dataset = DataSet('vacancies.csv', is_streaming=True)
+    titles = dataset.titles
+    rows = list(dataset.iterate_rows())
+    area_index = titles.index('area_name')
+
+    def test_space_saving_wrong_capacity(self):
+        with self.assertRaises(Exception):
+            SpaceSaving(0)
+
+    def test_space_saving_bounds(self):
+        summary = SpaceSaving(20)
+        for row in self.rows:
+            summary.update(row[self.area_index], 1.0)
+        counts = collections.Counter(row[self.area_index] for row in self.rows)
+        self.assertEqual(len(summary), 20)
+        self.assertLessEqual(summary.max_error, len(self.rows) / 20)
+        self.assertTrue(all(summary.bounds(city)[0] <= count <= summary.bounds(city)[1]
+                            for city, count in counts.items()))
+
+    def test_space_saving_merge(self):
+        first, second = SpaceSaving(20), SpaceSaving(20)
+        for index, row in enumerate(self.rows):
+            (first if index % 2 else second).update(row[self.area_index], 1.0)
+        first.merge(second)
+        counts = collections.Counter(row[self.area_index] for row in self.rows)
+        self.assertEqual([len(first), first.total], [20, len(self.rows)])
+        self.assertTrue(all(first.bounds(city)[0] <= count <= first.bounds(city)[1] for city, count in counts.items()))
+
+    def test_statistic_cities_capacity_exact(self):
+        statistic = Statistic('Программист', [], cities_capacity=1000)
+        statistic.enter_rows(self.rows, self.titles)
+        expected = Statistic('Программист', [])
+        expected.enter_rows(self.rows, self.titles)
+        self.assertEqual([statistic.city_salary_dynamics, statistic.city_num_vacancies_dynamics, statistic.cities],
+                         [expected.city_salary_dynamics, expected.city_num_vacancies_dynamics, {}])
+
+    def test_statistic_cities_capacity_bounded(self):
+        statistic = Statistic('Программист', [], cities_capacity=20)
+        statistic.enter_rows(self.rows, self.titles)
+        expected = Statistic('Программист', [])
+        expected.enter_rows(self.rows, self.titles)
+        self.assertEqual(len(statistic.city_summary), 20)
+        self.assertEqual(list(statistic.city_num_vacancies_dynamics)[:2], ['Москва', 'Санкт-Петербург'])
+        self.assertTrue(all(lower <= expected.cities[city].vacancy_count <= upper
+                            for city, (lower, upper) in statistic.city_count_bounds.items()))
+
+    def test_statistic_cities_capacity_merge(self):
+        statistic = Statistic('Программист', [], cities_capacity=1000)
+        with self.assertRaises(Exception):
+            statistic.merge(Statistic('Программист', []))
+
+
+class KllSketchTests(TestCase):
+    dataset = DataSet('vacancies.csv', is_streaming=True)
+    titles = dataset.titles
+    rows = list(dataset.iterate_rows())
+    columnar = ColumnarStatistic('Программист', ColumnarDataSet(titles, rows))
+
+    @staticmethod
+    def rank_error(values: list, estimate: float, fraction: float):
+        lower = sum(value < estimate for value in values) / len(values)
+        upper = sum(value <= estimate for value in values) / len(values)
+        return max(lower - fraction, fraction - upper, 0)
+
+    def test_kll_sketch_wrong_k(self):
+        with self.assertRaises(Exception):
+            KllSketch(4)
+
+    def test_kll_sketch_exact_small(self):
+        sketch = KllSketch()
+        for value in [5.0, 1.0, 4.0, 2.0, 3.0]:
+            sketch.update(value)
+        self.assertEqual(sketch.quantiles([0, 0.5, 0.9, 1]), [1.0, 3.0, 5.0, 5.0])
+
+    def test_kll_sketch_empty(self):
+        self.assertEqual(KllSketch().quantiles([0.5, 0.9]), [0, 0])
+
+    def test_kll_sketch_bounded(self):
+        values = [float(value * 7919 % 100003) for value in range(100000)]
+        sketch = KllSketch()
+        for value in values:
+            sketch.update(value)
+        self.assertLess(sketch.size, 3 * sketch.k + 2 * len(sketch.compactors))
+        self.assertEqual(sketch.count, len(values))
+        self.assertTrue(all(self.rank_error(values, sketch.quantile(fraction), fraction) < 0.0165
+                            for fraction in (0.1, 0.5, 0.9)))
+
+    def test_kll_sketch_merge(self):
+        values = [float(value * 7919 % 100003) for value in range(40000)]
+        parts = [KllSketch() for _ in range(4)]
+        for index, value in enumerate(values):
+            parts[index % 4].update(value)
+        sketch = KllSketch()
+        for part in parts:
+            sketch.merge(part)
+        self.assertEqual([sketch.count, sketch.min, sketch.max], [len(values), min(values), max(values)])
+        self.assertTrue(all(self.rank_error(values, sketch.quantile(fraction), fraction) < 0.0165
+                            for fraction in (0.5, 0.9)))
+
+    def test_year_merge_sketch(self):
+        year = Year(Vacancy({'name': 'Программист', 'area_name': 'Екатеринбург', 'published_at': '2015',
+                             'salary_from': '10000', 'salary_to': '10000', 'salary_currency': 'RUR'}), 'Программист')
+        year.add('Аналитик', 30000.0)
+        other = Year(Vacancy({'name': 'Аналитик', 'area_name': 'Москва', 'published_at': '2015',
+                              'salary_from': '20000', 'salary_to': '20000', 'salary_currency': 'RUR'}), 'Программист')
+        year.merge(other)
+        self.assertEqual([year.salary_quantile(0.5), year.salary_quantile(0.9)], [20000.0, 30000.0])
+
+    def test_statistic_quantiles(self):
+        statistic = Statistic('Программист', [])
+        statistic.enter_rows(self.rows, self.titles)
+        salaries = {}
+        for vacancy in Vacancy.from_rows(self.rows, self.titles):
+            salaries.setdefault(vacancy.year, []).append(vacancy.average_salary)
+        self.assertEqual(list(statistic.salary_median_dynamics), list(statistic.salary_dynamics))
+        self.assertTrue(all(self.rank_error(salaries[year], statistic.salary_median_dynamics[year], 0.5) < 0.0165 and
+                            self.rank_error(salaries[year], statistic.salary_p90_dynamics[year], 0.9) < 0.0165
+                            for year in salaries))
+        self.assertEqual(list(statistic.city_salary_median_dynamics), list(statistic.city_salary_dynamics))
+
+    def test_statistic_quantiles_exact_below_k(self):
+        statistic = Statistic('Программист', [])
+        statistic.enter_rows(self.rows, self.titles)
+        self.assertEqual([statistic.city_salary_median_dynamics['Новосибирск'],
+                          statistic.city_salary_p90_dynamics['Новосибирск']],
+                         [self.columnar.city_salary_median_dynamics['Новосибирск'],
+                          self.columnar.city_salary_p90_dynamics['Новосибирск']])
+
+    def test_columnar_statistic_quantiles(self):
+        self.assertEqual([self.columnar.salary_median_dynamics[2007], self.columnar.salary_p90_dynamics[2007]],
+                         [34000, 60000])
+
+    def test_professions_statistic_quantiles(self):
+        professions = ProfessionsStatistic(['Программист'], (dict(zip(self.titles, row)) for row in self.rows))
+        statistic = Statistic('Программист', [])
+        statistic.enter_rows(self.rows, self.titles)
+        self.assertEqual(professions.statistic('Программист').salary_median_dynamics,
+                         statistic.salary_median_dynamics)
+
+
+class IntervalTreeTests(TestCase):
+    intervals = [(float(row['salary_from']), float(row['salary_to']), number)
+                 for number, row in enumerate(DataSet('vacancies.csv').data)]
+    tree = IntervalTree(intervals)
+
+    def test_interval_tree_stab(self):
+        for point in [0.0, 15000.0, 30000.0, 100000.0, 250000.0, 10 ** 7]:
+            self.assertEqual(sorted(self.tree.stab(point)),
+                             [number for low, high, number in self.intervals if low <= point <= high])
+
+    def test_interval_tree_overlap(self):
+        for low, high in [(0.0, 1000.0), (100000.0, 150000.0), (30000.0, 30000.0), (500000.0, 10 ** 7)]:
+            self.assertEqual(sorted(self.tree.overlap(low, high)),
+                             [number for start, end, number in self.intervals if start <= high and end >= low])
+
+    def test_interval_tree_empty(self):
+        self.assertEqual((IntervalTree([]).stab(1.0), IntervalTree([]).overlap(0.0, 1.0)), ([], []))
+
+
+class AhoCorasickTests(TestCase):
+    matcher = AhoCorasick(['he', 'she', 'his', 'hers', 'Программист'])
+
+    def test_aho_corasick_overlapping_patterns(self):
+        self.assertEqual(self.matcher.find('ushers'), {0, 1, 3})
+
+    def test_aho_corasick_fail_transition(self):
+        self.assertEqual(self.matcher.find('ahishe'), {0, 1, 2})
+
+    def test_aho_corasick_nothing_found(self):
+        self.assertEqual(self.matcher.find('Аналитик'), set())
+
+    def test_aho_corasick_same_as_substring_check(self):
+        names = [row_dict['name'] for row_dict in DataSet('vacancies.csv').data]
+        self.assertEqual([self.matcher.find(name) for name in names],
+                         [{i for i, pattern in enumerate(self.matcher.patterns) if pattern in name} for name in names])
+
+
+class ProfessionsStatisticTests(TestCase):
+    professions = ['Программист', 'Аналитик', 'Руководитель', 'Программист 1С', 'Несуществующая профессия']
+    data = DataSet('vacancies.csv').data
+    statistic = ProfessionsStatistic(professions, data)
+
+    def test_professions_statistic_type(self):
+        self.assertEqual(type(self.statistic).__name__, 'ProfessionsStatistic')
+
+    def test_professions_statistic_same_as_statistic(self):
+        for profession in self.professions:
+            expected = Statistic(profession, self.data)
+            statistic = self.statistic.statistic(profession)
+            self.assertEqual([statistic.salary_dynamics, statistic.selected_salary_dynamics,
+                              statistic.selected_num_vacancies_dynamics, statistic.city_salary_dynamics],
+                             [expected.salary_dynamics, expected.selected_salary_dynamics,
+                              expected.selected_num_vacancies_dynamics, expected.city_salary_dynamics])
+
+    def test_professions_statistic_independent(self):
+        first, second = self.statistic.statistic('Программист'), self.statistic.statistic('Аналитик')
+        year, city = next(iter(first.years.values())), next(iter(first.cities.values()))
+        year.add('Программист', 10 ** 9)
+        city.add(10 ** 9)
+        self.assertNotEqual(year.salary_sketch.max, second.years[year.name].salary_sketch.max)
+        self.assertNotEqual(city.salary_sketch.max, second.cities[city.name].salary_sketch.max)
+        self.assertEqual(second.years[year.name].salary_sketch.count + 1, year.salary_sketch.count)
+
+    def test_professions_statistic_exact_salary_sum(self):
+        statistic = ProfessionsStatistic(['Программист'], float_order_data).statistic('Программист')
+        self.assertEqual([statistic.salary_dynamics, statistic.selected_salary_dynamics,
+                          statistic.city_salary_dynamics], [{2022: 177772}, {2022: 177772}, {'Москва': 177772}])
+
+    def test_professions_statistic_selected_num_vacancies_dynamics(self):
+        self.assertEqual(set(self.statistic.selected_num_vacancies_dynamics['Несуществующая профессия'].values()),
+                         {0})
+
+
+class NameIndexTests(TestCase):
+    data = DataSet('vacancies.csv').data
+    index = NameIndex.from_data(data)
+
+    def test_name_index_type(self):
+        self.assertEqual(type(self.index).__name__, 'NameIndex')
+
+    def test_name_index_years(self):
+        self.assertEqual(self.index.years, list(Statistic('', self.data).salary_dynamics.keys()))
+
+    def test_name_index_same_as_statistic(self):
+        for profession in ['Программист', 'Аналитик', '1С', 'C', 'Несуществующая профессия']:
+            expected = Statistic(profession, self.data)
+            self.assertEqual([self.index.selected_salary_dynamics(profession),
+                              self.index.selected_num_vacancies_dynamics(profession)],
+                             [expected.selected_salary_dynamics, expected.selected_num_vacancies_dynamics])
+
+    def test_name_index_exact_salary_sum(self):
+        data = [dict(row, name=name) for row, name in zip(float_order_data, ['Программист', 'Программист 1С'] * 2)]
+        self.assertEqual(NameIndex.from_data(data).selected_salary_dynamics('Программист'), {2022: 177772})
+
+    def test_name_index_saved(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, 'index.pickle')
+            self.index.save(file_name)
+            self.assertEqual(NameIndex.load(file_name).selected_num_vacancies_dynamics('Программист'),
+                             self.index.selected_num_vacancies_dynamics('Программист'))
+
 
 class TableTests(TestCase):
     none_settings = {'need_filter': '', 'sort_option': '', 'is_reverse_sort': '', 'need_rows': '', 'need_columns': ''}
@@ -352,6 +1258,155 @@ class TableTests(TestCase):
     def test_table_with_correct_settings_sort(self):
         self.assertEqual(self.table_with_correct_settings.is_reverse_sort, True)
 
+    vacancies = DataSet('vacancies.csv').data
+
+    def create_table(self, need_filter: str = '', sort_option: str = '', need_rows: str = '', need_columns: str = ''):
+        return Table(self.vacancies, {'need_filter': need_filter, 'sort_option': sort_option, 'is_reverse_sort': '',
+                                      'need_rows': need_rows, 'need_columns': need_columns})
+
+    def test_table_global_numbers(self):
+        table = self.create_table(need_rows='10 13', need_columns='Название')
+        self.assertEqual(table.table.field_names, ['№', 'Название'])
+        self.assertEqual(table.table.rows, [[number, self.vacancies[number - 1]['name']] for number in (10, 11, 12)])
+
+    def test_table_columns_order(self):
+        self.assertEqual(self.create_table(need_rows='1 2').table.field_names,
+                         ['№', 'Название', 'Описание', 'Навыки', 'Опыт работы', 'Премиум-вакансия', 'Компания',
+                          'Оклад указан до вычета налогов', 'Название региона', 'Дата публикации вакансии', 'Оклад'])
+
+    def test_table_formats_only_visible_rows(self):
+        broken = dict(self.vacancies[1], published_at='')
+        table = Table([self.vacancies[0], broken], {'need_filter': '', 'sort_option': '', 'is_reverse_sort': '',
+                                                    'need_rows': '1 2', 'need_columns': 'Дата публикации вакансии'})
+        self.assertEqual(table.table.rows, [[1, format_time(self.vacancies[0]['published_at'])]])
+
+    def test_table_salary_filter(self):
+        table = self.create_table(need_filter='Оклад: 100000', sort_option='Оклад', need_columns='Оклад')
+        self.assertEqual(len(table.indexes), sum(float(row['salary_from']) <= 100000 <= float(row['salary_to'])
+                                                 for row in self.vacancies))
+        self.assertEqual(table.table.rows[0][1], '10 000 - 100 000 (Рубли)')
+
+    def test_table_cleaning_cache(self):
+        clean_string.cache_clear()
+        table = self.create_table(need_filter='Название региона: Москва')
+        first, second = (table.field(index, 'Название региона') for index in table.indexes[:2])
+        self.assertIs(first, second)
+        self.assertGreater(Table.cleaning_hit_rate(), 0.5)
+        self.assertEqual(table.translate_and_clean_string('<p>' + 'a  b ' * 100 + '</p>'), ' '.join(['a b'] * 100))
+        long_value = ' '.join(['c d'] * 100)
+        cleaned = table.translate_and_clean_string(f'<p>{long_value}</p>')
+        self.assertEqual(cleaned, long_value)
+        self.assertIs(sys.intern(long_value), long_value)
+
+    def test_table_partial_sort(self):
+        for sort_option in ['Навыки', 'Оклад', 'Опыт работы', 'Название региона', 'Дата публикации вакансии']:
+            for is_reverse_sort in ['Да', 'Нет']:
+                settings = {'need_filter': '', 'sort_option': sort_option, 'is_reverse_sort': is_reverse_sort,
+                            'need_rows': '5 30', 'need_columns': 'Название'}
+                partial = Table(self.vacancies, settings)
+                full = Table(self.vacancies, dict(settings, need_rows=''))
+                self.assertEqual(partial.indexes, full.indexes[:29])
+                self.assertEqual(partial.table.rows, full.table.rows[4:29])
+
+    def test_table_date_filter(self):
+        table = self.create_table(need_filter='Дата публикации вакансии: 17.07.2022')
+        self.assertTrue(table.indexes and all(self.vacancies[index]['published_at'].startswith('2022-07-17')
+                                              for index in table.indexes))
+
+    def test_table_index_matches_scan(self):
+        for need_filter in ['Название региона: Москва', 'Опыт работы: Нет опыта', 'Премиум-вакансия: Нет',
+                            'Идентификатор валюты оклада: Рубли', 'Компания: ' + self.vacancies[0]['employer_name']]:
+            table = self.create_table(need_filter=need_filter)
+            title, value = need_filter.split(': ')
+            self.assertEqual(table.indexes, [index for index in range(len(self.vacancies))
+                                             if table.field(index, title) == value])
+
+    def test_table_salary_range_filter(self):
+        table = self.create_table(need_filter='Оклад: 100000 - 150000', need_columns='Оклад')
+        self.assertEqual(table.indexes, [number for number, row in enumerate(self.vacancies)
+                                         if float(row['salary_from']) <= 150000 and float(row['salary_to']) >= 100000])
+        self.assertEqual(list(table.table_index.trees), ['Оклад'])
+
+    def test_table_skills_filter(self):
+        skills = ['Git', 'SQL', 'Linux']
+        table = self.create_table(need_filter='Навыки: ' + ', '.join(skills), sort_option='Навыки')
+        found = [number for number, row in enumerate(self.vacancies)
+                 if set(skills) <= set(row['key_skills'].split('\n'))]
+        self.assertTrue(found)
+        self.assertEqual(sorted(table.indexes), found)
+        self.assertEqual(table.table_index.skill_counts, [len(row['key_skills'].split('\n')) for row in self.vacancies])
+        self.assertEqual(table.table_index.find_skills(['Git', 'Нет такого навыка'], table.skills), [])
+
+    def test_table_precomputed_orders(self):
+        table_index = TableIndex(self.vacancies)
+        Table(self.vacancies, self.create_table().settings, table_index).precompute_orders()
+        self.assertEqual(len(table_index.orders), 2 * len(Table.sortable_titles))
+        for need_filter in ['', 'Название региона: Москва', 'Премиум-вакансия: Нет']:
+            for sort_option in Table.sortable_titles:
+                for is_reverse_sort in ['Да', 'Нет']:
+                    for need_rows in ['', '3 20']:
+                        settings = {'need_filter': need_filter, 'sort_option': sort_option,
+                                    'is_reverse_sort': is_reverse_sort, 'need_rows': need_rows, 'need_columns': ''}
+                        self.assertEqual(Table(self.vacancies, settings, table_index).indexes,
+                                         Table(self.vacancies, settings).indexes)
+
+    def test_table_index_save_load(self):
+        table = self.create_table(need_filter='Навыки: Git', sort_option='Оклад')
+        table.precompute_orders()
+        with tempfile.TemporaryDirectory() as directory_name:
+            file_name = os.path.join(directory_name, 'table_index.pickle')
+            table.table_index.save(file_name)
+            loaded = TableIndex.load(file_name, self.vacancies)
+            with self.assertRaises(Exception):
+                TableIndex.load(file_name, self.vacancies[:10])
+            with self.assertRaises(Exception):
+                TableIndex.load(file_name, self.vacancies[::-1])
+            with self.assertRaises(Exception):
+                TableIndex.load(file_name, self.vacancies[:-1] + [dict(self.vacancies[-1], area_name='Тверь')])
+        self.assertEqual(loaded.orders, table.table_index.orders)
+        self.assertEqual(loaded.skill_counts, table.table_index.skill_counts)
+        self.assertEqual(Table(self.vacancies, table.settings, loaded).indexes, table.indexes)
+
+    def test_table_pages(self):
+        table = self.create_table(need_rows='3 128', need_columns='Название')
+        pages = list(table.pages())
+        self.assertEqual([len(page.rows) for page in pages], [Table.page_size, Table.page_size, 25])
+        self.assertEqual([row[0] for page in pages for row in page.rows], list(range(3, 128)))
+        self.assertEqual(table.table.rows, pages[0].rows)
+        self.assertEqual(len(list(self.create_table(need_rows='5000 5010').pages())), 1)
+
+    def test_table_print_pages(self):
+        table = self.create_table(need_rows='3 128', need_columns='Название')
+        format_row, formatted = table.format_row, []
+        table.format_row = lambda index, titles: formatted.append(index) or format_row(index, titles)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            table.print_vacancies_table()
+        lines = output.getvalue().splitlines()
+        self.assertEqual(len(formatted), 125 - Table.page_size)
+        self.assertEqual(sum(line.startswith('| №') for line in lines), 1)
+        numbers = [line.split('|')[1].strip() for line in lines if line.startswith('| ')]
+        self.assertEqual([number for number in numbers[1:] if number], [str(number) for number in range(3, 128)])
+
+    def test_table_print_pages_width(self):
+        for need_rows, need_columns in [('1 60', 'Название, Компания'), ('', '')]:
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                self.create_table(need_rows=need_rows, need_columns=need_columns).print_vacancies_table()
+            self.assertEqual(len({len(line) for line in output.getvalue().splitlines()}), 1)
+
+    def test_table_index_reuse(self):
+        first = self.create_table(need_filter='Название региона: Москва')
+        second = Table(self.vacancies, {'need_filter': 'Название региона: Казань', 'sort_option': '',
+                                        'is_reverse_sort': '', 'need_rows': '', 'need_columns': ''},
+                       first.table_index)
+        self.assertIs(second.table_index, first.table_index)
+        self.assertEqual(list(first.table_index.columns), ['Название региона'])
+        self.assertTrue(second.indexes and all(self.vacancies[index]['area_name'] == 'Казань'
+                                               for index in second.indexes))
+        with self.assertRaises(Exception):
+            Table(self.vacancies, first.settings, TableIndex(self.vacancies[:10]))
+
 
 class ReportTests(TestCase):
     statistic = Statistic('Руководитель проекта', circumcised_data)
@@ -359,3 +1414,13 @@ class ReportTests(TestCase):
 
     def test_report_type(self):
         self.assertEqual(type(self.report).__name__, 'Report')
+
+    def test_report_empty_statistic_image(self):
+        current_directory = os.getcwd()
+        with tempfile.TemporaryDirectory() as directory:
+            os.chdir(directory)
+            try:
+                Report(Statistic('Руководитель проекта', [])).generate_image()
+                self.assertTrue(os.path.exists('graph.png'))
+            finally:
+                os.chdir(current_directory)
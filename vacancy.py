@@ -11,15 +11,20 @@ class Vacancy:
         self.__average_salary (float or int): Среднее значение оклада
     """
 
+    __slots__ = ('__name', '__area_name', '__year', '__salary_from', '__salary_to', '__salary_curr', '__average_salary')
+    """Статический кортеж полей: у объектов нет __dict__, что уменьшает память и ускоряет создание"""
+
     currency_to_rub = {"AZN": 35.68, "BYR": 23.91, "EUR": 59.90, "GEL": 21.74, "KGS": 0.76, "KZT": 0.13, "RUR": 1,
                        "UAH": 1.64, "USD": 60.66, "UZS": 0.0055}
     """Статическое поле с курсом валют"""
 
-    def __init__(self, row_dict: dict):
+    def __init__(self, row_dict: dict, currency_rates=None):
         """Инициализирует объект Vacancy, вычисляет среднее значение оклада
 
         Attributes:
             row_dict (dict): Словарь, по значениям которого с соответсвующими ключами будет иницализирован Vacancy
+            currency_rates (CurrencyRates or NoneType): Таблица курсов по месяцам. Если не задана, используется
+                                                        статический курс currency_to_rub
 
         >>> type(Vacancy({'name': 'Программист', 'area_name': 'Екатеринбург', 'published_at':'2015', 'salary_from': '7000', 'salary_to': '90000', 'salary_currency': 'RUR'})).__name__
         'Vacancy'
@@ -39,7 +44,39 @@ class Vacancy:
         self.__salary_from = float(row_dict['salary_from'])
         self.__salary_to = float(row_dict['salary_to'])
         self.__salary_curr = row_dict['salary_currency']
-        self.__average_salary = (self.__salary_from + self.__salary_to) / 2 * self.currency_to_rub[self.__salary_curr]
+        rate = self.currency_to_rub[self.__salary_curr] if currency_rates is None \
+            else currency_rates.rate(self.__salary_curr, row_dict['published_at'])
+        self.__average_salary = (self.__salary_from + self.__salary_to) / 2 * rate
+
+    @classmethod
+    def from_rows(cls, rows, titles: list, currency_rates=None):
+        """Лениво создаёт вакансии напрямую из строк csv.reader по индексам столбцов, без промежуточных словарей
+
+        Args:
+            rows (list or generator): Прошедшие проверку строки в виде списков значений
+            titles (list): Заголовки столбцов
+            currency_rates (CurrencyRates or NoneType): Таблица курсов по месяцам. Если не задана, используется
+                                                        статический курс currency_to_rub
+
+        >>> [vacancy.average_salary for vacancy in Vacancy.from_rows([['Программист', '7000', '90000', 'RUR', 'Екатеринбург', '2015-05-01']], ['name', 'salary_from', 'salary_to', 'salary_currency', 'area_name', 'published_at'])]
+        [48500.0]
+        """
+
+        name_index, area_name_index, published_at_index, salary_from_index, salary_to_index, salary_curr_index = \
+            map(titles.index, ('name', 'area_name', 'published_at', 'salary_from', 'salary_to', 'salary_currency'))
+        currency_to_rub = cls.currency_to_rub
+        for row in rows:
+            vacancy = cls.__new__(cls)
+            vacancy.__name = row[name_index]
+            vacancy.__area_name = row[area_name_index]
+            vacancy.__year = int(row[published_at_index][:4])
+            vacancy.__salary_from = salary_from = float(row[salary_from_index])
+            vacancy.__salary_to = salary_to = float(row[salary_to_index])
+            vacancy.__salary_curr = salary_curr = row[salary_curr_index]
+            rate = currency_to_rub[salary_curr] if currency_rates is None \
+                else currency_rates.rate(salary_curr, row[published_at_index])
+            vacancy.__average_salary = (salary_from + salary_to) / 2 * rate
+            yield vacancy
 
     @property
     def name(self):
@@ -1,20 +1,28 @@
+import math
 from vacancy import Vacancy
+from exact_sum import add_exact, merge_exact
+from quantile_sketch import KllSketch
 
 
 class Year:
-    """Класс для представления информации о выложенных в конкретный год вакансиях
+    """Класс для представления информации о выложенных в конкретный год вакансиях. Суммы зарплат хранятся точно
+       (частичными суммами exact_sum), поэтому статистика, объединённая из частей данных, совпадает с посчитанной
+       последовательно
 
     Attributes:
         self.__name (str): Год
         self.__vacancy_count (int): Количество выложенных в году вакансий
-        self.__all_salary (float): Сумма средних зарплат в году
-        self.__average_salary (float): Средняя зарплата в году
+        self.__salary_partials (list): Частичные суммы средних зарплат в году
         self.__selected_vacancy (str): Выбранное название вакансии для статистики
         self.__selected_vacancy_count (int): Количество вакансий с выбранным названием
-        self.__selected_selected_vacancy_all_salary (float): Сумма средних зарплат вакансий с выбранным названием
-        self.__selected_vacancy_average_salary (float): Средняя зарплата в году среди вакансий с выбранным названием
+        self.__selected_salary_partials (list): Частичные суммы средних зарплат вакансий с выбранным названием
+        self.__salary_sketch (KllSketch): Скетч средних зарплат в году для медианы и перцентилей
     """
 
+    __slots__ = ('__name', '__vacancy_count', '__salary_partials', '__selected_vacancy', '__selected_vacancy_count',
+                 '__selected_salary_partials', '__salary_sketch')
+    """Статический кортеж полей: у объектов нет __dict__"""
+
     def __init__(self, vacancy: Vacancy, selected_vacancy: str):
         """Инициализирует объект Year, вычисляет средние значения оклада
 
@@ -38,15 +46,42 @@ class Year:
 
         self.__name = vacancy.year
         self.__vacancy_count = 1
-        self.__all_salary = vacancy.average_salary
-        self.__average_salary = vacancy.average_salary
+        self.__salary_partials = [vacancy.average_salary]
         self.__selected_vacancy = selected_vacancy
 
         self.__selected_vacancy_count = 1 if selected_vacancy in vacancy.name else 0
-        self.__selected_vacancy_all_salary = \
-            vacancy.average_salary if selected_vacancy in vacancy.name else 0
-        self.__selected_vacancy_average_salary = \
-            vacancy.average_salary if selected_vacancy in vacancy.name else 0
+        self.__selected_salary_partials = [vacancy.average_salary] if selected_vacancy in vacancy.name else []
+        self.__salary_sketch = KllSketch()
+        self.__salary_sketch.update(vacancy.average_salary)
+
+    @classmethod
+    def from_sums(cls, name: int, selected_vacancy: str, vacancy_count: int, salary_partials: list,
+                  selected_vacancy_count: int, selected_salary_partials: list, salary_sketch: KllSketch = None):
+        """Создаёт объект Year по сохранённым частичным суммам и количествам, без исходных вакансий
+
+        Args:
+            name (int): Год
+            selected_vacancy (str): Выбранное название вакансии
+            vacancy_count (int): Количество вакансий в году
+            salary_partials (list): Частичные суммы средних зарплат в году, в Year сохраняется их копия
+            selected_vacancy_count (int): Количество вакансий с выбранным названием
+            selected_salary_partials (list): Частичные суммы средних зарплат вакансий с выбранным названием
+            salary_sketch (KllSketch or NoneType): Скетч средних зарплат в году, в Year сохраняется его копия. Без
+                                                   него квантили равны 0
+
+        >>> Year.from_sums(2015, 'Программист', 2, [97000.0], 0, []).average_salary
+        48500.0
+        """
+
+        year = cls.__new__(cls)
+        year.__name = name
+        year.__vacancy_count = vacancy_count
+        year.__salary_partials = list(salary_partials)
+        year.__selected_vacancy = selected_vacancy
+        year.__selected_vacancy_count = selected_vacancy_count
+        year.__selected_salary_partials = list(selected_salary_partials)
+        year.__salary_sketch = salary_sketch.copy() if salary_sketch is not None else KllSketch()
+        return year
 
     @property
     def name(self):
@@ -54,11 +89,56 @@ class Year:
 
         return self.__name
 
+    @property
+    def selected_vacancy(self):
+        """Возвращает значение приватного поля с выбранным названием вакансии"""
+
+        return self.__selected_vacancy
+
+    @property
+    def salary_partials(self):
+        """Возвращает значение приватного поля с частичными суммами средних зарплат в году"""
+
+        return self.__salary_partials
+
+    @property
+    def selected_salary_partials(self):
+        """Возвращает значение приватного поля с частичными суммами средних зарплат выбранных вакансий в году"""
+
+        return self.__selected_salary_partials
+
+    @property
+    def all_salary(self):
+        """Возвращает сумму средних зарплат в году, округлённую из точной"""
+
+        return math.fsum(self.__salary_partials)
+
+    @property
+    def selected_vacancy_all_salary(self):
+        """Возвращает сумму средних зарплат выбранных вакансий в году, округлённую из точной"""
+
+        return math.fsum(self.__selected_salary_partials)
+
     @property
     def average_salary(self):
-        """Возвращает значение приватного поля со средней зарпатой в году"""
+        """Возвращает среднюю зарплату в году"""
 
-        return self.__average_salary
+        return self.all_salary / self.__vacancy_count
+
+    @property
+    def salary_sketch(self):
+        """Возвращает значение приватного поля со скетчем средних зарплат в году"""
+
+        return self.__salary_sketch
+
+    def salary_quantile(self, fraction: float):
+        """Возвращает приближённый квантиль средних зарплат в году, например 0.5 для медианы
+
+        Args:
+            fraction (float): Доля от 0 до 1
+        """
+
+        return self.__salary_sketch.quantile(fraction)
 
     @property
     def vacancy_count(self):
@@ -74,9 +154,10 @@ class Year:
 
     @property
     def selected_vacancy_average_salary(self):
-        """Возвращает значение приватного поля со средней зарплатой выбранных вакансий в году"""
+        """Возвращает среднюю зарплату выбранных вакансий в году или 0, если их нет"""
 
-        return self.__selected_vacancy_average_salary
+        return self.selected_vacancy_all_salary / self.__selected_vacancy_count if self.__selected_vacancy_count > 0 \
+            else 0
 
     def update(self, vacancy: Vacancy):
         """Обновляет объект Year, добавляя в поля значения ещё одной вакансии
@@ -85,12 +166,42 @@ class Year:
             vacancy (Vacancy): Объект Vacancy по свойствам которого будет обновлён Year
         """
         if vacancy.year == self.name:
-            self.__vacancy_count += 1
-            self.__all_salary += vacancy.average_salary
-            self.__average_salary = self.__all_salary / self.__vacancy_count
-
-            if self.__selected_vacancy in vacancy.name:
-                self.__selected_vacancy_count += 1
-                self.__selected_vacancy_all_salary += vacancy.average_salary
-                self.__selected_vacancy_average_salary = self.__selected_vacancy_all_salary / self.\
-                    __selected_vacancy_count
+            self.add(vacancy.name, vacancy.average_salary)
+
+    def add(self, name: str, average_salary: float):
+        """Добавляет в поля Year значения ещё одной вакансии этого года без обращения к свойствам Vacancy
+
+        Args:
+            name (str): Название вакансии
+            average_salary (float): Средний оклад вакансии в рублях
+        """
+
+        self.__vacancy_count += 1
+        add_exact(self.__salary_partials, average_salary)
+        self.__salary_sketch.update(average_salary)
+
+        if self.__selected_vacancy in name:
+            self.__selected_vacancy_count += 1
+            add_exact(self.__selected_salary_partials, average_salary)
+
+    def merge(self, other):
+        """Объединяет объект Year с частичной статистикой того же года, посчитанной по другой части данных
+
+        Args:
+            other (Year): Объект Year того же года с тем же выбранным названием вакансии
+
+        >>> year = Year(Vacancy({'name': 'Программист', 'area_name': 'Екатеринбург', 'published_at':'2015', 'salary_from': '7000', 'salary_to': '90000', 'salary_currency': 'RUR'}), 'Программист')
+        >>> year.merge(Year(Vacancy({'name': 'Художник', 'area_name': 'Москва', 'published_at':'2015', 'salary_from': '700', 'salary_to': '9000', 'salary_currency': 'RUR'}), 'Программист'))
+        >>> year.vacancy_count, year.average_salary, year.selected_vacancy_count, year.selected_vacancy_average_salary
+        (2, 26675.0, 1, 48500.0)
+        """
+
+        if other.name != self.name or other.selected_vacancy != self.__selected_vacancy:
+            raise Exception('Нельзя объединить статистику разных годов или вакансий')
+        self.__vacancy_count += other.vacancy_count
+        merge_exact(self.__salary_partials, other.salary_partials)
+        self.__salary_sketch.merge(other.salary_sketch)
+
+        if other.selected_vacancy_count > 0:
+            self.__selected_vacancy_count += other.selected_vacancy_count
+            merge_exact(self.__selected_salary_partials, other.selected_salary_partials)